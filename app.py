@@ -1,3 +1,4 @@
+import mimetypes
 import os
 
 from dotenv import load_dotenv
@@ -6,6 +7,11 @@ from flask_cors import CORS
 
 import config
 from database import close_db
+from services.response_compression import (
+    ASSET_MAX_AGE_SECONDS,
+    precompressed_asset,
+    register_response_compression,
+)
 from views.auth import auth_bp
 from views.admin import admin_bp
 from views.activity import activity_bp
@@ -38,6 +44,7 @@ app.register_blueprint(home_bp)
 app.register_blueprint(activity_bp)
 app.register_blueprint(internal_bp)
 app.register_blueprint(public_subscribe_bp)
+register_response_compression(app)
 
 
 @app.teardown_appcontext
@@ -51,7 +58,19 @@ FRONTEND_DIST = os.path.join(os.path.dirname(__file__), "frontend", "dist")
 @app.route("/assets/<path:path>")
 def frontend_assets(path):
     if os.path.isdir(FRONTEND_DIST):
-        return send_from_directory(os.path.join(FRONTEND_DIST, "assets"), path)
+        assets_dir = os.path.join(FRONTEND_DIST, "assets")
+        filename, encoding = precompressed_asset(assets_dir, path)
+        response = send_from_directory(
+            assets_dir,
+            filename,
+            mimetype=mimetypes.guess_type(path)[0],
+            max_age=ASSET_MAX_AGE_SECONDS,
+        )
+        response.vary.add("Accept-Encoding")
+        if encoding:
+            response.headers["Content-Encoding"] = encoding
+        response.cache_control.immutable = True
+        return response
     return {"error": "Frontend not built"}, 404
 
 
@@ -61,7 +61,18 @@ def _parse_email_set(raw_value):
     }
 
 
+def _parse_csv(raw_value, default):
+    if raw_value is None:
+        return default
+    items = [item.strip() for item in raw_value.split(",") if item.strip()]
+    return items or default
+
+
 EMAIL_ENABLED = _env_bool("EMAIL_ENABLED", False)
+EMAIL_PROVIDER = (os.getenv("EMAIL_PROVIDER") or "smtp").strip().lower()
+EMAIL_SINK_DIR = os.getenv("EMAIL_SINK_DIR")
+EMAIL_API_URL = os.getenv("EMAIL_API_URL")
+EMAIL_API_KEY = os.getenv("EMAIL_API_KEY")
 EMAIL_FROM = os.getenv("EMAIL_FROM")
 EMAIL_REPLY_TO = os.getenv("EMAIL_REPLY_TO")
 APP_BASE_URL = os.getenv("APP_BASE_URL")
@@ -80,6 +91,46 @@ EMAIL_DISPATCH_BACKOFF_BASE_SECONDS = _env_int("EMAIL_DISPATCH_BACKOFF_BASE_SECO
 EMAIL_DISPATCH_BACKOFF_MAX_SECONDS = _env_int("EMAIL_DISPATCH_BACKOFF_MAX_SECONDS", 3600)
 EMAIL_DISPATCH_DRY_RUN = _env_bool("EMAIL_DISPATCH_DRY_RUN", False)
 EMAIL_DISPATCH_LOOP_SECONDS = _env_int("EMAIL_DISPATCH_LOOP_SECONDS", 30)
+EMAIL_DISPATCH_CONCURRENCY = _env_int("EMAIL_DISPATCH_CONCURRENCY", 4)
+EMAIL_DISPATCH_LISTEN = _env_bool("EMAIL_DISPATCH_LISTEN", True)
+EMAIL_DIGEST_WINDOW_MINUTES = _env_int("EMAIL_DIGEST_WINDOW_MINUTES", 1440)
+EMAIL_DOMAIN_RATE_PER_MINUTE = _env_int("EMAIL_DOMAIN_RATE_PER_MINUTE", 120)
+EMAIL_DOMAIN_MIN_RATE_PER_MINUTE = _env_int("EMAIL_DOMAIN_MIN_RATE_PER_MINUTE", 6)
+EMAIL_DOMAIN_BURST = _env_int("EMAIL_DOMAIN_BURST", 30)
+EMAIL_DOMAIN_DEFER_SECONDS = _env_int("EMAIL_DOMAIN_DEFER_SECONDS", 300)
+EMAIL_MAX_DEFERRALS = _env_int("EMAIL_MAX_DEFERRALS", 10)
+
+OUTBOX_ARCHIVE_RETENTION_DAYS = _env_int("OUTBOX_ARCHIVE_RETENTION_DAYS", 30)
+OUTBOX_ARCHIVE_BATCH_SIZE = _env_int("OUTBOX_ARCHIVE_BATCH_SIZE", 1000)
+
+TMDB_ASYNC_MAX_IN_FLIGHT = _env_int("TMDB_ASYNC_MAX_IN_FLIGHT", 200)
+TMDB_ASYNC_RATE_PER_SECOND = _env_int("TMDB_ASYNC_RATE_PER_SECOND", 40)
+TMDB_FANOUT_WORKERS = _env_int("TMDB_FANOUT_WORKERS", 16)
+TMDB_FANOUT_QUEUE_LIMIT = _env_int("TMDB_FANOUT_QUEUE_LIMIT", 64)
+TMDB_FANOUT_DEADLINE_MS = _env_int("TMDB_FANOUT_DEADLINE_MS", 4000)
+TMDB_SEARCH_PREFIX_MIN_LENGTH = _env_int("TMDB_SEARCH_PREFIX_MIN_LENGTH", 3)
+TMDB_WARM_LISTS = _parse_csv(
+    os.getenv("TMDB_WARM_LISTS"),
+    default=[
+        "movie_popular",
+        "tv_popular",
+        "trending_all_day",
+        "tv_seasons_on_the_air",
+        "tv_seasons_popular",
+        "tv_seasons_completed",
+    ],
+)
+TMDB_WARM_LANGUAGES = _parse_csv(os.getenv("TMDB_WARM_LANGUAGES"), default=[""])
+TMDB_WARM_PAGES = _env_int("TMDB_WARM_PAGES", 2)
+TMDB_WARM_HOT_LIMIT = _env_int("TMDB_WARM_HOT_LIMIT", 30)
+TMDB_WARM_AHEAD_SECONDS = _env_int("TMDB_WARM_AHEAD_SECONDS", 1800)
+
+COMPRESSION_ENABLED = _env_bool("COMPRESSION_ENABLED", True)
+COMPRESSION_MIN_BYTES = _env_int("COMPRESSION_MIN_BYTES", 1024)
+COMPRESSION_CACHE_MAX_BYTES = _env_int("COMPRESSION_CACHE_MAX_BYTES", 32 * 1024 * 1024)
+COMPRESSION_CACHE_TTL_SECONDS = _env_int("COMPRESSION_CACHE_TTL_SECONDS", 300)
+COMPRESSION_BROTLI = _env_bool("COMPRESSION_BROTLI", False)
+REFRESH_ALL_ASYNC = _env_bool("REFRESH_ALL_ASYNC", False)
 
 CRON_SECRET = os.getenv("CRON_SECRET")
 CRON_DISPATCH_BATCH_SIZE = _env_int("CRON_DISPATCH_BATCH_SIZE", EMAIL_DISPATCH_BATCH_SIZE)
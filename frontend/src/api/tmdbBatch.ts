@@ -0,0 +1,32 @@
+import { apiFetch } from "../api";
+
+export type TmdbBatchTarget = {
+  type: "movie" | "tv" | "season";
+  id: number;
+  season_number?: number;
+};
+
+export type TmdbBatchResult = {
+  type?: TmdbBatchTarget["type"];
+  id?: number;
+  season_number?: number | null;
+  status: "ok" | "error";
+  cache?: "HIT" | "MISS";
+  data?: any;
+  error?: string;
+};
+
+export const TMDB_BATCH_MAX_ITEMS = 50;
+
+export const fetchTmdbBatch = async (targets: TmdbBatchTarget[]) => {
+  const results: TmdbBatchResult[] = [];
+  for (let start = 0; start < targets.length; start += TMDB_BATCH_MAX_ITEMS) {
+    const chunk = targets.slice(start, start + TMDB_BATCH_MAX_ITEMS);
+    const data = await apiFetch<{ results: TmdbBatchResult[] }>("/api/tmdb/batch", {
+      method: "POST",
+      body: JSON.stringify({ items: chunk }),
+    });
+    results.push(...data.results);
+  }
+  return results;
+};
@@ -239,6 +239,7 @@ export const FollowModal = ({
           >
             <option value="important_only">Important only</option>
             <option value="all_updates">All updates</option>
+            <option value="digest">Digest</option>
           </select>
         </div>
         {error && <p className="muted">{error}</p>}
@@ -5,6 +5,8 @@ import { PosterGridCard } from "./PosterGridCard";
 import { addRecentSearch } from "../utils/searchHistory";
 import type { TitleSummary } from "../types";
 
+const SUGGEST_MIN_QUERY_LENGTH = 2;
+
 type SearchOverlayProps = {
   open: boolean;
   query: string;
@@ -22,18 +24,35 @@ export const SearchOverlay = ({ open, query, onQueryChange, onClose }: SearchOve
       setResults([]);
       return;
     }
+    let cancelled = false;
+    let searchLanded = false;
+    // Local typeahead answers immediately; the debounced TMDB search replaces it.
+    if (query.trim().length >= SUGGEST_MIN_QUERY_LENGTH) {
+      apiFetch<any>(`/api/tmdb/search/suggest?q=${encodeURIComponent(query)}`)
+        .then((data) => {
+          if (!cancelled && !searchLanded && data.results?.length) {
+            setResults(data.results);
+          }
+        })
+        .catch(() => undefined);
+    }
     const handle = window.setTimeout(async () => {
       setLoading(true);
       try {
         const data = await apiFetch<any>(`/api/tmdb/search?q=${encodeURIComponent(query)}`);
-        setResults(data.results || []);
+        searchLanded = true;
+        if (!cancelled) setResults(data.results || []);
       } catch (error) {
-        setResults([]);
+        searchLanded = true;
+        if (!cancelled) setResults([]);
       } finally {
         setLoading(false);
       }
     }, 300);
-    return () => window.clearTimeout(handle);
+    return () => {
+      cancelled = true;
+      window.clearTimeout(handle);
+    };
   }, [open, query]);
 
   useEffect(() => {
@@ -1,6 +1,8 @@
 import { useCallback, useEffect, useMemo, useState } from "react";
 
 import { apiFetch, getToken } from "../api";
+import { fetchTmdbBatch } from "../api/tmdbBatch";
+import type { TmdbBatchResult, TmdbBatchTarget } from "../api/tmdbBatch";
 import type { Follow } from "../types";
 import { useAuth } from "../hooks/useAuth";
 
@@ -21,6 +23,7 @@ export type FollowItem = {
 };
 
 const STORAGE_KEY = "db_guest_follows_v2";
+const RETRY_HYDRATE_NOTE = "Tap to retry hydrate";
 const LEGACY_STORAGE_KEY = "db_guest_follows_v1";
 
 const buildKey = (mediaType: "movie" | "tv", tmdbId: number, seasonNumber?: number | null) => {
@@ -228,14 +231,86 @@ const buildRolePrefs = (
   };
 };
 
+const toBatchTarget = (item: FollowItem): TmdbBatchTarget => {
+  if (item.mediaType === "movie") {
+    return { type: "movie", id: item.tmdbId };
+  }
+  if (typeof item.seasonNumber === "number") {
+    return { type: "season", id: item.tmdbId, season_number: item.seasonNumber };
+  }
+  return { type: "tv", id: item.tmdbId };
+};
+
+const hydratePendingGuestFollows = async (items: FollowItem[]) => {
+  const pending = items.filter((item) => item.meta?.note === RETRY_HYDRATE_NOTE);
+  if (pending.length === 0) {
+    return items;
+  }
+  let results: TmdbBatchResult[];
+  try {
+    results = await fetchTmdbBatch(pending.map(toBatchTarget));
+  } catch (error) {
+    return items;
+  }
+  const hydrated = new Map<string, FollowItem>();
+  pending.forEach((item, index) => {
+    const result = results[index];
+    if (result?.status !== "ok") return;
+    const nextItem = buildItemFromDetails(
+      item.mediaType,
+      item.tmdbId,
+      result.data,
+      item.seasonNumber,
+      { dropEnabled: item.dropEnabled, bingeEnabled: item.bingeEnabled },
+      item.targetType,
+    );
+    hydrated.set(item.key, { ...nextItem, addedAt: item.addedAt });
+  });
+  if (hydrated.size === 0) {
+    return items;
+  }
+  const next = items.map((item) => hydrated.get(item.key) ?? item);
+  writeGuestFollows(next);
+  return next;
+};
+
+const hasCachePayload = (follow: Follow) =>
+  !!follow.cache_payload && Object.keys(follow.cache_payload).length > 0;
+
+// Follows the refresh worker has not cached yet are hydrated with one batch request
+// rather than a details request per item.
+const hydrateUncachedServerFollows = async (follows: Follow[]) => {
+  const items = follows.map(buildItemFromServer);
+  const pending = items.filter((_, index) => !hasCachePayload(follows[index]));
+  if (pending.length === 0) {
+    return items;
+  }
+  let results: TmdbBatchResult[];
+  try {
+    results = await fetchTmdbBatch(pending.map(toBatchTarget));
+  } catch (error) {
+    return items;
+  }
+  const hydrated = new Map<string, Pick<FollowItem, "title" | "posterPath">>();
+  pending.forEach((item, index) => {
+    const result = results[index];
+    if (result?.status !== "ok") return;
+    hydrated.set(item.key, {
+      title: result.data?.title || result.data?.name || item.title,
+      posterPath: result.data?.poster_path ?? item.posterPath,
+    });
+  });
+  return items.map((item) => ({ ...item, ...hydrated.get(item.key) }));
+};
+
 export const followStore = {
   list: async (): Promise<FollowItem[]> => {
     const token = getToken();
     if (!token) {
-      return readGuestFollows();
+      return hydratePendingGuestFollows(readGuestFollows());
     }
     const data = await apiFetch<{ follows: Follow[] }>("/api/my/follows");
-    return data.follows.map(buildItemFromServer);
+    return hydrateUncachedServerFollows(data.follows);
   },
   add: async (input: { mediaType: "movie" | "tv"; tmdbId: number; seasonNumber?: number | null }) => {
     const token = getToken();
@@ -266,7 +341,7 @@ export const followStore = {
           tmdbId: input.tmdbId,
           title: `TMDB ${input.tmdbId}`,
           posterPath: null,
-          meta: { tbd: true, note: "Tap to retry hydrate" },
+          meta: { tbd: true, note: RETRY_HYDRATE_NOTE },
           addedAt: Date.now(),
           seasonNumber: input.seasonNumber,
           targetType: resolveTargetType(input),
@@ -374,7 +449,7 @@ export const followStore = {
           tmdbId: input.tmdbId,
           title: `TMDB ${input.tmdbId}`,
           posterPath: null,
-          meta: { tbd: true, note: "Tap to retry hydrate" },
+          meta: { tbd: true, note: RETRY_HYDRATE_NOTE },
           addedAt: Date.now(),
           seasonNumber,
           targetType,
@@ -428,26 +503,9 @@ export const followStore = {
     if (token) {
       return item;
     }
-    const items = readGuestFollows();
-    try {
-      const details = await hydrateFromDetails(item.mediaType, item.tmdbId, item.seasonNumber);
-        const nextItem = buildItemFromDetails(
-          item.mediaType,
-          item.tmdbId,
-          details,
-          item.seasonNumber,
-          {
-            dropEnabled: item.dropEnabled ?? getDefaultRoles(item.mediaType).dropEnabled,
-            bingeEnabled: item.bingeEnabled ?? getDefaultRoles(item.mediaType).bingeEnabled,
-          },
-          item.targetType,
-        );
-      const next = items.map((entry) => (entry.key === item.key ? nextItem : entry));
-      writeGuestFollows(next);
-      return nextItem;
-    } catch (error) {
-      return item;
-    }
+    // Retries every pending guest follow in one batch request, not just this one.
+    const items = await hydratePendingGuestFollows(readGuestFollows());
+    return items.find((entry) => entry.key === item.key) ?? item;
   },
 };
 
@@ -6,7 +6,7 @@ export type Prefs = {
   notify_full_run_concluded: boolean;
   channel_email: boolean;
   channel_whatsapp: boolean;
-  frequency: "important_only" | "all_updates";
+  frequency: "important_only" | "all_updates" | "digest";
 };
 
 export type Follow = {
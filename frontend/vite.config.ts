@@ -1,8 +1,48 @@
-import { defineConfig } from "vite";
+import { readdirSync, readFileSync, statSync, writeFileSync } from "node:fs";
+import { join, resolve } from "node:path";
+import { brotliCompressSync, constants, gzipSync } from "node:zlib";
+import { defineConfig, type Plugin } from "vite";
 import react from "@vitejs/plugin-react";
 
+const PRECOMPRESS_PATTERN = /\.(js|css|html|svg|json|txt)$/;
+const PRECOMPRESS_MIN_BYTES = 1024;
+
+// Writes .br/.gz siblings next to built assets so Flask can serve them without compressing.
+const precompressAssets = (): Plugin => {
+  let outDir = "dist";
+  return {
+    name: "dropbinge-precompress",
+    apply: "build",
+    configResolved(config) {
+      outDir = resolve(config.root, config.build.outDir);
+    },
+    closeBundle() {
+      const walk = (dir: string) => {
+        for (const name of readdirSync(dir)) {
+          const path = join(dir, name);
+          if (statSync(path).isDirectory()) {
+            walk(path);
+            continue;
+          }
+          if (!PRECOMPRESS_PATTERN.test(name)) continue;
+          const source = readFileSync(path);
+          if (source.length < PRECOMPRESS_MIN_BYTES) continue;
+          writeFileSync(`${path}.gz`, gzipSync(source, { level: 9 }));
+          writeFileSync(
+            `${path}.br`,
+            brotliCompressSync(source, {
+              params: { [constants.BROTLI_PARAM_QUALITY]: constants.BROTLI_MAX_QUALITY },
+            }),
+          );
+        }
+      };
+      walk(join(outDir, "assets"));
+    },
+  };
+};
+
 export default defineConfig({
-  plugins: [react()],
+  plugins: [react(), precompressAssets()],
   server: {
     proxy: {
       "/api": "http://localhost:5000",
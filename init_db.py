@@ -86,6 +86,91 @@ def init_db():
     except Exception:
         pass
 
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS tv_status_index (
+            tmdb_id BIGINT PRIMARY KEY,
+            name TEXT NULL,
+            status TEXT NULL,
+            next_season_number INT NULL,
+            last_season_number INT NULL,
+            seasons JSONB NOT NULL DEFAULT '[]'::jsonb,
+            expires_at TIMESTAMP NOT NULL,
+            updated_at TIMESTAMP NOT NULL DEFAULT NOW()
+        );
+        """
+    )
+
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS tv_season_catalog (
+            series_id BIGINT NOT NULL,
+            season_number INT NOT NULL,
+            season_id BIGINT NOT NULL,
+            series_name TEXT NOT NULL,
+            season_name TEXT NULL,
+            air_date TEXT NULL,
+            poster_path TEXT NULL,
+            is_current BOOLEAN NOT NULL DEFAULT FALSE,
+            is_completed BOOLEAN NOT NULL DEFAULT FALSE,
+            expires_at TIMESTAMP NOT NULL,
+            updated_at TIMESTAMP NOT NULL DEFAULT NOW(),
+            PRIMARY KEY (series_id, season_number)
+        );
+        """
+    )
+
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS tmdb_title_index (
+            media_type TEXT NOT NULL,
+            tmdb_id BIGINT NOT NULL,
+            title TEXT NOT NULL,
+            title_norm TEXT NOT NULL,
+            original_norm TEXT NOT NULL DEFAULT '',
+            poster_path TEXT NULL,
+            release_date TEXT NULL,
+            popularity DOUBLE PRECISION NULL,
+            vote_average DOUBLE PRECISION NULL,
+            vote_count INT NULL,
+            updated_at TIMESTAMP NOT NULL DEFAULT NOW(),
+            PRIMARY KEY (media_type, tmdb_id)
+        );
+        """
+    )
+
+    cursor.execute(
+        """
+        CREATE INDEX IF NOT EXISTS tmdb_title_index_prefix_idx
+        ON tmdb_title_index (title_norm text_pattern_ops);
+        """
+    )
+
+    try:
+        # Trigram indexes also serve the mid-title "word prefix" LIKE patterns.
+        cursor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm;")
+        cursor.execute(
+            """
+            CREATE INDEX IF NOT EXISTS tmdb_title_index_trgm_idx
+            ON tmdb_title_index USING GIN (title_norm gin_trgm_ops, original_norm gin_trgm_ops);
+            """
+        )
+    except Exception:
+        pass
+
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS tmdb_list_demand (
+            list_name TEXT NOT NULL,
+            page INT NOT NULL,
+            language TEXT NOT NULL DEFAULT '',
+            hits BIGINT NOT NULL DEFAULT 0,
+            last_requested_at TIMESTAMP NOT NULL DEFAULT NOW(),
+            PRIMARY KEY (list_name, page, language)
+        );
+        """
+    )
+
     cursor.execute(
         "ALTER TABLE tmdb_cache ADD COLUMN IF NOT EXISTS fetched_at TIMESTAMP NOT NULL DEFAULT NOW();"
     )
@@ -96,6 +181,11 @@ def init_db():
     cursor.execute("ALTER TABLE tmdb_cache ADD COLUMN IF NOT EXISTS next_episode_date DATE NULL;")
     cursor.execute("ALTER TABLE tmdb_cache ADD COLUMN IF NOT EXISTS final_state TEXT NULL;")
     cursor.execute("ALTER TABLE tmdb_cache ADD COLUMN IF NOT EXISTS final_completed_at DATE NULL;")
+    cursor.execute(
+        "ALTER TABLE tmdb_cache ADD COLUMN IF NOT EXISTS unchanged_refresh_count INT NOT NULL DEFAULT 0;"
+    )
+    # Override values that were merged in at the last refresh; the columns above stay raw TMDB.
+    cursor.execute("ALTER TABLE tmdb_cache ADD COLUMN IF NOT EXISTS applied_override JSONB NULL;")
 
     cursor.execute(
         """
@@ -264,6 +354,13 @@ def init_db():
         """
     )
 
+    cursor.execute(
+        """
+        ALTER TABLE notification_outbox
+        ADD COLUMN IF NOT EXISTS defer_count INT NOT NULL DEFAULT 0;
+        """
+    )
+
     cursor.execute(
         """
         DO $$
@@ -302,6 +399,158 @@ def init_db():
         """
     )
 
+    cursor.execute(
+        """
+        CREATE INDEX IF NOT EXISTS notification_outbox_pending_follow_idx
+        ON notification_outbox (follow_id, created_at)
+        WHERE status = 'pending';
+        """
+    )
+
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS notification_outbox_archive (
+            id INT PRIMARY KEY,
+            user_id INT NOT NULL,
+            follow_id INT NOT NULL,
+            change_event_id INT NULL,
+            channel TEXT NOT NULL,
+            payload JSONB NOT NULL,
+            status TEXT NOT NULL,
+            created_at TIMESTAMP NOT NULL,
+            sent_at TIMESTAMP NULL,
+            attempt_count INT NOT NULL DEFAULT 0,
+            last_attempt_at TIMESTAMP NULL,
+            last_error TEXT NULL,
+            locked_at TIMESTAMP NULL,
+            next_attempt_at TIMESTAMP NULL,
+            archived_at TIMESTAMP NOT NULL DEFAULT NOW()
+        );
+        """
+    )
+
+    # Archived rows go away with their user, follow and change event, like the hot table's rows.
+    # Orphans left from before the constraints existed are purged once, when they are added.
+    for column, parent in (
+        ("user_id", "users"),
+        ("follow_id", "follows"),
+        ("change_event_id", "change_events"),
+    ):
+        cursor.execute(
+            f"""
+            DO $$
+            BEGIN
+                IF NOT EXISTS (
+                    SELECT 1 FROM pg_constraint
+                    WHERE conname = 'notification_outbox_archive_{column}_fkey'
+                ) THEN
+                    DELETE FROM notification_outbox_archive a
+                    WHERE a.{column} IS NOT NULL
+                      AND NOT EXISTS (SELECT 1 FROM {parent} p WHERE p.id = a.{column});
+                    ALTER TABLE notification_outbox_archive
+                    ADD CONSTRAINT notification_outbox_archive_{column}_fkey
+                    FOREIGN KEY ({column})
+                    REFERENCES {parent}(id)
+                    ON DELETE CASCADE;
+                END IF;
+            END
+            $$;
+            """
+        )
+
+    cursor.execute(
+        """
+        CREATE INDEX IF NOT EXISTS notification_outbox_archive_user_created_at_idx
+        ON notification_outbox_archive (user_id, created_at DESC);
+        """
+    )
+
+    cursor.execute(
+        """
+        CREATE INDEX IF NOT EXISTS notification_outbox_archive_created_at_idx
+        ON notification_outbox_archive (created_at);
+        """
+    )
+
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS notification_outbox_dead_letter (
+            id INT PRIMARY KEY,
+            user_id INT NOT NULL,
+            follow_id INT NOT NULL,
+            change_event_id INT NULL,
+            channel TEXT NOT NULL,
+            payload JSONB NOT NULL,
+            status TEXT NOT NULL DEFAULT 'failed',
+            created_at TIMESTAMP NOT NULL,
+            sent_at TIMESTAMP NULL,
+            attempt_count INT NOT NULL DEFAULT 0,
+            last_attempt_at TIMESTAMP NULL,
+            last_error TEXT NULL,
+            locked_at TIMESTAMP NULL,
+            next_attempt_at TIMESTAMP NULL,
+            failure_class TEXT NOT NULL,
+            failure_reason TEXT NOT NULL,
+            dead_lettered_at TIMESTAMP NOT NULL DEFAULT NOW()
+        );
+        """
+    )
+
+    # Dead letters go away with their owner too, so a replay never points at a deleted event.
+    for column, parent in (
+        ("user_id", "users"),
+        ("follow_id", "follows"),
+        ("change_event_id", "change_events"),
+    ):
+        cursor.execute(
+            f"""
+            DO $$
+            BEGIN
+                IF NOT EXISTS (
+                    SELECT 1 FROM pg_constraint
+                    WHERE conname = 'notification_outbox_dead_letter_{column}_fkey'
+                ) THEN
+                    DELETE FROM notification_outbox_dead_letter d
+                    WHERE d.{column} IS NOT NULL
+                      AND NOT EXISTS (SELECT 1 FROM {parent} p WHERE p.id = d.{column});
+                    ALTER TABLE notification_outbox_dead_letter
+                    ADD CONSTRAINT notification_outbox_dead_letter_{column}_fkey
+                    FOREIGN KEY ({column})
+                    REFERENCES {parent}(id)
+                    ON DELETE CASCADE;
+                END IF;
+            END
+            $$;
+            """
+        )
+
+    cursor.execute(
+        """
+        CREATE INDEX IF NOT EXISTS notification_outbox_dead_letter_reason_idx
+        ON notification_outbox_dead_letter (failure_reason, dead_lettered_at DESC);
+        """
+    )
+
+    cursor.execute(
+        """
+        CREATE OR REPLACE VIEW notification_outbox_all AS
+        SELECT
+            id, user_id, follow_id, change_event_id, channel, payload, status, created_at,
+            sent_at, attempt_count, last_attempt_at, last_error, locked_at, next_attempt_at
+        FROM notification_outbox
+        UNION ALL
+        SELECT
+            id, user_id, follow_id, change_event_id, channel, payload, status, created_at,
+            sent_at, attempt_count, last_attempt_at, last_error, locked_at, next_attempt_at
+        FROM notification_outbox_archive
+        UNION ALL
+        SELECT
+            id, user_id, follow_id, change_event_id, channel, payload, status, created_at,
+            sent_at, attempt_count, last_attempt_at, last_error, locked_at, next_attempt_at
+        FROM notification_outbox_dead_letter;
+        """
+    )
+
     cursor.close()
     conn.close()
 
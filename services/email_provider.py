@@ -1,10 +1,36 @@
+import mailbox
 import smtplib
+import threading
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 
+import requests
+
 import config
 
 
+class EmailAPIError(Exception):
+    def __init__(self, status_code, message):
+        super().__init__(f"Email API returned {status_code}: {message}")
+        self.status_code = status_code
+
+
+def build_mime_message(*, email_from, to_email, subject, text, html=None, reply_to=None):
+    if html:
+        message = MIMEMultipart("alternative")
+        message.attach(MIMEText(text, "plain", "utf-8"))
+        message.attach(MIMEText(html, "html", "utf-8"))
+    else:
+        message = MIMEText(text, "plain", "utf-8")
+
+    message["Subject"] = subject
+    message["From"] = email_from
+    message["To"] = to_email
+    if reply_to:
+        message["Reply-To"] = reply_to
+    return message
+
+
 class EmailProvider:
     def send_email(
         self,
@@ -17,6 +43,19 @@ class EmailProvider:
     ) -> None:
         raise NotImplementedError
 
+    def session(self):
+        return self
+
+    def close(self) -> None:
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
 
 class SMTPEmailProvider(EmailProvider):
     def __init__(
@@ -37,6 +76,72 @@ class SMTPEmailProvider(EmailProvider):
         self.use_tls = use_tls
         self.use_ssl = use_ssl
         self.email_from = email_from
+        self._server = None
+        self._in_session = False
+
+    def __enter__(self):
+        # Inside a session the connection is opened on first send and reused until close().
+        self._in_session = True
+        return self
+
+    def session(self):
+        # Independent connection for one sender thread; share settings, not the socket.
+        return SMTPEmailProvider(
+            host=self.host,
+            port=self.port,
+            user=self.user,
+            password=self.password,
+            use_tls=self.use_tls,
+            use_ssl=self.use_ssl,
+            email_from=self.email_from,
+        )
+
+    def close(self) -> None:
+        self._in_session = False
+        self._drop_connection()
+
+    def _connect(self):
+        if self.use_ssl:
+            server = smtplib.SMTP_SSL(self.host, self.port)
+        else:
+            server = smtplib.SMTP(self.host, self.port)
+        try:
+            if self.use_tls and not self.use_ssl:
+                server.starttls()
+            if self.user:
+                server.login(self.user, self.password or "")
+        except Exception:
+            server.close()
+            raise
+        return server
+
+    def _drop_connection(self):
+        server, self._server = self._server, None
+        if server is None:
+            return
+        try:
+            server.quit()
+        except (smtplib.SMTPException, OSError):
+            server.close()
+
+    def _close_stale_connection(self):
+        server, self._server = self._server, None
+        if server is None:
+            return
+        try:
+            server.close()
+        except (smtplib.SMTPException, OSError):
+            pass
+
+    def _build_message(self, *, to_email, subject, text, html, reply_to):
+        return build_mime_message(
+            email_from=self.email_from,
+            to_email=to_email,
+            subject=subject,
+            text=text,
+            html=html,
+            reply_to=reply_to,
+        )
 
     def send_email(
         self,
@@ -47,41 +152,130 @@ class SMTPEmailProvider(EmailProvider):
         html: str | None = None,
         reply_to: str | None = None,
     ) -> None:
-        if html:
-            message = MIMEMultipart("alternative")
-            message.attach(MIMEText(text, "plain", "utf-8"))
-            message.attach(MIMEText(html, "html", "utf-8"))
-        else:
-            message = MIMEText(text, "plain", "utf-8")
+        message = self._build_message(
+            to_email=to_email, subject=subject, text=text, html=html, reply_to=reply_to
+        )
+        if not self._in_session:
+            self._server = self._connect()
+            try:
+                self._server.send_message(message)
+            finally:
+                self._drop_connection()
+            return
 
-        message["Subject"] = subject
-        message["From"] = self.email_from
-        message["To"] = to_email
-        if reply_to:
-            message["Reply-To"] = reply_to
+        if self._server is None:
+            self._server = self._connect()
+        try:
+            self._server.send_message(message)
+        except smtplib.SMTPServerDisconnected:
+            # Servers drop idle or long-lived sessions; reconnect once and resend.
+            self._close_stale_connection()
+            self._server = self._connect()
+            self._server.send_message(message)
 
-        if self.use_ssl:
-            with smtplib.SMTP_SSL(self.host, self.port) as server:
-                if self.user:
-                    server.login(self.user, self.password or "")
-                server.send_message(message)
-        else:
-            with smtplib.SMTP(self.host, self.port) as server:
-                if self.use_tls:
-                    server.starttls()
-                if self.user:
-                    server.login(self.user, self.password or "")
-                server.send_message(message)
 
+class InMemoryEmailProvider(EmailProvider):
+    """Keeps sent messages in ``self.sent``; for tests and local runs."""
 
-def build_email_provider_from_config() -> EmailProvider | None:
-    if not config.EMAIL_ENABLED:
-        return None
-    if not config.EMAIL_FROM:
-        raise ValueError("EMAIL_FROM must be set when EMAIL_ENABLED is true.")
+    def __init__(self, *, email_from: str = "dropbinge@localhost") -> None:
+        self.email_from = email_from
+        self.sent = []
+        self._lock = threading.Lock()
+
+    def send_email(
+        self,
+        *,
+        to_email: str,
+        subject: str,
+        text: str,
+        html: str | None = None,
+        reply_to: str | None = None,
+    ) -> None:
+        with self._lock:
+            self.sent.append(
+                {
+                    "to_email": to_email,
+                    "subject": subject,
+                    "text": text,
+                    "html": html,
+                    "reply_to": reply_to,
+                }
+            )
+
+
+class MaildirEmailProvider(EmailProvider):
+    """Writes every message into a Maildir so it can be inspected with any mail client."""
+
+    def __init__(self, *, directory: str, email_from: str) -> None:
+        self.directory = directory
+        self.email_from = email_from
+        self._maildir = mailbox.Maildir(directory, create=True)
+        self._lock = threading.Lock()
+
+    def send_email(
+        self,
+        *,
+        to_email: str,
+        subject: str,
+        text: str,
+        html: str | None = None,
+        reply_to: str | None = None,
+    ) -> None:
+        message = build_mime_message(
+            email_from=self.email_from,
+            to_email=to_email,
+            subject=subject,
+            text=text,
+            html=html,
+            reply_to=reply_to,
+        )
+        with self._lock:
+            self._maildir.add(message)
+
+
+class HTTPAPIEmailProvider(EmailProvider):
+    """Sends through a JSON HTTP email API (POST {from, to, subject, text, html, reply_to})."""
+
+    def __init__(
+        self,
+        *,
+        url: str,
+        api_key: str | None,
+        email_from: str,
+        timeout: float = 10,
+        http_session=None,
+    ) -> None:
+        self.url = url
+        self.api_key = api_key
+        self.email_from = email_from
+        self.timeout = timeout
+        self._http = http_session or requests.Session()
+
+    def send_email(
+        self,
+        *,
+        to_email: str,
+        subject: str,
+        text: str,
+        html: str | None = None,
+        reply_to: str | None = None,
+    ) -> None:
+        headers = {}
+        if self.api_key:
+            headers["Authorization"] = f"Bearer {self.api_key}"
+        body = {"from": self.email_from, "to": to_email, "subject": subject, "text": text}
+        if html:
+            body["html"] = html
+        if reply_to:
+            body["reply_to"] = reply_to
+        response = self._http.post(self.url, json=body, headers=headers, timeout=self.timeout)
+        if response.status_code >= 400:
+            raise EmailAPIError(response.status_code, response.text[:500])
+
+
+def _build_smtp_provider():
     if not config.SMTP_HOST:
         raise ValueError("SMTP_HOST must be set when EMAIL_ENABLED is true.")
-
     return SMTPEmailProvider(
         host=config.SMTP_HOST,
         port=config.SMTP_PORT,
@@ -91,3 +285,47 @@ def build_email_provider_from_config() -> EmailProvider | None:
         use_ssl=config.SMTP_USE_SSL,
         email_from=config.EMAIL_FROM,
     )
+
+
+def _build_memory_provider():
+    return InMemoryEmailProvider(email_from=config.EMAIL_FROM)
+
+
+def _build_maildir_provider():
+    if not config.EMAIL_SINK_DIR:
+        raise ValueError("EMAIL_SINK_DIR must be set when EMAIL_PROVIDER is maildir.")
+    return MaildirEmailProvider(directory=config.EMAIL_SINK_DIR, email_from=config.EMAIL_FROM)
+
+
+def _build_http_provider():
+    if not config.EMAIL_API_URL:
+        raise ValueError("EMAIL_API_URL must be set when EMAIL_PROVIDER is http.")
+    return HTTPAPIEmailProvider(
+        url=config.EMAIL_API_URL,
+        api_key=config.EMAIL_API_KEY,
+        email_from=config.EMAIL_FROM,
+    )
+
+
+EMAIL_PROVIDER_FACTORIES = {
+    "smtp": _build_smtp_provider,
+    "memory": _build_memory_provider,
+    "maildir": _build_maildir_provider,
+    "http": _build_http_provider,
+}
+
+
+def register_email_provider(name, factory):
+    EMAIL_PROVIDER_FACTORIES[name] = factory
+
+
+def build_email_provider_from_config() -> EmailProvider | None:
+    if not config.EMAIL_ENABLED:
+        return None
+    if not config.EMAIL_FROM:
+        raise ValueError("EMAIL_FROM must be set when EMAIL_ENABLED is true.")
+
+    factory = EMAIL_PROVIDER_FACTORIES.get(config.EMAIL_PROVIDER)
+    if factory is None:
+        raise ValueError(f"Unknown EMAIL_PROVIDER {config.EMAIL_PROVIDER!r}.")
+    return factory()
@@ -49,7 +49,7 @@ def _format_field_label(field_name):
     return None
 
 
-def build_email_message(outbox_payload, *, app_base_url=None):
+def _event_lines(outbox_payload, app_base_url):
     event_type = outbox_payload.get("event_type") or "update"
     event_payload = outbox_payload.get("event_payload") or {}
     target_type = outbox_payload.get("target_type")
@@ -57,7 +57,6 @@ def build_email_message(outbox_payload, *, app_base_url=None):
     season_number = outbox_payload.get("season_number")
     title = outbox_payload.get("title") or "Untitled"
 
-    subject = _event_subject(event_type, title)
     target_label = _target_label(target_type, season_number)
     field_label = _format_field_label(event_payload.get("field"))
     deep_link = _build_deep_link(app_base_url, target_type, tmdb_id, season_number)
@@ -84,10 +83,10 @@ def build_email_message(outbox_payload, *, app_base_url=None):
 
     if deep_link:
         lines.append(f"Link: {deep_link}")
+    return lines, deep_link
 
-    lines.append("You are receiving this because you follow this title in DropBinge.")
-    text = "\n".join(lines)
 
+def _html_lines(lines, deep_link):
     html_lines = []
     for line in lines:
         if deep_link and line.startswith("Link: "):
@@ -95,6 +94,41 @@ def build_email_message(outbox_payload, *, app_base_url=None):
             html_lines.append(f'<p>Link: <a href="{escaped_link}">{escaped_link}</a></p>')
         else:
             html_lines.append(f"<p>{html.escape(line)}</p>")
-    html = "\n".join(html_lines)
+    return html_lines
+
+
+def build_email_message(outbox_payload, *, app_base_url=None):
+    event_type = outbox_payload.get("event_type") or "update"
+    title = outbox_payload.get("title") or "Untitled"
+
+    subject = _event_subject(event_type, title)
+    lines, deep_link = _event_lines(outbox_payload, app_base_url)
+    lines.append("You are receiving this because you follow this title in DropBinge.")
+    text = "\n".join(lines)
+    html_body = "\n".join(_html_lines(lines, deep_link))
+
+    return {"subject": subject, "text": text, "html": html_body}
+
+
+def build_digest_email_message(outbox_payloads, *, app_base_url=None):
+    count = len(outbox_payloads)
+    noun = "update" if count == 1 else "updates"
+    subject = f"[DropBinge] DIGEST — {count} {noun} on titles you follow"
+
+    text_sections = []
+    html_sections = []
+    for outbox_payload in outbox_payloads:
+        event_type = outbox_payload.get("event_type") or "update"
+        title = outbox_payload.get("title") or "Untitled"
+        heading = _event_subject(event_type, title).replace("[DropBinge] ", "", 1)
+        lines, deep_link = _event_lines(outbox_payload, app_base_url)
+        text_sections.append("\n".join([heading, *lines]))
+        html_sections.append(
+            "\n".join([f"<h3>{html.escape(heading)}</h3>", *_html_lines(lines, deep_link)])
+        )
+
+    footer = "You are receiving this digest because you follow these titles in DropBinge."
+    text = "\n\n".join([*text_sections, footer])
+    html_body = "\n<hr>\n".join(html_sections) + f"\n<p>{html.escape(footer)}</p>"
 
-    return {"subject": subject, "text": text, "html": html}
+    return {"subject": subject, "text": text, "html": html_body}
@@ -0,0 +1,111 @@
+import logging
+import threading
+import time
+from collections import Counter
+
+from psycopg2.extras import execute_values
+
+import config
+from database import get_db, managed_cursor
+from services import tmdb_http_cache
+
+logger = logging.getLogger(__name__)
+
+DEMAND_FLUSH_SECONDS = 60
+
+_pending = Counter()
+_lock = threading.Lock()
+_last_flush = {"at": time.monotonic()}
+
+
+def normalize_language(language):
+    """Configured spelling of ``language`` when it is one of TMDB_WARM_LANGUAGES, else None.
+
+    Only languages the warmer serves are tracked, so arbitrary query strings cannot grow the
+    demand table or the warm set."""
+    allowed = {value.lower(): value for value in config.TMDB_WARM_LANGUAGES or [""]}
+    allowed.setdefault("", "")
+    return allowed.get((language or "").strip().lower())
+
+
+def record_list_request(list_name, page, language):
+    """Count a browse-list request; counts are flushed to tmdb_list_demand about once a minute."""
+    language = normalize_language(language)
+    if language is None:
+        return
+    with _lock:
+        _pending[(list_name, page, language)] += 1
+        due = time.monotonic() - _last_flush["at"] >= DEMAND_FLUSH_SECONDS
+    if due and not tmdb_http_cache._use_memory_cache():
+        # Runs inside the list request; demand tracking must never fail the page.
+        conn = get_db()
+        try:
+            flush_list_demand(conn)
+        except Exception:
+            logger.exception("tmdb_list_demand flush failed")
+            conn.rollback()
+
+
+def flush_list_demand(conn):
+    """Write pending counts to tmdb_list_demand; they are put back if the write fails."""
+    with _lock:
+        counts = dict(_pending)
+        _pending.clear()
+        _last_flush["at"] = time.monotonic()
+    if not counts:
+        return 0
+    rows = [(name, page, language, hits) for (name, page, language), hits in counts.items()]
+    try:
+        with managed_cursor(conn) as cursor:
+            execute_values(
+                cursor,
+                """
+                INSERT INTO tmdb_list_demand (list_name, page, language, hits, last_requested_at)
+                VALUES %s
+                ON CONFLICT (list_name, page, language)
+                DO UPDATE SET
+                    hits = tmdb_list_demand.hits + EXCLUDED.hits,
+                    last_requested_at = EXCLUDED.last_requested_at
+                """,
+                rows,
+                template="(%s, %s, %s, %s, NOW())",
+                page_size=len(rows),
+            )
+        conn.commit()
+    except Exception:
+        with _lock:
+            _pending.update(counts)
+        raise
+    return len(rows)
+
+
+def hot_list_pages(conn, *, since_days, limit):
+    """Most requested (list_name, page, language) entries seen in the last ``since_days``."""
+    with managed_cursor(conn) as cursor:
+        cursor.execute(
+            """
+            SELECT list_name, page, language
+            FROM tmdb_list_demand
+            WHERE last_requested_at > NOW() - (%s * INTERVAL '1 day')
+            ORDER BY hits DESC, list_name ASC, page ASC
+            LIMIT %s
+            """,
+            (since_days, limit),
+        )
+        return [(row["list_name"], row["page"], row["language"]) for row in cursor.fetchall()]
+
+
+def warm_targets(conn, *, list_names, pages, languages, hot_limit, since_days=3):
+    """Configured first pages of every list plus the hottest observed pages, deduplicated."""
+    targets = []
+    for list_name in list_names:
+        for language in languages or [""]:
+            for page in range(1, pages + 1):
+                targets.append((list_name, page, language))
+    if hot_limit:
+        targets.extend(
+            target
+            for target in hot_list_pages(conn, since_days=since_days, limit=hot_limit)
+            if target[0] in list_names and target[2] in (languages or [""])
+        )
+    return list(dict.fromkeys(targets))
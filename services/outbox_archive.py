@@ -0,0 +1,56 @@
+from database import get_cursor
+
+ARCHIVABLE_STATUSES = ("sent", "failed", "superseded")
+
+_OUTBOX_COLUMNS = """
+    id, user_id, follow_id, change_event_id, channel, payload, status, created_at,
+    sent_at, attempt_count, last_attempt_at, last_error, locked_at, next_attempt_at
+"""
+
+
+def archive_outbox_batch(conn, *, retention_days, batch_size):
+    cursor = get_cursor(conn)
+    cursor.execute(
+        f"""
+        WITH picked AS (
+            SELECT id
+            FROM notification_outbox
+            WHERE status = ANY(%s)
+              AND COALESCE(sent_at, last_attempt_at, created_at)
+                  < NOW() - (%s * INTERVAL '1 day')
+            ORDER BY id ASC
+            FOR UPDATE SKIP LOCKED
+            LIMIT %s
+        ),
+        moved AS (
+            DELETE FROM notification_outbox o
+            USING picked p
+            WHERE o.id = p.id
+            RETURNING o.*
+        )
+        INSERT INTO notification_outbox_archive ({_OUTBOX_COLUMNS})
+        SELECT {_OUTBOX_COLUMNS}
+        FROM moved
+        -- Rows whose follow is already gone are dropped instead of archived.
+        WHERE EXISTS (SELECT 1 FROM follows f WHERE f.id = moved.follow_id);
+        """,
+        (list(ARCHIVABLE_STATUSES), retention_days, batch_size),
+    )
+    archived = cursor.rowcount
+    conn.commit()
+    cursor.close()
+    return archived
+
+
+def archive_outbox(conn, *, retention_days, batch_size, max_batches=None):
+    """Move terminal outbox rows older than ``retention_days`` into notification_outbox_archive,
+    one committed batch at a time so the hot table is never locked for long."""
+    archived = 0
+    batches = 0
+    while max_batches is None or batches < max_batches:
+        moved = archive_outbox_batch(conn, retention_days=retention_days, batch_size=batch_size)
+        archived += moved
+        batches += 1
+        if moved < batch_size:
+            break
+    return {"archived": archived, "batches": batches}
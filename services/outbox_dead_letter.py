@@ -0,0 +1,155 @@
+from psycopg2.extras import execute_values
+
+from database import get_cursor
+
+_OUTBOX_COLUMNS = """
+    id, user_id, follow_id, change_event_id, channel, payload, status, created_at,
+    sent_at, attempt_count, last_attempt_at, last_error, locked_at, next_attempt_at
+"""
+
+
+def dead_letter_bulk(conn, entries):
+    """Move (outbox_id, failure_class, failure_reason, error) rows out of notification_outbox
+    into notification_outbox_dead_letter in one statement."""
+    if not entries:
+        return 0
+    rows = [
+        (outbox_id, failure_class, failure_reason, (error or "")[:2000])
+        for outbox_id, failure_class, failure_reason, error in entries
+    ]
+    cursor = get_cursor(conn)
+    execute_values(
+        cursor,
+        """
+        WITH v(id, failure_class, failure_reason, error) AS (VALUES %s),
+        moved AS (
+            DELETE FROM notification_outbox o
+            USING v
+            WHERE o.id = v.id
+            RETURNING o.*, v.failure_class, v.failure_reason, v.error
+        )
+        INSERT INTO notification_outbox_dead_letter (
+            id, user_id, follow_id, change_event_id, channel, payload, status, created_at,
+            sent_at, attempt_count, last_attempt_at, last_error, failure_class, failure_reason
+        )
+        SELECT
+            id, user_id, follow_id, change_event_id, channel, payload, 'failed', created_at,
+            sent_at, attempt_count, last_attempt_at, error, failure_class, failure_reason
+        FROM moved
+        WHERE EXISTS (SELECT 1 FROM follows f WHERE f.id = moved.follow_id);
+        """,
+        rows,
+        template="(%s::int, %s::text, %s::text, %s::text)",
+        page_size=len(rows),
+    )
+    moved = cursor.rowcount
+    conn.commit()
+    cursor.close()
+    return moved
+
+
+def list_dead_letters(conn, *, failure_reason=None, limit=50):
+    cursor = get_cursor(conn)
+    query = """
+        SELECT
+            d.id,
+            d.user_id,
+            u.email,
+            d.follow_id,
+            d.channel,
+            d.payload,
+            d.attempt_count,
+            d.last_error,
+            d.failure_class,
+            d.failure_reason,
+            d.created_at,
+            d.dead_lettered_at
+        FROM notification_outbox_dead_letter d
+        LEFT JOIN users u ON u.id = d.user_id
+    """
+    params = []
+    if failure_reason:
+        query += " WHERE d.failure_reason = %s"
+        params.append(failure_reason)
+    query += " ORDER BY d.dead_lettered_at DESC, d.id DESC LIMIT %s;"
+    params.append(limit)
+    cursor.execute(query, tuple(params))
+    rows = cursor.fetchall()
+
+    cursor.execute(
+        """
+        SELECT failure_reason, COUNT(*) AS count
+        FROM notification_outbox_dead_letter
+        GROUP BY failure_reason
+        ORDER BY failure_reason ASC;
+        """
+    )
+    counts = {row["failure_reason"]: row["count"] for row in cursor.fetchall()}
+    cursor.close()
+    return rows, counts
+
+
+def replay_dead_letters(conn, *, ids=None, failure_reason=None, limit=100):
+    """Move dead-lettered rows back into notification_outbox as fresh pending rows.
+
+    Returns ``(replayed_ids, skipped_ids)``. Rows whose follow or change event no longer
+    exists cannot be re-queued; they are left in place and reported as skipped."""
+    conditions = []
+    params = []
+    if ids:
+        conditions.append("d.id = ANY(%s)")
+        params.append(list(ids))
+    if failure_reason:
+        conditions.append("d.failure_reason = %s")
+        params.append(failure_reason)
+    if not conditions:
+        return [], []
+    params.append(limit)
+
+    cursor = get_cursor(conn)
+    cursor.execute(
+        f"""
+        WITH picked AS (
+            SELECT
+                d.id,
+                EXISTS (
+                    SELECT 1 FROM follows f WHERE f.id = d.follow_id AND f.user_id = d.user_id
+                )
+                AND (
+                    d.change_event_id IS NULL
+                    OR EXISTS (SELECT 1 FROM change_events e WHERE e.id = d.change_event_id)
+                ) AS replayable
+            FROM notification_outbox_dead_letter d
+            WHERE {" AND ".join(conditions)}
+            ORDER BY d.id ASC
+            FOR UPDATE OF d SKIP LOCKED
+            LIMIT %s
+        ),
+        moved AS (
+            DELETE FROM notification_outbox_dead_letter d
+            USING picked p
+            WHERE d.id = p.id
+              AND p.replayable
+            RETURNING d.*
+        ),
+        inserted AS (
+            INSERT INTO notification_outbox ({_OUTBOX_COLUMNS})
+            SELECT
+                id, user_id, follow_id, change_event_id, channel, payload, 'pending', created_at,
+                NULL, 0, last_attempt_at, last_error, NULL, NULL
+            FROM moved
+            RETURNING id
+        )
+        SELECT id, TRUE AS replayed FROM inserted
+        UNION ALL
+        SELECT id, FALSE AS replayed FROM picked WHERE NOT replayable
+        ORDER BY id;
+        """,
+        tuple(params),
+    )
+    rows = cursor.fetchall()
+    conn.commit()
+    cursor.close()
+    replayed = [row["id"] for row in rows if row["replayed"]]
+    skipped = [row["id"] for row in rows if not row["replayed"]]
+    return replayed, skipped
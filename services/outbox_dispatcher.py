@@ -1,7 +1,159 @@
-from services.email_templates import build_email_message
+import contextlib
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from psycopg2.extras import Json, execute_values
+
+from services.email_templates import build_digest_email_message, build_email_message
+from services.outbox_dead_letter import dead_letter_bulk
+from services.send_failures import PERMANENT, PROVIDER, classify_send_failure
+from services.send_throttle import DomainThrottle, recipient_domain, transient_smtp_code
 from database import get_cursor
 import config
 
+logger = logging.getLogger(__name__)
+
+DIGEST_FREQUENCY = "digest"
+# How long rows wait after the provider rejected our credentials; attempts are not spent.
+PROVIDER_FAILURE_DEFER_SECONDS = 300
+
+_domain_throttle = None
+
+
+def get_domain_throttle():
+    # One throttle per process so domain buckets carry over between dispatch batches.
+    global _domain_throttle
+    if _domain_throttle is None:
+        _domain_throttle = DomainThrottle()
+    return _domain_throttle
+
+
+# Event types whose pending rows for one follow describe successive changes of one value.
+_COLLAPSIBLE_EVENT_FAMILIES = {
+    "date_set": "date",
+    "date_changed": "date",
+    "status_milestone": "status",
+}
+
+
+def _provider_session(provider, dry_run):
+    # Providers that support it keep one connection open per sender for the whole batch.
+    if dry_run or provider is None or not hasattr(provider, "session"):
+        return contextlib.nullcontext(provider)
+    return provider.session()
+
+
+def _send_chunk(provider, jobs, dry_run, throttle, provider_down):
+    # Each job is (outbox rows, message); a digest job carries every row it covers.
+    # Results are (rows, error, defer_seconds, failure); defer_seconds marks a deferral that
+    # spends no attempt and failure is the (failure_class, failure_reason) of an error. A
+    # deferral with a failure is the recipient's 4xx and counts toward EMAIL_MAX_DEFERRALS.
+    # provider_down is shared by all chunks: once set, the rest of the batch is deferred.
+    results = []
+    with _provider_session(provider, dry_run) as session:
+        for rows, message in jobs:
+            if provider_down.is_set():
+                error = "Deferred: email provider unavailable."
+                results.append((rows, error, PROVIDER_FAILURE_DEFER_SECONDS, None))
+                continue
+            to_email = rows[0]["to_email"]
+            domain = recipient_domain(to_email)
+            if throttle is not None and not dry_run:
+                wait_seconds = throttle.acquire(domain)
+                if wait_seconds > 0:
+                    results.append(
+                        (rows, f"Deferred: send rate for {domain} exceeded.", wait_seconds, None)
+                    )
+                    continue
+            try:
+                if not dry_run:
+                    session.send_email(
+                        to_email=to_email,
+                        subject=message["subject"],
+                        text=message["text"],
+                        html=message["html"],
+                        reply_to=config.EMAIL_REPLY_TO,
+                    )
+                if throttle is not None:
+                    throttle.record_success(domain)
+                results.append((rows, None, None, None))
+            except Exception as exc:
+                failure = classify_send_failure(exc)
+                if failure[0] == PROVIDER:
+                    if not provider_down.is_set():
+                        provider_down.set()
+                        logger.error(
+                            "email provider failure reason=%s, stopping batch: %s", failure[1], exc
+                        )
+                    results.append((rows, str(exc), PROVIDER_FAILURE_DEFER_SECONDS, None))
+                elif throttle is not None and transient_smtp_code(exc) is not None:
+                    # The failure is kept so the recipient's deferral counts toward the cap.
+                    results.append((rows, str(exc), throttle.record_deferral(domain), failure))
+                else:
+                    results.append((rows, str(exc), None, failure))
+    return results
+
+
+def _send_concurrently(provider, jobs, *, concurrency, dry_run, throttle, provider_down):
+    workers = max(1, min(concurrency, len(jobs)))
+    if workers == 1:
+        return _send_chunk(provider, jobs, dry_run, throttle, provider_down)
+    chunks = [jobs[index::workers] for index in range(workers)]
+    results = []
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for chunk_results in executor.map(
+            lambda chunk: _send_chunk(provider, chunk, dry_run, throttle, provider_down), chunks
+        ):
+            results.extend(chunk_results)
+    return results
+
+
+def _apply_send_results(conn, results, *, max_attempts, backoff_base, backoff_max, max_deferrals):
+    sent_ids = []
+    retries = []
+    deferrals = []
+    dead_letters = []
+    for rows, error, defer_seconds, failure in results:
+        # A digest's rows share one retry schedule so the next attempt still sends them
+        # together, whatever each row's own history was.
+        attempt_count = max(row["attempt_count"] for row in rows)
+        defer_count = max(row["defer_count"] for row in rows)
+        for row in rows:
+            if error is None:
+                sent_ids.append(row["id"])
+            elif defer_seconds is not None and failure is None:
+                deferrals.append((row["id"], defer_seconds, error, False))
+            elif defer_seconds is not None:
+                if defer_count + 1 >= max_deferrals:
+                    # A recipient that only ever answers 4xx would otherwise loop forever.
+                    dead_letters.append((row["id"], failure[0], "max_deferrals", error))
+                else:
+                    deferrals.append((row["id"], defer_seconds, error, True))
+            elif failure[0] == PERMANENT:
+                # Retrying cannot fix these; skip the backoff schedule entirely.
+                dead_letters.append((row["id"], failure[0], failure[1], error))
+            elif attempt_count >= max_attempts:
+                dead_letters.append((row["id"], failure[0], "max_attempts", error))
+            else:
+                retries.append((row["id"], attempt_count, error))
+    mark_sent_bulk(conn, sent_ids)
+    defer_bulk(conn, deferrals)
+    mark_failed_or_retry_bulk(
+        conn,
+        retries,
+        max_attempts=max_attempts,
+        backoff_base=backoff_base,
+        backoff_max=backoff_max,
+    )
+    dead_letter_bulk(conn, dead_letters)
+    return {
+        "sent": len(sent_ids),
+        "retried": len(retries),
+        "failed": len(dead_letters),
+        "deferred": len(deferrals),
+    }
+
 
 def requeue_stale_sending(conn, *, channel, stale_minutes):
     cursor = get_cursor(conn)
@@ -23,6 +175,148 @@ def requeue_stale_sending(conn, *, channel, stale_minutes):
     return updated
 
 
+def _collapse_group(rows):
+    first_payload = rows[0]["payload"].get("event_payload") or {}
+    last = rows[-1]
+    last_payload = last["payload"]
+    net_from = first_payload.get("from")
+    net_to = (last_payload.get("event_payload") or {}).get("to")
+    superseded_ids = [row["id"] for row in rows[:-1]]
+    if net_from == net_to:
+        # The value flipped back to where it started; nothing left to tell the user.
+        return superseded_ids + [last["id"]], None
+
+    event_type = last_payload.get("event_type")
+    if _COLLAPSIBLE_EVENT_FAMILIES.get(event_type) == "date":
+        event_type = "date_set" if net_from is None else "date_changed"
+    merged = dict(last_payload)
+    merged["event_type"] = event_type
+    merged["event_payload"] = {**(last_payload.get("event_payload") or {}), "from": net_from}
+    return superseded_ids, (last["id"], merged)
+
+
+def collapse_superseded_pending(conn, *, channel, batch_size, digest_window_minutes):
+    """Fold pending rows that change the same value of the same follow into the newest row,
+    carrying the net from→to change; older rows are marked 'superseded'.
+
+    Only follows with a row near the front of the queue are considered: the next
+    ``batch_size`` immediate rows and the oldest digest rows past the digest window, so the
+    pass stays proportional to the batch rather than to the whole outbox.
+
+    A group is collapsed all or nothing: groups with a row already 'sending', or with a row
+    another dispatcher holds locked, are left alone so no superseded change still goes out."""
+    cursor = get_cursor(conn)
+    cursor.execute(
+        """
+        WITH candidate_follows AS (
+            (
+                SELECT o.follow_id
+                FROM notification_outbox o
+                WHERE o.channel = %(channel)s
+                  AND o.status = 'pending'
+                  AND (o.next_attempt_at IS NULL OR o.next_attempt_at <= NOW())
+                  AND NOT EXISTS (
+                      SELECT 1
+                      FROM follow_prefs fp
+                      WHERE fp.follow_id = o.follow_id AND fp.frequency = %(frequency)s
+                  )
+                ORDER BY o.created_at ASC, o.id ASC
+                LIMIT %(batch_size)s
+            )
+            UNION
+            (
+                SELECT o.follow_id
+                FROM notification_outbox o
+                JOIN follow_prefs fp ON fp.follow_id = o.follow_id
+                WHERE o.channel = %(channel)s
+                  AND o.status = 'pending'
+                  AND fp.frequency = %(frequency)s
+                  AND o.created_at <= NOW() - (%(window_minutes)s * INTERVAL '1 minute')
+                ORDER BY o.created_at ASC, o.id ASC
+                LIMIT %(batch_size)s
+            )
+        )
+        SELECT o.id, o.follow_id, o.payload, o.status
+        FROM notification_outbox o
+        WHERE o.follow_id IN (SELECT follow_id FROM candidate_follows)
+          AND o.channel = %(channel)s
+          AND o.status IN ('pending', 'sending')
+          AND o.payload->>'event_type' = ANY(%(event_types)s)
+        ORDER BY o.follow_id, o.created_at, o.id;
+        """,
+        {
+            "channel": channel,
+            "frequency": DIGEST_FREQUENCY,
+            "batch_size": batch_size,
+            "window_minutes": digest_window_minutes,
+            "event_types": list(_COLLAPSIBLE_EVENT_FAMILIES),
+        },
+    )
+    groups = {}
+    for row in cursor.fetchall():
+        payload = row["payload"] or {}
+        family = _COLLAPSIBLE_EVENT_FAMILIES[payload.get("event_type")]
+        field = (payload.get("event_payload") or {}).get("field")
+        groups.setdefault((row["follow_id"], family, field), []).append(row)
+    groups = [
+        rows
+        for rows in groups.values()
+        if len(rows) >= 2 and all(row["status"] == "pending" for row in rows)
+    ]
+
+    locked_ids = set()
+    if groups:
+        cursor.execute(
+            """
+            SELECT id
+            FROM notification_outbox
+            WHERE id = ANY(%s)
+              AND status = 'pending'
+            FOR UPDATE SKIP LOCKED;
+            """,
+            ([row["id"] for rows in groups for row in rows],),
+        )
+        locked_ids = {row["id"] for row in cursor.fetchall()}
+
+    superseded_ids = []
+    rewrites = []
+    for rows in groups:
+        if any(row["id"] not in locked_ids for row in rows):
+            continue
+        group_superseded, rewrite = _collapse_group(rows)
+        superseded_ids.extend(group_superseded)
+        if rewrite is not None:
+            rewrites.append(rewrite)
+
+    if superseded_ids:
+        cursor.execute(
+            """
+            UPDATE notification_outbox
+            SET status = 'superseded',
+                locked_at = NULL,
+                next_attempt_at = NULL
+            WHERE id = ANY(%s);
+            """,
+            (superseded_ids,),
+        )
+    if rewrites:
+        execute_values(
+            cursor,
+            """
+            UPDATE notification_outbox o
+            SET payload = v.payload
+            FROM (VALUES %s) AS v(id, payload)
+            WHERE o.id = v.id;
+            """,
+            [(outbox_id, Json(payload)) for outbox_id, payload in rewrites],
+            template="(%s::int, %s::jsonb)",
+            page_size=len(rewrites),
+        )
+    conn.commit()
+    cursor.close()
+    return len(superseded_ids)
+
+
 def claim_pending_batch(conn, *, channel, batch_size):
     cursor = get_cursor(conn)
     cursor.execute(
@@ -33,6 +327,11 @@ def claim_pending_batch(conn, *, channel, batch_size):
             WHERE o.channel = %s
               AND o.status = 'pending'
               AND (o.next_attempt_at IS NULL OR o.next_attempt_at <= NOW())
+              AND NOT EXISTS (
+                  SELECT 1
+                  FROM follow_prefs fp
+                  WHERE fp.follow_id = o.follow_id AND fp.frequency = %s
+              )
             ORDER BY o.created_at ASC
             FOR UPDATE SKIP LOCKED
             LIMIT %s
@@ -44,9 +343,9 @@ def claim_pending_batch(conn, *, channel, batch_size):
             last_attempt_at = NOW()
         FROM picked p, users u
         WHERE o.id = p.id AND u.id = o.user_id
-        RETURNING o.id, o.user_id, u.email AS to_email, o.payload, o.attempt_count;
+        RETURNING o.id, o.user_id, u.email AS to_email, o.payload, o.attempt_count, o.defer_count;
         """,
-        (channel, batch_size),
+        (channel, DIGEST_FREQUENCY, batch_size),
     )
     rows = cursor.fetchall()
     conn.commit()
@@ -54,7 +353,72 @@ def claim_pending_batch(conn, *, channel, batch_size):
     return rows
 
 
-def mark_sent(conn, outbox_id):
+def claim_due_digests(conn, *, channel, window_minutes, user_limit):
+    """Claim every pending digest row of users whose oldest pending digest row is older
+    than ``window_minutes``. Returns the claimed rows grouped per user, each follow's rows
+    kept together.
+
+    A user is skipped while any of their digest rows is backing off, so a retried digest is
+    never split from rows that arrived in the meantime."""
+    cursor = get_cursor(conn)
+    cursor.execute(
+        """
+        WITH due_users AS (
+            SELECT o.user_id
+            FROM notification_outbox o
+            JOIN follow_prefs fp ON fp.follow_id = o.follow_id
+            WHERE o.channel = %(channel)s
+              AND o.status = 'pending'
+              AND fp.frequency = %(frequency)s
+            GROUP BY o.user_id
+            HAVING MIN(o.created_at) <= NOW() - (%(window_minutes)s * INTERVAL '1 minute')
+               AND BOOL_AND(o.next_attempt_at IS NULL OR o.next_attempt_at <= NOW())
+            ORDER BY MIN(o.created_at) ASC
+            LIMIT %(user_limit)s
+        ),
+        picked AS (
+            SELECT o.id
+            FROM notification_outbox o
+            JOIN follow_prefs fp ON fp.follow_id = o.follow_id
+            WHERE o.user_id IN (SELECT user_id FROM due_users)
+              AND o.channel = %(channel)s
+              AND o.status = 'pending'
+              AND fp.frequency = %(frequency)s
+            FOR UPDATE OF o SKIP LOCKED
+        )
+        UPDATE notification_outbox o
+        SET status = 'sending',
+            locked_at = NOW(),
+            attempt_count = o.attempt_count + 1,
+            last_attempt_at = NOW()
+        FROM picked p, users u
+        WHERE o.id = p.id AND u.id = o.user_id
+        RETURNING o.id, o.user_id, o.follow_id, u.email AS to_email, o.payload, o.attempt_count,
+                  o.defer_count, o.created_at;
+        """,
+        {
+            "channel": channel,
+            "frequency": DIGEST_FREQUENCY,
+            "window_minutes": window_minutes,
+            "user_limit": user_limit,
+        },
+    )
+    rows = cursor.fetchall()
+    conn.commit()
+    cursor.close()
+
+    by_user = {}
+    for row in sorted(rows, key=lambda item: (item["created_at"], item["id"])):
+        by_user.setdefault(row["user_id"], {}).setdefault(row["follow_id"], []).append(row)
+    return [
+        [row for follow_rows in by_follow.values() for row in follow_rows]
+        for by_follow in by_user.values()
+    ]
+
+
+def mark_sent_bulk(conn, outbox_ids):
+    if not outbox_ids:
+        return 0
     cursor = get_cursor(conn)
     cursor.execute(
         """
@@ -63,12 +427,88 @@ def mark_sent(conn, outbox_id):
             sent_at = NOW(),
             locked_at = NULL,
             last_error = NULL
-        WHERE id = %s;
+        WHERE id = ANY(%s);
         """,
-        (outbox_id,),
+        (list(outbox_ids),),
     )
+    updated = cursor.rowcount
     conn.commit()
     cursor.close()
+    return updated
+
+
+def mark_failed_or_retry_bulk(conn, failures, *, max_attempts, backoff_base, backoff_max):
+    """Apply (outbox_id, attempt_count, error) failures in one UPDATE; rows at max_attempts
+    become 'failed', the rest go back to 'pending' with exponential backoff."""
+    if not failures:
+        return 0
+    rows = [
+        (outbox_id, attempt_count, (error or "")[:2000], max_attempts, backoff_base, backoff_max)
+        for outbox_id, attempt_count, error in failures
+    ]
+    cursor = get_cursor(conn)
+    execute_values(
+        cursor,
+        """
+        UPDATE notification_outbox o
+        SET status = CASE WHEN v.attempt_count >= v.max_attempts THEN 'failed' ELSE 'pending' END,
+            locked_at = NULL,
+            last_error = v.error,
+            next_attempt_at = CASE
+                WHEN v.attempt_count >= v.max_attempts THEN NULL
+                ELSE NOW() + LEAST(
+                    v.backoff_base * POWER(2, GREATEST(v.attempt_count - 1, 0)),
+                    v.backoff_max
+                ) * INTERVAL '1 second'
+            END
+        FROM (VALUES %s) AS v(id, attempt_count, error, max_attempts, backoff_base, backoff_max)
+        WHERE o.id = v.id;
+        """,
+        rows,
+        template="(%s::int, %s::int, %s::text, %s::int, %s::int, %s::int)",
+        page_size=len(rows),
+    )
+    updated = cursor.rowcount
+    conn.commit()
+    cursor.close()
+    return updated
+
+
+def defer_bulk(conn, deferrals):
+    """Reschedule (outbox_id, delay_seconds, reason, counted) rows without spending an
+    attempt; ``counted`` deferrals also bump defer_count."""
+    if not deferrals:
+        return 0
+    rows = [
+        (outbox_id, float(delay_seconds), (reason or "")[:2000], bool(counted))
+        for outbox_id, delay_seconds, reason, counted in deferrals
+    ]
+    cursor = get_cursor(conn)
+    execute_values(
+        cursor,
+        """
+        UPDATE notification_outbox o
+        SET status = 'pending',
+            locked_at = NULL,
+            attempt_count = GREATEST(o.attempt_count - 1, 0),
+            defer_count = o.defer_count + CASE WHEN v.counted THEN 1 ELSE 0 END,
+            last_error = v.reason,
+            next_attempt_at = NOW() + v.delay_seconds * INTERVAL '1 second'
+        FROM (VALUES %s) AS v(id, delay_seconds, reason, counted)
+        WHERE o.id = v.id;
+        """,
+        rows,
+        template="(%s::int, %s::float8, %s::text, %s::boolean)",
+        page_size=len(rows),
+    )
+    updated = cursor.rowcount
+    conn.commit()
+    cursor.close()
+    return updated
+
+
+def mark_sent(conn, outbox_id):
+    mark_sent_bulk(conn, [outbox_id])
 
 
 def mark_failed_or_retry(
@@ -81,42 +521,13 @@ def mark_failed_or_retry(
     backoff_base,
     backoff_max,
 ):
-    safe_error = (error or "")[:2000]
-    if attempt_count >= max_attempts:
-        status = "failed"
-        next_attempt_at = None
-    else:
-        status = "pending"
-        backoff_seconds = min(backoff_base * (2 ** (attempt_count - 1)), backoff_max)
-        next_attempt_at = f"{backoff_seconds} seconds"
-
-    cursor = get_cursor(conn)
-    if next_attempt_at is None:
-        cursor.execute(
-            """
-            UPDATE notification_outbox
-            SET status = %s,
-                locked_at = NULL,
-                last_error = %s,
-                next_attempt_at = NULL
-            WHERE id = %s;
-            """,
-            (status, safe_error, outbox_id),
-        )
-    else:
-        cursor.execute(
-            """
-            UPDATE notification_outbox
-            SET status = %s,
-                locked_at = NULL,
-                last_error = %s,
-                next_attempt_at = NOW() + %s::INTERVAL
-            WHERE id = %s;
-            """,
-            (status, safe_error, next_attempt_at, outbox_id),
-        )
-    conn.commit()
-    cursor.close()
+    mark_failed_or_retry_bulk(
+        conn,
+        [(outbox_id, attempt_count, error)],
+        max_attempts=max_attempts,
+        backoff_base=backoff_base,
+        backoff_max=backoff_max,
+    )
 
 
 def dispatch_email_outbox_once(
@@ -130,47 +541,76 @@ def dispatch_email_outbox_once(
     backoff_base,
     backoff_max,
     dry_run=False,
+    concurrency=None,
+    digest_window_minutes=None,
+    throttle=None,
+    max_deferrals=None,
 ):
+    if throttle is None:
+        throttle = get_domain_throttle()
+    if concurrency is None:
+        concurrency = config.EMAIL_DISPATCH_CONCURRENCY
+    if digest_window_minutes is None:
+        digest_window_minutes = config.EMAIL_DIGEST_WINDOW_MINUTES
+    if max_deferrals is None:
+        max_deferrals = config.EMAIL_MAX_DEFERRALS
     stale_requeued = requeue_stale_sending(conn, channel="email", stale_minutes=stale_minutes)
+    superseded = collapse_superseded_pending(
+        conn,
+        channel="email",
+        batch_size=batch_size,
+        digest_window_minutes=digest_window_minutes,
+    )
     claimed_rows = claim_pending_batch(conn, channel="email", batch_size=batch_size)
-    sent = 0
-    retried = 0
-    failed = 0
+    digest_groups = claim_due_digests(
+        conn,
+        channel="email",
+        window_minutes=digest_window_minutes,
+        user_limit=batch_size,
+    )
 
+    results = []
+    jobs = []
     for row in claimed_rows:
-        outbox_id = row["id"]
-        attempt_count = row["attempt_count"]
         try:
-            message = build_email_message(row["payload"], app_base_url=app_base_url)
-            if not dry_run:
-                provider.send_email(
-                    to_email=row["to_email"],
-                    subject=message["subject"],
-                    text=message["text"],
-                    html=message["html"],
-                    reply_to=config.EMAIL_REPLY_TO,
-                )
-            mark_sent(conn, outbox_id)
-            sent += 1
+            jobs.append(([row], build_email_message(row["payload"], app_base_url=app_base_url)))
         except Exception as exc:
-            mark_failed_or_retry(
-                conn,
-                outbox_id,
-                attempt_count=attempt_count,
-                error=str(exc),
-                max_attempts=max_attempts,
-                backoff_base=backoff_base,
-                backoff_max=backoff_max,
+            results.append(([row], str(exc), None, (PERMANENT, "render")))
+    for rows in digest_groups:
+        try:
+            message = build_digest_email_message(
+                [row["payload"] for row in rows], app_base_url=app_base_url
             )
-            if attempt_count >= max_attempts:
-                failed += 1
-            else:
-                retried += 1
+            jobs.append((rows, message))
+        except Exception as exc:
+            results.append((rows, str(exc), None, (PERMANENT, "render")))
+    provider_down = threading.Event()
+    if jobs:
+        results.extend(
+            _send_concurrently(
+                provider,
+                jobs,
+                concurrency=concurrency,
+                dry_run=dry_run,
+                throttle=throttle,
+                provider_down=provider_down,
+            )
+        )
+
+    counts = _apply_send_results(
+        conn,
+        results,
+        max_attempts=max_attempts,
+        backoff_base=backoff_base,
+        backoff_max=backoff_max,
+        max_deferrals=max_deferrals,
+    )
 
     return {
-        "claimed": len(claimed_rows),
-        "sent": sent,
-        "retried": retried,
-        "failed": failed,
+        "claimed": len(claimed_rows) + sum(len(rows) for rows in digest_groups),
+        **counts,
+        "digest_emails": len(digest_groups),
+        "superseded": superseded,
         "stale_requeued": stale_requeued,
+        "provider_error": provider_down.is_set(),
     }
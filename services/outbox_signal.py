@@ -0,0 +1,30 @@
+import select
+
+from database import create_standalone_connection
+
+OUTBOX_NOTIFY_CHANNEL = "notification_outbox"
+
+
+def notify_outbox(cursor, channel):
+    # Delivered on commit; Postgres folds identical notifications within one transaction.
+    cursor.execute("SELECT pg_notify(%s, %s);", (OUTBOX_NOTIFY_CHANNEL, channel))
+
+
+def create_outbox_listener():
+    conn = create_standalone_connection()
+    conn.autocommit = True
+    with conn.cursor() as cursor:
+        cursor.execute(f"LISTEN {OUTBOX_NOTIFY_CHANNEL};")
+    return conn
+
+
+def wait_for_outbox_notify(listen_conn, *, channel, timeout):
+    """Block until a row for ``channel`` is enqueued or ``timeout`` seconds pass.
+    Returns True when woken by a notification."""
+    woken = False
+    if select.select([listen_conn], [], [], timeout) != ([], [], []):
+        listen_conn.poll()
+        while listen_conn.notifies:
+            if listen_conn.notifies.pop(0).payload == channel:
+                woken = True
+    return woken
@@ -1,21 +1,34 @@
+import asyncio
+
 from database import managed_cursor
-from services.refresh_service import refresh_follow
+from services.refresh_service import _count_outbox, _tracking_key, preview_follow, refresh_follow
+from services.tmdb_async_client import AsyncTMDBClient
+from services.tmdb_overrides import load_override_map
 
 
-def refresh_all_follows(
-    conn,
-    *,
-    limit_users=None,
-    limit_follows=None,
-    force_fetch=False,
-):
+def _build_summary(processed_follows, event_counts, outbox_counts):
+    outbox_by_channel = {}
+    for by_channel in outbox_counts.values():
+        for channel, count in by_channel.items():
+            outbox_by_channel[channel] = outbox_by_channel.get(channel, 0) + count
+    return {
+        "processed_follows": processed_follows,
+        "events_emitted": sum(event_counts.values()),
+        "outbox_enqueued": sum(outbox_by_channel.values()),
+        "event_counts": event_counts,
+        "outbox_counts": outbox_counts,
+        "outbox_by_channel": outbox_by_channel,
+    }
+
+
+def _load_follows(conn, *, limit_users=None, limit_follows=None):
     with managed_cursor(conn) as cursor:
         user_ids = None
         if limit_users:
             cursor.execute("SELECT id FROM users ORDER BY id ASC LIMIT %s;", (limit_users,))
             user_ids = [row["id"] for row in cursor.fetchall()]
             if not user_ids:
-                return {"processed_follows": 0, "events_emitted": 0, "outbox_enqueued": 0}
+                return []
 
         query = """
             SELECT
@@ -45,23 +58,190 @@ def refresh_all_follows(
             params.append(limit_follows)
 
         cursor.execute(query, tuple(params))
-        follows = cursor.fetchall()
+        return cursor.fetchall()
 
-        cursor.execute("SELECT COUNT(*) AS count FROM notification_outbox;")
-        outbox_before = cursor.fetchone()["count"]
 
-    events_emitted = 0
+def refresh_all_follows(
+    conn,
+    *,
+    limit_users=None,
+    limit_follows=None,
+    force_fetch=False,
+):
+    follows = _load_follows(conn, limit_users=limit_users, limit_follows=limit_follows)
+    overrides = load_override_map(conn)
+
+    event_counts = {}
+    outbox_counts = {}
     for follow in follows:
-        events_emitted += len(
-            refresh_follow(conn, follow, None, follow, force_fetch=force_fetch, emit_events=True)
+        emitted = refresh_follow(
+            conn,
+            follow,
+            None,
+            follow,
+            force_fetch=force_fetch,
+            emit_events=True,
+            outbox_counts=outbox_counts,
+            overrides=overrides,
         )
+        for event_type in emitted:
+            event_counts[event_type] = event_counts.get(event_type, 0) + 1
+
+    return _build_summary(len(follows), event_counts, outbox_counts)
+
 
+def _fresh_tracking_keys(conn, keys):
+    if not keys:
+        return set()
     with managed_cursor(conn) as cursor:
-        cursor.execute("SELECT COUNT(*) AS count FROM notification_outbox;")
-        outbox_after = cursor.fetchone()["count"]
+        cursor.execute(
+            """
+            SELECT media_type, tmdb_id, season_number
+            FROM tmdb_cache
+            WHERE (media_type, tmdb_id, season_number) IN %s
+              AND expires_at IS NOT NULL
+              AND expires_at > timezone('utc', now());
+            """,
+            (tuple(keys),),
+        )
+        return {
+            (row["media_type"], row["tmdb_id"], row["season_number"]) for row in cursor.fetchall()
+        }
 
-    return {
-        "processed_follows": len(follows),
-        "events_emitted": events_emitted,
-        "outbox_enqueued": max(outbox_after - outbox_before, 0),
-    }
+
+async def _fetch_tracking_payload(client, key):
+    media_type, tmdb_id, season_number = key
+    if media_type == "movie":
+        return await client.get_movie_details(tmdb_id)
+    if media_type == "tv":
+        return await client.get_tv_details(tmdb_id)
+    if media_type == "season":
+        return await client.get_tv_season_details(tmdb_id, season_number)
+    raise ValueError(f"Unknown media_type {media_type}")
+
+
+async def _prefetch_tracking_payloads(client, keys):
+    results = await asyncio.gather(
+        *(_fetch_tracking_payload(client, key) for key in keys),
+        return_exceptions=True,
+    )
+    return dict(zip(keys, results))
+
+
+async def refresh_all_follows_async(
+    conn,
+    *,
+    limit_users=None,
+    limit_follows=None,
+    force_fetch=False,
+    client=None,
+):
+    """Same contract as refresh_all_follows, but stale TMDB payloads are fetched concurrently
+    up front; diffing and event emission then run sequentially on ``conn``."""
+    follows = _load_follows(conn, limit_users=limit_users, limit_follows=limit_follows)
+
+    keys = []
+    seen = set()
+    for follow in follows:
+        key = _tracking_key(follow["target_type"], follow)
+        if key not in seen:
+            seen.add(key)
+            keys.append(key)
+    if not force_fetch:
+        fresh = _fresh_tracking_keys(conn, keys)
+        keys = [key for key in keys if key not in fresh]
+
+    if client is None:
+        async with AsyncTMDBClient() as owned_client:
+            prefetched = await _prefetch_tracking_payloads(owned_client, keys)
+    else:
+        prefetched = await _prefetch_tracking_payloads(client, keys)
+
+    overrides = load_override_map(conn)
+    event_counts = {}
+    outbox_counts = {}
+    applied = set()
+    for follow in follows:
+        key = _tracking_key(follow["target_type"], follow)
+        payload = prefetched.pop(key, None)
+        if isinstance(payload, BaseException):
+            raise payload
+        emitted = refresh_follow(
+            conn,
+            follow,
+            None,
+            follow,
+            # The first follower of a key already refreshed the cache with the prefetched payload.
+            force_fetch=force_fetch and key not in applied,
+            emit_events=True,
+            outbox_counts=outbox_counts,
+            prefetched_payload=payload,
+            overrides=overrides,
+        )
+        applied.add(key)
+        for event_type in emitted:
+            event_counts[event_type] = event_counts.get(event_type, 0) + 1
+
+    return _build_summary(len(follows), event_counts, outbox_counts)
+
+
+PREVIEW_ITEMS_LIMIT = 200
+
+
+def preview_refresh_all_follows(
+    conn,
+    *,
+    limit_users=None,
+    limit_follows=None,
+    force_fetch=False,
+    items_limit=PREVIEW_ITEMS_LIMIT,
+):
+    """Dry run of refresh_all_follows: diffs every follow and reports the change_events and
+    outbox rows a real run would write, without touching the database."""
+    follows = _load_follows(conn, limit_users=limit_users, limit_follows=limit_follows)
+    overrides = load_override_map(conn)
+
+    event_counts = {}
+    outbox_counts = {}
+    items = []
+    diffed = set()
+    try:
+        for follow in follows:
+            key = _tracking_key(follow["target_type"], follow)
+            if key in diffed:
+                # A real run refreshes the cache for the first follower, so later followers
+                # of the same title see no change.
+                continue
+            diffed.add(key)
+            previews = preview_follow(
+                conn, follow, follow, force_fetch=force_fetch, overrides=overrides
+            )
+            for preview in previews:
+                event_type = preview["event_type"]
+                event_counts[event_type] = event_counts.get(event_type, 0) + 1
+                _count_outbox(outbox_counts, event_type, preview["channels"])
+                if len(items) < items_limit:
+                    items.append(
+                        {
+                            "follow_id": follow["id"],
+                            "user_id": follow["user_id"],
+                            "target_type": follow["target_type"],
+                            "tmdb_id": follow["tmdb_id"],
+                            "season_number": follow["season_number"],
+                            **preview,
+                        }
+                    )
+    finally:
+        conn.rollback()
+
+    summary = _build_summary(len(follows), event_counts, outbox_counts)
+    summary["dry_run"] = True
+    summary["items"] = items
+    summary["items_truncated"] = summary["events_emitted"] > len(items)
+    return summary
+
+
+def run_refresh_all_follows(conn, *, use_async=False, **kwargs):
+    if use_async:
+        return asyncio.run(refresh_all_follows_async(conn, **kwargs))
+    return refresh_all_follows(conn, **kwargs)
@@ -4,7 +4,10 @@ from psycopg2.extras import Json
 
 from database import get_cursor
 from services import tmdb_client
+from services.outbox_signal import notify_outbox
+from services import tmdb_overrides
 from services import tmdb_tracking_cache
+from services import tv_status_index
 
 
 def _parse_date(value):
@@ -107,7 +110,9 @@ def _fetch_existing_cache(conn, media_type, tmdb_id, season_number):
             last_air_date,
             next_air_date,
             season_air_date,
-            season_last_episode_air_date
+            season_last_episode_air_date,
+            unchanged_refresh_count,
+            applied_override
         FROM tmdb_cache
         WHERE media_type = %s AND tmdb_id = %s AND season_number = %s;
         """,
@@ -118,6 +123,26 @@ def _fetch_existing_cache(conn, media_type, tmdb_id, season_number):
     return row
 
 
+_CHANGE_TRACKED_FIELDS = (
+    "status_raw",
+    "release_date",
+    "first_air_date",
+    "last_air_date",
+    "next_air_date",
+    "season_air_date",
+    "season_last_episode_air_date",
+)
+
+
+def _next_unchanged_refresh_count(previous, cache_fields):
+    if not previous:
+        return 0
+    for field in _CHANGE_TRACKED_FIELDS:
+        if previous.get(field) != cache_fields.get(field):
+            return 0
+    return (previous.get("unchanged_refresh_count") or 0) + 1
+
+
 def _insert_event(cursor, user_id, follow_id, event_type, payload):
     cursor.execute(
         """
@@ -130,24 +155,31 @@ def _insert_event(cursor, user_id, follow_id, event_type, payload):
     return cursor.fetchone()["id"]
 
 
-def _enqueue_notifications(
-    cursor, user_id, follow, event_type, event_payload, prefs, *, change_event_id, tmdb_payload
-):
+def _notification_channels(prefs):
     channels = []
     if prefs.get("channel_email"):
         channels.append("email")
     if prefs.get("channel_whatsapp"):
         channels.append("whatsapp")
+    return channels
+
+
+def _enqueue_notifications(
+    cursor, user_id, follow, event_type, event_payload, prefs, *, change_event_id, tmdb_payload
+):
+    channels = _notification_channels(prefs)
     if follow["target_type"] == "movie":
         title = tmdb_payload.get("title")
     else:
         title = tmdb_payload.get("name")
+    enqueued_channels = []
     for channel in channels:
         cursor.execute(
             """
             INSERT INTO notification_outbox (user_id, follow_id, change_event_id, channel, payload)
             VALUES (%s, %s, %s, %s, %s)
-            ON CONFLICT (change_event_id, channel) DO NOTHING;
+            ON CONFLICT (change_event_id, channel) DO NOTHING
+            RETURNING id;
             """,
             (
                 user_id,
@@ -166,56 +198,72 @@ def _enqueue_notifications(
                 ),
             ),
         )
+        if cursor.fetchone():
+            enqueued_channels.append(channel)
+            notify_outbox(cursor, channel)
+    return enqueued_channels
 
 
-def refresh_follow(conn, follow, state, prefs, *, force_fetch=False, emit_events=True):
+def _count_outbox(outbox_counts, event_type, channels):
+    if outbox_counts is None:
+        return
+    by_channel = outbox_counts.setdefault(event_type, {})
+    for channel in channels:
+        by_channel[channel] = by_channel.get(channel, 0) + 1
+
+
+def _resolve_tracking_state(conn, follow, *, force_fetch, prefetched_payload, overrides):
     target_type = follow["target_type"]
     media_type, tmdb_id, season_number = _tracking_key(target_type, follow)
 
     cached = None
-    if not force_fetch:
+    if not force_fetch and prefetched_payload is None:
         cached = tmdb_tracking_cache.get_tracking_cache(conn, media_type, tmdb_id, season_number)
 
     if cached:
-        tmdb_payload = cached["payload"]
-        cache_fields = cached
-        previous = cached
+        effective = tmdb_overrides.effective_tracking_fields(media_type, cached)
+        return {
+            "key": (media_type, tmdb_id, season_number),
+            "cached": True,
+            "tmdb_payload": cached["payload"],
+            "cache_fields": cached,
+            "previous": cached,
+            "effective_fields": effective,
+            "previous_effective": effective,
+            "override": None,
+        }
+
+    if prefetched_payload is not None:
+        tmdb_payload = prefetched_payload
+    elif target_type == "movie":
+        tmdb_payload = tmdb_client.get_movie_details(tmdb_id)
+    elif target_type == "tv_full":
+        tmdb_payload = tmdb_client.get_tv_details(tmdb_id)
+    elif target_type == "tv_season":
+        tmdb_payload = tmdb_client.get_tv_season_details(tmdb_id, season_number)
     else:
-        if target_type == "movie":
-            tmdb_payload = tmdb_client.get_movie_details(tmdb_id)
-        elif target_type == "tv_full":
-            tmdb_payload = tmdb_client.get_tv_details(tmdb_id)
-        elif target_type == "tv_season":
-            tmdb_payload = tmdb_client.get_tv_season_details(tmdb_id, season_number)
-        else:
-            raise ValueError(f"Unknown target_type {target_type}")
-
-        cache_fields = _extract_tracking_fields(target_type, tmdb_payload)
-        ttl_seconds = tmdb_tracking_cache.compute_tracking_ttl_seconds(
-            media_type, tmdb_payload, follow["target_type"]
-        )
-        previous = _fetch_existing_cache(conn, media_type, tmdb_id, season_number)
-        tmdb_tracking_cache.upsert_tracking_cache(
-            conn,
-            media_type,
-            tmdb_id,
-            season_number,
-            tmdb_payload,
-            cache_fields,
-            ttl_seconds,
-        )
+        raise ValueError(f"Unknown target_type {target_type}")
 
-    if not previous:
-        if not cached:
-            conn.commit()
-        return []
+    if overrides is None:
+        override = tmdb_overrides.load_override(conn, media_type, tmdb_id, season_number)
+    else:
+        override = overrides.get((media_type, tmdb_id, season_number))
+    # The cache keeps raw TMDB values; overrides only shape what is diffed.
+    cache_fields = _extract_tracking_fields(target_type, tmdb_payload)
+    previous = _fetch_existing_cache(conn, media_type, tmdb_id, season_number)
+    return {
+        "key": (media_type, tmdb_id, season_number),
+        "cached": False,
+        "tmdb_payload": tmdb_payload,
+        "cache_fields": cache_fields,
+        "previous": previous,
+        "effective_fields": tmdb_overrides.apply_override(media_type, cache_fields, override),
+        "previous_effective": tmdb_overrides.effective_tracking_fields(media_type, previous),
+        "override": override,
+    }
 
-    if not emit_events:
-        if not cached:
-            conn.commit()
-        return []
 
-    cursor = get_cursor(conn)
+def _diff_events(target_type, previous, cache_fields, prefs):
     events = []
     today = datetime.date.today()
 
@@ -224,18 +272,7 @@ def refresh_follow(conn, follow, state, prefs, *, force_fetch=False, emit_events
     def emit(event_type, payload):
         if event_type in date_event_types and not prefs.get("notify_date_changes", True):
             return
-        event_id = _insert_event(cursor, follow["user_id"], follow["id"], event_type, payload)
-        _enqueue_notifications(
-            cursor,
-            follow["user_id"],
-            follow,
-            event_type,
-            payload,
-            prefs,
-            change_event_id=event_id,
-            tmdb_payload=tmdb_payload,
-        )
-        events.append(event_type)
+        events.append((event_type, payload))
 
     if target_type == "movie":
         prev_release = previous["release_date"]
@@ -284,6 +321,108 @@ def refresh_follow(conn, follow, state, prefs, *, force_fetch=False, emit_events
                 {"from": prev_next.isoformat(), "to": new_next.isoformat(), "field": "next_air_date"},
             )
 
+    return events
+
+
+def refresh_follow(
+    conn,
+    follow,
+    state,
+    prefs,
+    *,
+    force_fetch=False,
+    emit_events=True,
+    outbox_counts=None,
+    prefetched_payload=None,
+    overrides=None,
+):
+    resolved = _resolve_tracking_state(
+        conn,
+        follow,
+        force_fetch=force_fetch,
+        prefetched_payload=prefetched_payload,
+        overrides=overrides,
+    )
+    media_type, tmdb_id, season_number = resolved["key"]
+    cached = resolved["cached"]
+    tmdb_payload = resolved["tmdb_payload"]
+    cache_fields = resolved["cache_fields"]
+    previous = resolved["previous"]
+
+    if not cached:
+        unchanged_refresh_count = _next_unchanged_refresh_count(previous, cache_fields)
+        ttl_seconds = tmdb_tracking_cache.compute_tracking_ttl_seconds(
+            media_type,
+            tmdb_payload,
+            follow["target_type"],
+            unchanged_refreshes=unchanged_refresh_count,
+        )
+        tmdb_tracking_cache.upsert_tracking_cache(
+            conn,
+            media_type,
+            tmdb_id,
+            season_number,
+            tmdb_payload,
+            cache_fields,
+            ttl_seconds,
+            unchanged_refresh_count=unchanged_refresh_count,
+            applied_override=tmdb_overrides.override_snapshot(resolved["override"]),
+        )
+        if media_type == "tv":
+            tv_status_index.record_many(conn, [tmdb_payload])
+
+    if not previous:
+        if not cached:
+            conn.commit()
+        return []
+
+    if not emit_events:
+        if not cached:
+            conn.commit()
+        return []
+
+    cursor = get_cursor(conn)
+    events = []
+    for event_type, payload in _diff_events(
+        follow["target_type"], resolved["previous_effective"], resolved["effective_fields"], prefs
+    ):
+        event_id = _insert_event(cursor, follow["user_id"], follow["id"], event_type, payload)
+        enqueued_channels = _enqueue_notifications(
+            cursor,
+            follow["user_id"],
+            follow,
+            event_type,
+            payload,
+            prefs,
+            change_event_id=event_id,
+            tmdb_payload=tmdb_payload,
+        )
+        _count_outbox(outbox_counts, event_type, enqueued_channels)
+        events.append(event_type)
+
     conn.commit()
     cursor.close()
     return events
+
+
+def preview_follow(conn, follow, prefs, *, force_fetch=False, overrides=None):
+    """Return the change events refresh_follow would emit, without writing anything."""
+    resolved = _resolve_tracking_state(
+        conn,
+        follow,
+        force_fetch=force_fetch,
+        prefetched_payload=None,
+        overrides=overrides,
+    )
+    if not resolved["previous"]:
+        return []
+    channels = _notification_channels(prefs)
+    return [
+        {"event_type": event_type, "event_payload": payload, "channels": channels}
+        for event_type, payload in _diff_events(
+            follow["target_type"],
+            resolved["previous_effective"],
+            resolved["effective_fields"],
+            prefs,
+        )
+    ]
@@ -0,0 +1,184 @@
+import gzip
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from flask import current_app, request
+
+import config
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is the default and works without it
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+COMPRESSIBLE_MIMETYPES = {"application/json", "text/html", "text/plain", "text/css"}
+
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+# Built assets are content-hashed by Vite, so they can be cached forever.
+ASSET_MAX_AGE_SECONDS = 365 * 24 * 3600
+
+_PRECOMPRESSED_SUFFIXES = {"br": ".br", "gzip": ".gz"}
+
+
+def supported_encodings():
+    if config.COMPRESSION_BROTLI and brotli is not None:
+        return ["br", "gzip"]
+    return ["gzip"]
+
+
+def choose_encoding(accept_encodings, available=None):
+    """Best encoding the client accepts out of ``available`` (default: what we can produce)."""
+    if available is None:
+        available = supported_encodings()
+    return accept_encodings.best_match(available)
+
+
+def compress(body, encoding):
+    if encoding == "br":
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    if encoding == "gzip":
+        return gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+    raise ValueError(f"Unsupported encoding: {encoding}")
+
+
+class CompressedBodyCache:
+    """Bounded LRU of compressed bodies keyed by ``(tmdb cache key, encoding)``.
+
+    Entries expire after ``ttl_seconds`` so a payload refreshed by another process is picked
+    up; within this process a MISS for the key drops its older variants immediately."""
+
+    def __init__(self, max_bytes, ttl_seconds):
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, body = entry
+            if expires_at <= time.monotonic():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return body
+
+    def put(self, key, body):
+        if len(body) > self.max_bytes:
+            return
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, body)
+            self._size += len(body)
+            while self._size > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+
+    def discard(self, cache_key):
+        with self._lock:
+            for encoding in ("br", "gzip"):
+                self._remove((cache_key, encoding))
+
+    def _remove(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._size -= len(entry[1])
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+
+compressed_bodies = CompressedBodyCache(
+    config.COMPRESSION_CACHE_MAX_BYTES, config.COMPRESSION_CACHE_TTL_SECONDS
+)
+
+
+def remember_compressed(response, cache_key, *, refreshed):
+    """Have compress_response keep this response's compressed body under ``cache_key``.
+
+    ``refreshed`` means the payload behind the key was just rebuilt, so bodies compressed from
+    the previous payload are dropped."""
+    if refreshed:
+        compressed_bodies.discard(cache_key)
+    response.compression_cache_key = cache_key
+
+
+def reuse_compressed(cache_key, mimetype="application/json"):
+    """Response carrying the remembered compressed body for ``cache_key`` in an encoding the
+    client accepts, or None. Lets a cache HIT skip serializing and compressing the payload."""
+    if not config.COMPRESSION_ENABLED:
+        return None
+    encoding = choose_encoding(request.accept_encodings)
+    if encoding is None:
+        return None
+    body = compressed_bodies.get((cache_key, encoding))
+    if body is None:
+        return None
+    response = current_app.response_class(body, mimetype=mimetype)
+    response.headers["Content-Encoding"] = encoding
+    response.vary.add("Accept-Encoding")
+    return response
+
+
+def compress_response(response):
+    if response.mimetype not in COMPRESSIBLE_MIMETYPES:
+        return response
+    response.vary.add("Accept-Encoding")
+    if (
+        response.status_code != 200
+        or response.direct_passthrough
+        or response.is_streamed
+        or "Content-Encoding" in response.headers
+    ):
+        return response
+    encoding = choose_encoding(request.accept_encodings)
+    if encoding is None:
+        return response
+    body = response.get_data()
+    if len(body) < config.COMPRESSION_MIN_BYTES:
+        return response
+    compressed = compress(body, encoding)
+    if len(compressed) >= len(body):
+        return response
+    # Only responses backed by the TMDB cache repeat often enough to be worth remembering.
+    cache_key = getattr(response, "compression_cache_key", None)
+    if cache_key is not None:
+        compressed_bodies.put((cache_key, encoding), compressed)
+    response.set_data(compressed)
+    response.headers["Content-Encoding"] = encoding
+    return response
+
+
+def register_response_compression(app):
+    if not config.COMPRESSION_ENABLED:
+        return
+    app.after_request(compress_response)
+
+
+def precompressed_asset(directory, path):
+    """Return ``(filename, encoding)`` for the best precompressed sibling of ``path`` the client
+    accepts (``app.js.br``, ``app.js.gz``), or ``(path, None)`` to serve the file as is."""
+    available = [
+        encoding
+        for encoding, suffix in _PRECOMPRESSED_SUFFIXES.items()
+        if os.path.isfile(os.path.join(directory, path + suffix))
+    ]
+    encoding = choose_encoding(request.accept_encodings, available) if available else None
+    if encoding is None:
+        return path, None
+    return path + _PRECOMPRESSED_SUFFIXES[encoding], encoding
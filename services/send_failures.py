@@ -0,0 +1,41 @@
+import smtplib
+import socket
+
+from services.email_provider import EmailAPIError
+
+PERMANENT = "permanent"
+TRANSIENT = "transient"
+# The provider itself is misconfigured or refusing us; no message can succeed until it is fixed.
+PROVIDER = "provider"
+
+
+def classify_send_failure(exc):
+    """Return (failure_class, failure_reason) for an exception raised while rendering or
+    sending a notification. Permanent failures will not succeed on retry; provider failures
+    say nothing about the message and should stop the batch instead."""
+    if isinstance(exc, smtplib.SMTPRecipientsRefused):
+        codes = [code for code, _ in (exc.recipients or {}).values()]
+        if codes and all(code >= 500 for code in codes):
+            return PERMANENT, "bad_address"
+        return TRANSIENT, "recipient_deferred"
+    if isinstance(exc, smtplib.SMTPAuthenticationError):
+        return PROVIDER, "auth"
+    if isinstance(exc, smtplib.SMTPServerDisconnected):
+        return TRANSIENT, "connection"
+    if isinstance(exc, smtplib.SMTPResponseException):
+        if exc.smtp_code >= 500:
+            if exc.smtp_code in (550, 551, 553):
+                return PERMANENT, "bad_address"
+            return PERMANENT, "rejected"
+        return TRANSIENT, "deferred"
+    if isinstance(exc, EmailAPIError):
+        if exc.status_code == 429 or exc.status_code >= 500:
+            return TRANSIENT, "deferred"
+        if exc.status_code in (401, 403):
+            return PROVIDER, "auth"
+        return PERMANENT, "rejected"
+    if isinstance(exc, (socket.timeout, TimeoutError)):
+        return TRANSIENT, "timeout"
+    if isinstance(exc, (ConnectionError, OSError, smtplib.SMTPException)):
+        return TRANSIENT, "connection"
+    return TRANSIENT, "unknown"
@@ -0,0 +1,105 @@
+import smtplib
+import threading
+import time
+
+import config
+
+
+def recipient_domain(email):
+    if not email or "@" not in email:
+        return ""
+    return email.rsplit("@", 1)[1].strip().lower()
+
+
+def transient_smtp_code(exc):
+    """Return the SMTP 4xx code carried by ``exc``, or None when it is not a deferral."""
+    if isinstance(exc, smtplib.SMTPRecipientsRefused):
+        codes = [code for code, _ in (exc.recipients or {}).values()]
+        if codes and all(400 <= code < 500 for code in codes):
+            return codes[0]
+        return None
+    if isinstance(exc, smtplib.SMTPResponseException):
+        if 400 <= exc.smtp_code < 500:
+            return exc.smtp_code
+    return None
+
+
+class _DomainBucket:
+    def __init__(self, rate_per_second, burst, now):
+        self.rate = rate_per_second
+        self.tokens = float(burst)
+        self.updated_at = now
+        self.cooldown_until = 0.0
+        # Retry slot handed to the last refused message; later ones queue behind it.
+        self.last_slot = float("-inf")
+
+
+class DomainThrottle:
+    """Token bucket per recipient domain with AIMD rate adaptation: a 4xx deferral halves the
+    domain's rate and pauses it for ``defer_seconds``; each success adds a little rate back."""
+
+    def __init__(
+        self,
+        *,
+        rate_per_minute=None,
+        burst=None,
+        min_rate_per_minute=None,
+        defer_seconds=None,
+        clock=time.monotonic,
+    ):
+        self.base_rate = (rate_per_minute or config.EMAIL_DOMAIN_RATE_PER_MINUTE) / 60.0
+        self.min_rate = (min_rate_per_minute or config.EMAIL_DOMAIN_MIN_RATE_PER_MINUTE) / 60.0
+        self.burst = burst or config.EMAIL_DOMAIN_BURST
+        self.defer_seconds = defer_seconds or config.EMAIL_DOMAIN_DEFER_SECONDS
+        self._clock = clock
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def _bucket(self, domain, now):
+        bucket = self._buckets.get(domain)
+        if bucket is None:
+            bucket = _DomainBucket(self.base_rate, self.burst, now)
+            self._buckets[domain] = bucket
+        else:
+            elapsed = max(0.0, now - bucket.updated_at)
+            bucket.tokens = min(self.burst, bucket.tokens + elapsed * bucket.rate)
+            bucket.updated_at = max(now, bucket.updated_at)
+        return bucket
+
+    def acquire(self, domain):
+        """Take a send token for ``domain``. Returns 0 when sending may proceed, otherwise the
+        number of seconds until this message's retry slot. Each refused message gets the next
+        slot, one token interval after the previous one, so deferred retries do not all come
+        back at once."""
+        with self._lock:
+            now = self._clock()
+            bucket = self._bucket(domain, now)
+            if bucket.cooldown_until > now:
+                ready_at = bucket.cooldown_until
+            elif bucket.tokens >= 1:
+                bucket.tokens -= 1
+                return 0
+            else:
+                ready_at = now + (1 - bucket.tokens) / bucket.rate
+            slot = max(ready_at, bucket.last_slot + 1 / bucket.rate)
+            bucket.last_slot = slot
+            return slot - now
+
+    def record_success(self, domain):
+        with self._lock:
+            bucket = self._buckets.get(domain)
+            if bucket is not None and bucket.rate < self.base_rate:
+                bucket.rate = min(self.base_rate, bucket.rate + self.base_rate / 10)
+
+    def record_deferral(self, domain):
+        """Slow ``domain`` down after a 4xx and return how long to hold its messages."""
+        with self._lock:
+            now = self._clock()
+            bucket = self._bucket(domain, now)
+            bucket.rate = max(self.min_rate, bucket.rate / 2)
+            bucket.tokens = 0.0
+            bucket.cooldown_until = now + self.defer_seconds
+            bucket.last_slot = float("-inf")
+            # Refill resumes only once the cooldown ends, so the domain restarts slowly.
+            bucket.updated_at = bucket.cooldown_until
+            return self.defer_seconds
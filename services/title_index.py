@@ -0,0 +1,171 @@
+import threading
+
+from psycopg2.extras import execute_values
+
+from database import get_db, managed_cursor
+from services import tmdb_http_cache
+
+SUGGEST_MIN_QUERY_LENGTH = 2
+
+_memory_index = {}
+_memory_lock = threading.Lock()
+
+
+def _index_row(item, default_media_type=None):
+    if not isinstance(item, dict) or not item.get("id"):
+        return None
+    media_type = item.get("media_type") or default_media_type
+    if media_type not in ("movie", "tv"):
+        return None
+    title = item.get("title") or item.get("name")
+    if not title:
+        return None
+    original_title = item.get("original_title") or item.get("original_name")
+    return {
+        "media_type": media_type,
+        "tmdb_id": int(item["id"]),
+        "title": title,
+        "title_norm": tmdb_http_cache.normalize_query(title),
+        "original_norm": tmdb_http_cache.normalize_query(original_title or ""),
+        "poster_path": item.get("poster_path"),
+        "release_date": item.get("release_date") or item.get("first_air_date"),
+        "popularity": item.get("popularity"),
+        "vote_average": item.get("vote_average"),
+        "vote_count": item.get("vote_count"),
+    }
+
+
+def index_titles(conn, items, *, default_media_type=None):
+    """Add TMDB result/detail items to the local title index; returns how many were indexed."""
+    rows = {}
+    for item in items or []:
+        row = _index_row(item, default_media_type)
+        if row:
+            rows[(row["media_type"], row["tmdb_id"])] = row
+    if not rows:
+        return 0
+
+    if conn is None and tmdb_http_cache._use_memory_cache():
+        with _memory_lock:
+            for key, row in rows.items():
+                previous = _memory_index.get(key) or {}
+                for field in ("original_norm", "poster_path", "release_date", "popularity"):
+                    row[field] = row[field] or previous.get(field)
+                row["original_norm"] = row["original_norm"] or ""
+                _memory_index[key] = row
+        return len(rows)
+
+    db = conn or get_db()
+    with managed_cursor(db) as cursor:
+        execute_values(
+            cursor,
+            """
+            INSERT INTO tmdb_title_index (
+                media_type,
+                tmdb_id,
+                title,
+                title_norm,
+                original_norm,
+                poster_path,
+                release_date,
+                popularity,
+                vote_average,
+                vote_count
+            )
+            VALUES %s
+            ON CONFLICT (media_type, tmdb_id)
+            DO UPDATE SET
+                title = EXCLUDED.title,
+                title_norm = EXCLUDED.title_norm,
+                original_norm = COALESCE(
+                    NULLIF(EXCLUDED.original_norm, ''), tmdb_title_index.original_norm
+                ),
+                poster_path = COALESCE(EXCLUDED.poster_path, tmdb_title_index.poster_path),
+                release_date = COALESCE(EXCLUDED.release_date, tmdb_title_index.release_date),
+                popularity = COALESCE(EXCLUDED.popularity, tmdb_title_index.popularity),
+                vote_average = EXCLUDED.vote_average,
+                vote_count = EXCLUDED.vote_count,
+                updated_at = NOW()
+            """,
+            [
+                (
+                    row["media_type"],
+                    row["tmdb_id"],
+                    row["title"],
+                    row["title_norm"],
+                    row["original_norm"],
+                    row["poster_path"],
+                    row["release_date"],
+                    row["popularity"],
+                    row["vote_average"],
+                    row["vote_count"],
+                )
+                for row in rows.values()
+            ],
+            page_size=len(rows),
+        )
+    if conn is None:
+        db.commit()
+    return len(rows)
+
+
+def _matches(norm, query):
+    return norm.startswith(query) or f" {query}" in norm
+
+
+def _as_result(row):
+    date_field = "release_date" if row["media_type"] == "movie" else "first_air_date"
+    title_field = "title" if row["media_type"] == "movie" else "name"
+    return {
+        "id": row["tmdb_id"],
+        "media_type": row["media_type"],
+        title_field: row["title"],
+        "poster_path": row["poster_path"],
+        date_field: row["release_date"],
+        "vote_average": row["vote_average"],
+        "vote_count": row["vote_count"],
+    }
+
+
+def suggest(conn, query, *, limit=10):
+    """Titles whose name (or original name) has a word starting with ``query``, shaped like
+    TMDB search/multi results; title-prefix matches first, then by popularity."""
+    query = tmdb_http_cache.normalize_query(query)
+    if len(query) < SUGGEST_MIN_QUERY_LENGTH:
+        return []
+
+    if conn is None and tmdb_http_cache._use_memory_cache():
+        with _memory_lock:
+            rows = [
+                row
+                for row in _memory_index.values()
+                if _matches(row["title_norm"], query) or _matches(row["original_norm"], query)
+            ]
+        rows.sort(
+            key=lambda row: (
+                not row["title_norm"].startswith(query),
+                -(row["popularity"] or 0),
+                row["title_norm"],
+            )
+        )
+        return [_as_result(row) for row in rows[:limit]]
+
+    escaped = query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    db = conn or get_db()
+    with managed_cursor(db) as cursor:
+        cursor.execute(
+            """
+            SELECT media_type, tmdb_id, title, poster_path, release_date, vote_average, vote_count
+            FROM tmdb_title_index
+            WHERE title_norm LIKE %(prefix)s
+               OR title_norm LIKE %(word)s
+               OR original_norm LIKE %(prefix)s
+               OR original_norm LIKE %(word)s
+            ORDER BY (title_norm LIKE %(prefix)s) DESC,
+                     popularity DESC NULLS LAST,
+                     title_norm ASC
+            LIMIT %(limit)s
+            """,
+            {"prefix": f"{escaped}%", "word": f"% {escaped}%", "limit": limit},
+        )
+        return [_as_result(row) for row in cursor.fetchall()]
@@ -0,0 +1,195 @@
+import asyncio
+import random
+
+import httpx
+
+import config
+from services.tmdb_client import (
+    TMDB_BASE_URL,
+    TMDB_TIMEOUT_SECONDS,
+    TMDBRateLimitError,
+    TMDBRequestError,
+    TMDBUpstreamError,
+    _classify_error,
+    _get_auth_params,
+)
+
+
+class AsyncRateLimiter:
+    """Caps in-flight requests and spaces request starts to a steady rate."""
+
+    def __init__(self, *, rate_per_second, max_in_flight):
+        self._semaphore = asyncio.Semaphore(max_in_flight)
+        self._interval = 1.0 / rate_per_second
+        self._lock = asyncio.Lock()
+        self._next_slot = 0.0
+
+    async def __aenter__(self):
+        await self._semaphore.acquire()
+        try:
+            async with self._lock:
+                now = asyncio.get_running_loop().time()
+                wait = self._next_slot - now
+                self._next_slot = max(now, self._next_slot) + self._interval
+            if wait > 0:
+                await asyncio.sleep(wait)
+        except BaseException:
+            self._semaphore.release()
+            raise
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self._semaphore.release()
+        return False
+
+
+class AsyncTMDBClient:
+    """asyncio counterpart of services.tmdb_client; raises the same TMDBError classes."""
+
+    def __init__(self, *, rate_per_second=None, max_in_flight=None, http_client=None):
+        max_in_flight = max_in_flight or config.TMDB_ASYNC_MAX_IN_FLIGHT
+        self._limiter = AsyncRateLimiter(
+            rate_per_second=rate_per_second or config.TMDB_ASYNC_RATE_PER_SECOND,
+            max_in_flight=max_in_flight,
+        )
+        self._owns_http_client = http_client is None
+        self._http = http_client or httpx.AsyncClient(
+            timeout=TMDB_TIMEOUT_SECONDS,
+            limits=httpx.Limits(
+                max_connections=max_in_flight,
+                max_keepalive_connections=max_in_flight,
+            ),
+        )
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.aclose()
+        return False
+
+    async def aclose(self):
+        if self._owns_http_client:
+            await self._http.aclose()
+
+    async def _request(self, path, params=None):
+        headers, base_params = _get_auth_params()
+        merged_params = {**base_params, **(params or {})}
+        url = f"{TMDB_BASE_URL}{path}"
+        for attempt in range(2):
+            try:
+                async with self._limiter:
+                    response = await self._http.get(url, headers=headers, params=merged_params)
+            except httpx.HTTPError as exc:
+                raise TMDBUpstreamError("TMDB request failed.") from exc
+
+            if response.status_code < 400:
+                try:
+                    return response.json()
+                except ValueError as exc:
+                    raise TMDBUpstreamError("TMDB response was not valid JSON.") from exc
+
+            error_cls = _classify_error(response)
+            if error_cls in {TMDBRateLimitError, TMDBUpstreamError} and attempt == 0:
+                await asyncio.sleep(0.3 + random.random() * 0.2)
+                continue
+            raise error_cls("TMDB request failed.")
+        raise TMDBUpstreamError("TMDB request failed.")
+
+    async def tmdb_get(self, path, params=None):
+        return await self._request(path, params=params)
+
+    async def search_multi(self, query, page=1, language=None):
+        params = {"query": query, "page": page, "include_adult": False}
+        if language:
+            params["language"] = language
+        return await self.tmdb_get("/search/multi", params=params)
+
+    async def get_movie_details(self, movie_id, append=None):
+        params = {}
+        if append:
+            params["append_to_response"] = append
+        return await self.tmdb_get(f"/movie/{movie_id}", params=params)
+
+    async def get_tv_details(self, tv_id, append=None, language=None):
+        params = {}
+        if append:
+            params["append_to_response"] = append
+        if language:
+            params["language"] = language
+        return await self.tmdb_get(f"/tv/{tv_id}", params=params)
+
+    async def get_tv_season_details(self, tv_id, season_number, append=None):
+        params = {}
+        if append:
+            params["append_to_response"] = append
+        return await self.tmdb_get(f"/tv/{tv_id}/season/{season_number}", params=params)
+
+    async def list_movie_popular(self, page=1, language=None):
+        params = {"page": page}
+        if language:
+            params["language"] = language
+        return await self.tmdb_get("/movie/popular", params=params)
+
+    async def list_movie_upcoming(self, page=1, language=None, region=None):
+        params = {"page": page}
+        if language:
+            params["language"] = language
+        if region:
+            params["region"] = region
+        return await self.tmdb_get("/movie/upcoming", params=params)
+
+    async def list_tv_popular(self, page=1, language=None):
+        params = {"page": page}
+        if language:
+            params["language"] = language
+        return await self.tmdb_get("/tv/popular", params=params)
+
+    async def list_tv_on_the_air(self, page=1, language=None):
+        params = {"page": page}
+        if language:
+            params["language"] = language
+        return await self.tmdb_get("/tv/on_the_air", params=params)
+
+    async def list_tv_top_rated(self, page=1, language=None):
+        params = {"page": page}
+        if language:
+            params["language"] = language
+        return await self.tmdb_get("/tv/top_rated", params=params)
+
+    async def list_tv_airing_today(self, page=1, language=None):
+        params = {"page": page}
+        if language:
+            params["language"] = language
+        return await self.tmdb_get("/tv/airing_today", params=params)
+
+    async def list_tv_changes(self, page=1, start_date=None, end_date=None):
+        params = {"page": page}
+        if start_date:
+            params["start_date"] = start_date
+        if end_date:
+            params["end_date"] = end_date
+        return await self.tmdb_get("/tv/changes", params=params)
+
+    async def list_trending_all_day(self, page=1, language=None):
+        params = {"page": page}
+        if language:
+            params["language"] = language
+        return await self.tmdb_get("/trending/all/day", params=params)
+
+    async def list_trending_tv_week(self, page=1, language=None):
+        params = {"page": page}
+        if language:
+            params["language"] = language
+        return await self.tmdb_get("/trending/tv/week", params=params)
+
+    async def discover_movies(self, params):
+        return await self.tmdb_get("/discover/movie", params=params)
+
+    async def discover_tv(self, params):
+        return await self.tmdb_get("/discover/tv", params=params)
+
+    async def get_watch_providers(self, media_type, tmdb_id):
+        if media_type not in {"movie", "tv"}:
+            raise TMDBRequestError("Invalid media type.")
+        return await self.tmdb_get(f"/{media_type}/{tmdb_id}/watch/providers")
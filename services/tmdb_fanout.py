@@ -0,0 +1,98 @@
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
+import config
+
+logger = logging.getLogger(__name__)
+
+
+class BoundedExecutor:
+    """Process-wide thread pool for per-request TMDB fan-out.
+
+    At most ``max_workers + queue_limit`` tasks are accepted at once; submissions beyond that
+    are refused instead of queueing behind other requests."""
+
+    def __init__(self, *, max_workers, queue_limit):
+        self.max_workers = max_workers
+        self.queue_limit = queue_limit
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="tmdb-fanout"
+        )
+        self._slots = threading.BoundedSemaphore(max_workers + queue_limit)
+
+    def try_submit(self, fn, *args):
+        if not self._slots.acquire(blocking=False):
+            return None
+        try:
+            future = self._executor.submit(fn, *args)
+        except Exception:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_fanout_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = BoundedExecutor(
+                max_workers=config.TMDB_FANOUT_WORKERS,
+                queue_limit=config.TMDB_FANOUT_QUEUE_LIMIT,
+            )
+        return _executor
+
+
+def fan_out(fn, items, *, deadline_seconds=None, executor=None, unstarted=None):
+    """Run ``fn(item)`` for every item on the shared executor.
+
+    Returns ``(results, complete)``. ``results`` lines up with ``items``; an entry is None when
+    the task failed or was still running when the deadline passed, and ``unstarted`` when the
+    executor refused it or it never started before the deadline. Outstanding tasks are
+    cancelled at the deadline and ``complete`` is False."""
+    if deadline_seconds is None:
+        deadline_seconds = config.TMDB_FANOUT_DEADLINE_MS / 1000
+    executor = executor or get_fanout_executor()
+    items = list(items)
+    results = [None] * len(items)
+    if not items:
+        return results, True
+
+    deadline = time.monotonic() + deadline_seconds
+    futures = {}
+    complete = True
+    for index, item in enumerate(items):
+        future = executor.try_submit(fn, item)
+        if future is None:
+            results[index] = unstarted
+            complete = False
+            continue
+        futures[future] = index
+
+    done, not_done = wait(futures, timeout=max(0.0, deadline - time.monotonic()))
+    for future in not_done:
+        if future.cancel():
+            results[futures[future]] = unstarted
+    if not_done:
+        complete = False
+        logger.warning(
+            "tmdb_fanout deadline exceeded finished=%s pending=%s", len(done), len(not_done)
+        )
+
+    for future in done:
+        if future.cancelled():
+            continue
+        try:
+            results[futures[future]] = future.result()
+        except Exception:
+            logger.exception("tmdb_fanout task failed")
+    return results, complete
@@ -4,7 +4,7 @@ import os
 from typing import Optional
 
 from flask import current_app, has_app_context
-from psycopg2.extras import Json
+from psycopg2.extras import Json, execute_values
 
 from database import get_db, managed_cursor
 
@@ -101,6 +101,104 @@ def get_cached(conn, media_type, tmdb_id, season_number) -> Optional[dict]:
     return row.get("payload")
 
 
+def get_remaining_ttl(conn, media_type, tmdb_id, season_number) -> Optional[float]:
+    """Seconds until the entry expires, or None when it is missing or already expired."""
+    if _use_memory_cache():
+        entry = _memory_cache.get(_memory_key(media_type, tmdb_id, season_number))
+        if not entry or not entry.get("expires_at"):
+            return None
+        remaining = (entry["expires_at"] - datetime.datetime.utcnow()).total_seconds()
+        return remaining if remaining > 0 else None
+
+    db = conn or get_db()
+    with managed_cursor(db) as cursor:
+        cursor.execute(
+            """
+            SELECT EXTRACT(EPOCH FROM expires_at - timezone('utc', now())) AS remaining
+            FROM tmdb_cache
+            WHERE media_type = %s
+              AND tmdb_id = %s
+              AND season_number = %s
+              AND expires_at > timezone('utc', now())
+            """,
+            (media_type, tmdb_id, season_number),
+        )
+        row = cursor.fetchone()
+    return float(row["remaining"]) if row else None
+
+
+def get_many(conn, keys) -> dict:
+    """Look up several (media_type, tmdb_id, season_number) keys at once; returns hits only."""
+    keys = list(dict.fromkeys(_memory_key(*key) for key in keys))
+    if not keys:
+        return {}
+    if _use_memory_cache():
+        found = {}
+        for key in keys:
+            payload = get_cached(conn, *key)
+            if payload is not None:
+                found[key] = payload
+        return found
+
+    db = conn or get_db()
+    with managed_cursor(db) as cursor:
+        cursor.execute(
+            """
+            SELECT media_type, tmdb_id, season_number, payload
+            FROM tmdb_cache
+            WHERE (media_type, tmdb_id, season_number) IN %s
+              AND expires_at IS NOT NULL
+              AND expires_at > timezone('utc', now())
+            """,
+            (tuple(keys),),
+        )
+        rows = cursor.fetchall()
+    return {
+        (row["media_type"], row["tmdb_id"], row["season_number"]): row["payload"] for row in rows
+    }
+
+
+def set_many(conn, entries, ttl_seconds) -> None:
+    """Store several payloads keyed by (media_type, tmdb_id, season_number) in one statement."""
+    if not entries:
+        return
+    if _use_memory_cache():
+        for key, payload in entries.items():
+            set_cached(conn, *key, payload, ttl_seconds)
+        return
+
+    expires_at = datetime.datetime.utcnow() + datetime.timedelta(seconds=ttl_seconds)
+    rows = [
+        (media_type, int(tmdb_id), int(season_number), Json(payload), expires_at)
+        for (media_type, tmdb_id, season_number), payload in entries.items()
+    ]
+    db = conn or get_db()
+    with managed_cursor(db) as cursor:
+        execute_values(
+            cursor,
+            """
+            INSERT INTO tmdb_cache (
+                media_type,
+                tmdb_id,
+                season_number,
+                payload,
+                fetched_at,
+                expires_at
+            )
+            VALUES %s
+            ON CONFLICT (media_type, tmdb_id, season_number)
+            DO UPDATE SET
+                payload = EXCLUDED.payload,
+                fetched_at = EXCLUDED.fetched_at,
+                expires_at = EXCLUDED.expires_at
+            """,
+            rows,
+            template="(%s, %s, %s, %s, NOW(), %s)",
+            page_size=len(rows),
+        )
+    db.commit()
+
+
 def set_cached(conn, media_type, tmdb_id, season_number, payload, ttl_seconds) -> None:
     expires_at = datetime.datetime.utcnow() + datetime.timedelta(seconds=ttl_seconds)
     if _use_memory_cache():
@@ -0,0 +1,120 @@
+import datetime
+
+from database import managed_cursor
+
+# Override columns -> tracking fields they replace, per tracking media_type.
+_COMMON_OVERRIDE_FIELDS = {
+    "override_status_raw": ("status_raw",),
+    "override_final_state": ("final_state",),
+    "override_final_completed_at": ("final_completed_at",),
+}
+_MEDIA_OVERRIDE_FIELDS = {
+    "movie": {"override_release_date": ("release_date",)},
+    "tv": {"override_next_air_date": ("next_air_date", "next_episode_date")},
+    "season": {"override_release_date": ("season_air_date",)},
+}
+
+_OVERRIDE_DATE_COLUMNS = (
+    "override_release_date",
+    "override_next_air_date",
+    "override_final_completed_at",
+)
+_OVERRIDE_COLUMNS = (
+    "override_status_raw",
+    "override_release_date",
+    "override_next_air_date",
+    "override_final_state",
+    "override_final_completed_at",
+)
+
+
+_OVERRIDE_SELECT = """
+    SELECT
+        media_type,
+        tmdb_id,
+        season_number,
+        override_status_raw,
+        override_release_date,
+        override_next_air_date,
+        override_final_state,
+        override_final_completed_at
+    FROM admin_tmdb_overrides
+"""
+
+
+def load_override_map(conn):
+    # Always read fresh: a per-process cache would go stale in every other worker after an
+    # admin edit, and the stale value would be stored as the row's applied_override.
+    with managed_cursor(conn) as cursor:
+        cursor.execute(_OVERRIDE_SELECT + ";")
+        rows = cursor.fetchall()
+    return {(row["media_type"], row["tmdb_id"], row["season_number"]): row for row in rows}
+
+
+def load_override(conn, media_type, tmdb_id, season_number):
+    with managed_cursor(conn) as cursor:
+        cursor.execute(
+            _OVERRIDE_SELECT
+            + "WHERE media_type = %s AND tmdb_id = %s AND season_number = %s;",
+            (media_type, tmdb_id, season_number),
+        )
+        return cursor.fetchone()
+
+
+def expire_tracking_entry(conn, media_type, tmdb_id, season_number):
+    # Expire the tracking row so the next refresh re-extracts fields with the current override.
+    with managed_cursor(conn) as cursor:
+        cursor.execute(
+            """
+            UPDATE tmdb_cache
+            SET expires_at = timezone('utc', now())
+            WHERE media_type = %s AND tmdb_id = %s AND season_number = %s;
+            """,
+            (media_type, tmdb_id, season_number),
+        )
+
+
+def apply_override(media_type, fields, override):
+    if not override:
+        return fields
+    merged = dict(fields)
+    mapping = {**_COMMON_OVERRIDE_FIELDS, **_MEDIA_OVERRIDE_FIELDS.get(media_type, {})}
+    for override_column, targets in mapping.items():
+        value = override.get(override_column)
+        if value is None or value == "":
+            continue
+        for target in targets:
+            merged[target] = value
+    return merged
+
+
+def override_snapshot(override):
+    """JSON-safe copy of the override values in effect, stored alongside the raw tracking row."""
+    if not override:
+        return None
+    snapshot = {}
+    for column in _OVERRIDE_COLUMNS:
+        value = override.get(column)
+        if value is None or value == "":
+            continue
+        snapshot[column] = value.isoformat() if isinstance(value, datetime.date) else value
+    return snapshot or None
+
+
+def override_from_snapshot(snapshot):
+    if not snapshot:
+        return None
+    override = dict(snapshot)
+    for column in _OVERRIDE_DATE_COLUMNS:
+        if isinstance(override.get(column), str):
+            override[column] = datetime.date.fromisoformat(override[column])
+    return override
+
+
+def effective_tracking_fields(media_type, cache_row):
+    """Raw tracking row with the override that was applied when it was stored."""
+    if not cache_row:
+        return cache_row
+    return apply_override(
+        media_type, cache_row, override_from_snapshot(cache_row.get("applied_override"))
+    )
@@ -14,7 +14,7 @@ def _parse_date(value):
         return None
 
 
-def _season_dates(payload):
+def _season_dates(payload, today):
     episodes = payload.get("episodes") or []
     dates = []
     for episode in episodes:
@@ -22,7 +22,6 @@ def _season_dates(payload):
         if date_value:
             dates.append(date_value)
     last_episode_date = max(dates) if dates else None
-    today = datetime.date.today()
     future_dates = [date for date in dates if date > today]
     next_episode_date = min(future_dates) if future_dates else None
     return last_episode_date, next_episode_date
@@ -48,7 +47,8 @@ def get_tracking_cache(conn, media_type, tmdb_id, season_number):
             last_episode_date,
             next_episode_date,
             final_state,
-            final_completed_at
+            final_completed_at,
+            applied_override
         FROM tmdb_cache
         WHERE media_type = %s
           AND tmdb_id = %s
@@ -66,7 +66,37 @@ def get_tracking_cache(conn, media_type, tmdb_id, season_number):
     return row
 
 
-def compute_tracking_ttl_seconds(media_type, payload, follow_target_type):
+TRACKING_TTL_MIN_SECONDS = 6 * 60 * 60
+TRACKING_TTL_DEFAULT_SECONDS = 24 * 60 * 60
+TRACKING_TTL_MAX_SECONDS = 7 * 24 * 60 * 60
+# Air/release dates carry no time of day, so land the refresh a little after the date starts.
+TRACKING_TTL_DATE_GRACE_SECONDS = 12 * 60 * 60
+# Consecutive unchanged refreshes tolerated before the TTL starts doubling.
+TRACKING_TTL_BACKOFF_AFTER_UNCHANGED = 3
+# How long after a release/air date a not-yet-updated status keeps the minimum TTL.
+TRACKING_STATUS_FLIP_WINDOW_DAYS = 14
+
+
+def _clamp_ttl(seconds):
+    return int(max(TRACKING_TTL_MIN_SECONDS, min(seconds, TRACKING_TTL_MAX_SECONDS)))
+
+
+def _ttl_until_date(target_date, now):
+    refresh_at = datetime.datetime.combine(target_date, datetime.time.min) + datetime.timedelta(
+        seconds=TRACKING_TTL_DATE_GRACE_SECONDS
+    )
+    return _clamp_ttl((refresh_at - now).total_seconds())
+
+
+def _ttl_with_backoff(base_seconds, unchanged_refreshes):
+    excess = (unchanged_refreshes or 0) - TRACKING_TTL_BACKOFF_AFTER_UNCHANGED + 1
+    if excess <= 0:
+        return base_seconds
+    # Cap the exponent so long-idle titles do not build huge integers before clamping.
+    return _clamp_ttl(base_seconds * (2 ** min(excess, 16)))
+
+
+def compute_tracking_ttl_seconds(media_type, payload, follow_target_type, *, unchanged_refreshes=0):
     status = payload.get("status")
     release_date = _parse_date(payload.get("release_date"))
     next_episode = payload.get("next_episode_to_air") or {}
@@ -75,36 +105,60 @@ def compute_tracking_ttl_seconds(media_type, payload, follow_target_type):
     final_tv_statuses = {"Ended", "Canceled"}
     movie_short_statuses = {"Rumored", "Planned", "In Production", "Post Production"}
     last_air_date = _parse_date(payload.get("last_air_date"))
+    # One clock for both dates and timestamps: expires_at is stored in UTC.
+    now = datetime.datetime.utcnow()
+    today = now.date()
+    flip_window_start = today - datetime.timedelta(days=TRACKING_STATUS_FLIP_WINDOW_DAYS)
 
     if media_type == "movie" or follow_target_type == "movie":
         if status in final_movie_statuses:
-            return 7 * 24 * 60 * 60
+            return TRACKING_TTL_MAX_SECONDS
+        if release_date is not None and release_date >= today:
+            return _ttl_until_date(release_date, now)
+        if (
+            release_date is not None
+            and release_date >= flip_window_start
+            and status in movie_short_statuses
+        ):
+            # Released recently but TMDB has not flipped the status yet.
+            return TRACKING_TTL_MIN_SECONDS
         if release_date is None or status in movie_short_statuses or not status:
-            return 6 * 60 * 60
-        return 24 * 60 * 60
+            return _ttl_with_backoff(TRACKING_TTL_MIN_SECONDS, unchanged_refreshes)
+        return _ttl_with_backoff(TRACKING_TTL_DEFAULT_SECONDS, unchanged_refreshes)
 
     if media_type == "tv" or follow_target_type == "tv_full":
         if status in final_tv_statuses:
-            return 7 * 24 * 60 * 60
+            return TRACKING_TTL_MAX_SECONDS
+        if next_episode_date is not None:
+            if next_episode_date >= today:
+                return _ttl_until_date(next_episode_date, now)
+            if next_episode_date >= flip_window_start:
+                # Aired recently but TMDB has not moved next_episode_to_air on yet.
+                return TRACKING_TTL_MIN_SECONDS
         has_missing_season_air_date = any(
             season.get("air_date") is None for season in (payload.get("seasons") or [])
         )
         recent_window_days = 30
         is_recent_air = (
             last_air_date is not None
-            and last_air_date >= (datetime.date.today() - datetime.timedelta(days=recent_window_days))
+            and last_air_date >= (today - datetime.timedelta(days=recent_window_days))
         )
-        if next_episode_date or has_missing_season_air_date or is_recent_air:
-            return 6 * 60 * 60
-        return 24 * 60 * 60
+        if has_missing_season_air_date or is_recent_air:
+            return _ttl_with_backoff(TRACKING_TTL_MIN_SECONDS, unchanged_refreshes)
+        return _ttl_with_backoff(TRACKING_TTL_DEFAULT_SECONDS, unchanged_refreshes)
 
     if media_type == "season" or follow_target_type == "tv_season":
-        last_episode_date, next_episode_date = _season_dates(payload)
+        last_episode_date, next_episode_date = _season_dates(payload, today)
         if last_episode_date and not next_episode_date:
-            return 7 * 24 * 60 * 60
-        return 6 * 60 * 60
+            return TRACKING_TTL_MAX_SECONDS
+        if next_episode_date:
+            return _ttl_until_date(next_episode_date, now)
+        season_air_date = _parse_date(payload.get("air_date"))
+        if season_air_date is not None and season_air_date >= today:
+            return _ttl_until_date(season_air_date, now)
+        return _ttl_with_backoff(TRACKING_TTL_MIN_SECONDS, unchanged_refreshes)
 
-    return 6 * 60 * 60
+    return TRACKING_TTL_MIN_SECONDS
 
 
 def upsert_tracking_cache(
@@ -115,7 +169,12 @@ def upsert_tracking_cache(
     payload,
     extracted_fields,
     ttl_seconds,
+    *,
+    unchanged_refresh_count=0,
+    applied_override=None,
 ):
+    """Store raw TMDB tracking fields; ``applied_override`` records the admin override that
+    was merged in for diffing, without overwriting the raw values."""
     expires_at = datetime.datetime.utcnow() + datetime.timedelta(seconds=ttl_seconds)
     cursor = get_cursor(conn)
     cursor.execute(
@@ -138,6 +197,8 @@ def upsert_tracking_cache(
             next_episode_date,
             final_state,
             final_completed_at,
+            unchanged_refresh_count,
+            applied_override,
             fetched_at,
             expires_at,
             updated_at
@@ -145,7 +206,7 @@ def upsert_tracking_cache(
             %s, %s, %s, %s, %s, %s,
             %s, %s, %s, %s, %s,
             %s, %s, %s, %s, %s, %s,
-            NOW(), %s, NOW()
+            %s, %s, NOW(), %s, NOW()
         )
         ON CONFLICT (media_type, tmdb_id, season_number)
         DO UPDATE SET
@@ -163,6 +224,8 @@ def upsert_tracking_cache(
             next_episode_date = EXCLUDED.next_episode_date,
             final_state = EXCLUDED.final_state,
             final_completed_at = EXCLUDED.final_completed_at,
+            unchanged_refresh_count = EXCLUDED.unchanged_refresh_count,
+            applied_override = EXCLUDED.applied_override,
             fetched_at = EXCLUDED.fetched_at,
             expires_at = EXCLUDED.expires_at,
             updated_at = NOW();
@@ -185,6 +248,8 @@ def upsert_tracking_cache(
             extracted_fields.get("next_episode_date"),
             extracted_fields.get("final_state"),
             extracted_fields.get("final_completed_at"),
+            unchanged_refresh_count,
+            Json(applied_override) if applied_override else None,
             expires_at,
         ),
     )
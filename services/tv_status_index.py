@@ -0,0 +1,299 @@
+import datetime
+
+from psycopg2.extras import Json, execute_values
+
+from database import get_db, managed_cursor
+from services import tmdb_http_cache
+
+COMPLETED_STATUSES = {"Ended", "Canceled"}
+
+_SEASON_FIELDS = ("id", "season_number", "name", "air_date", "poster_path")
+
+_memory_index = {}
+
+
+def summarize_tv_details(details):
+    """Reduce a TMDB /tv/{id} payload to the facts list enrichment needs."""
+    next_episode = details.get("next_episode_to_air") or {}
+    last_episode = details.get("last_episode_to_air") or {}
+    next_season_number = next_episode.get("season_number")
+    last_season_number = last_episode.get("season_number")
+    return {
+        "tmdb_id": int(details["id"]),
+        "name": details.get("name"),
+        "status": details.get("status"),
+        "next_season_number": next_season_number if isinstance(next_season_number, int) else None,
+        "last_season_number": last_season_number if isinstance(last_season_number, int) else None,
+        "seasons": [
+            {field: season.get(field) for field in _SEASON_FIELDS}
+            for season in details.get("seasons") or []
+            if isinstance(season, dict)
+        ],
+    }
+
+
+def is_series_completed(summary):
+    return summary.get("status") in COMPLETED_STATUSES
+
+
+def is_season_completed(summary, season_number):
+    if season_number == 0:
+        return False
+    if is_series_completed(summary):
+        return True
+    next_season_number = summary.get("next_season_number")
+    if next_season_number is not None:
+        return season_number < next_season_number
+    last_season_number = summary.get("last_season_number")
+    if last_season_number is not None:
+        return season_number < last_season_number
+    return False
+
+
+def pick_current_season(summary):
+    """The season an on-the-air card should show: the season of the next episode, skipping
+    specials where a regular season is available. None when nothing is scheduled."""
+    season_number = summary.get("next_season_number")
+    if season_number is None:
+        return None
+    seasons = summary.get("seasons") or []
+    fallback_season_number = summary.get("last_season_number")
+    if season_number == 0 and fallback_season_number is not None:
+        season_number = fallback_season_number
+    season = None
+    if season_number != 0:
+        season = next(
+            (entry for entry in seasons if entry.get("season_number") == season_number), None
+        )
+    if season is None and season_number == 0:
+        season = next(
+            (
+                entry
+                for entry in seasons
+                if isinstance(entry.get("season_number"), int) and entry.get("season_number") != 0
+            ),
+            None,
+        )
+    if season is None:
+        season = next(
+            (entry for entry in seasons if entry.get("season_number") == season_number), None
+        )
+    return season
+
+
+def season_entries(summary):
+    """Per-season card facts for a series, as stored in tv_season_catalog."""
+    series_id = summary["tmdb_id"]
+    current = pick_current_season(summary)
+    current_number = current.get("season_number") if current else None
+    entries = []
+    for season in summary.get("seasons") or []:
+        season_number = season.get("season_number")
+        if season_number is None:
+            continue
+        entries.append(
+            {
+                "series_id": series_id,
+                "series_name": summary.get("name"),
+                "season_number": season_number,
+                "season_id": season.get("id")
+                or abs(tmdb_http_cache.stable_bigint_hash(f"tv:{series_id}:season:{season_number}")),
+                "season_name": season.get("name"),
+                "air_date": season.get("air_date"),
+                "poster_path": season.get("poster_path"),
+                "is_current": season_number == current_number,
+                "is_completed": is_season_completed(summary, season_number),
+            }
+        )
+    return entries
+
+
+def _use_memory(conn):
+    # An explicit connection (workers, refresh jobs) always means the database.
+    return conn is None and tmdb_http_cache._use_memory_cache()
+
+
+def get_many(conn, tv_ids, *, fresh_for_seconds=0) -> dict:
+    """Live summaries keyed by tmdb_id; entries expiring within ``fresh_for_seconds`` count as
+    missing so the cache warmer can refresh them ahead of time."""
+    tv_ids = list(dict.fromkeys(int(tv_id) for tv_id in tv_ids))
+    if not tv_ids:
+        return {}
+    if _use_memory(conn):
+        now = datetime.datetime.utcnow() + datetime.timedelta(seconds=fresh_for_seconds)
+        found = {}
+        for tv_id in tv_ids:
+            entry = _memory_index.get(tv_id)
+            if entry and entry["expires_at"] > now:
+                found[tv_id] = entry["summary"]
+        return found
+
+    db = conn or get_db()
+    with managed_cursor(db) as cursor:
+        cursor.execute(
+            """
+            SELECT tmdb_id, name, status, next_season_number, last_season_number, seasons
+            FROM tv_status_index
+            WHERE tmdb_id = ANY(%s)
+              AND expires_at > timezone('utc', now()) + (%s * INTERVAL '1 second')
+            """,
+            (tv_ids, fresh_for_seconds),
+        )
+        rows = cursor.fetchall()
+    return {row["tmdb_id"]: dict(row) for row in rows}
+
+
+def record_many(conn, details_list, ttl_seconds=None) -> dict:
+    """Index the given TV detail payloads and return their summaries keyed by tmdb_id.
+
+    Commits only when using the request connection; callers passing ``conn`` own the
+    transaction."""
+    if ttl_seconds is None:
+        ttl_seconds = tmdb_http_cache.TV_TTL_SECONDS
+    summaries = {}
+    details_by_id = {}
+    for details in details_list:
+        if isinstance(details, dict) and details.get("id"):
+            summary = summarize_tv_details(details)
+            summaries[summary["tmdb_id"]] = summary
+            details_by_id[summary["tmdb_id"]] = details
+    if not summaries:
+        return summaries
+
+    expires_at = datetime.datetime.utcnow() + datetime.timedelta(seconds=ttl_seconds)
+    if _use_memory(conn):
+        for tv_id, summary in summaries.items():
+            _memory_index[tv_id] = {"summary": summary, "expires_at": expires_at}
+        return summaries
+
+    rows = [
+        (
+            summary["tmdb_id"],
+            summary["name"],
+            summary["status"],
+            summary["next_season_number"],
+            summary["last_season_number"],
+            Json(summary["seasons"]),
+            expires_at,
+        )
+        for summary in summaries.values()
+    ]
+    db = conn or get_db()
+    with managed_cursor(db) as cursor:
+        execute_values(
+            cursor,
+            """
+            INSERT INTO tv_status_index (
+                tmdb_id,
+                name,
+                status,
+                next_season_number,
+                last_season_number,
+                seasons,
+                expires_at
+            )
+            VALUES %s
+            ON CONFLICT (tmdb_id)
+            DO UPDATE SET
+                name = EXCLUDED.name,
+                status = EXCLUDED.status,
+                next_season_number = EXCLUDED.next_season_number,
+                last_season_number = EXCLUDED.last_season_number,
+                seasons = EXCLUDED.seasons,
+                expires_at = EXCLUDED.expires_at,
+                updated_at = NOW()
+            """,
+            rows,
+            page_size=len(rows),
+        )
+        _replace_catalog_seasons(cursor, details_by_id, summaries, expires_at)
+    if conn is None:
+        db.commit()
+    return summaries
+
+
+def _catalog_rows(details, summary, expires_at):
+    return [
+        (
+            entry["series_id"],
+            entry["season_number"],
+            entry["season_id"],
+            entry["series_name"] or f"TMDB {entry['series_id']}",
+            entry["season_name"],
+            entry["air_date"],
+            entry["poster_path"] or details.get("poster_path"),
+            entry["is_current"],
+            entry["is_completed"],
+            expires_at,
+        )
+        for entry in season_entries(summary)
+    ]
+
+
+def _replace_catalog_seasons(cursor, details_by_id, summaries, expires_at):
+    cursor.execute(
+        "DELETE FROM tv_season_catalog WHERE series_id = ANY(%s);", (list(summaries),)
+    )
+    rows = [
+        row
+        for tv_id, summary in summaries.items()
+        for row in _catalog_rows(details_by_id[tv_id], summary, expires_at)
+    ]
+    if not rows:
+        return
+    execute_values(
+        cursor,
+        """
+        INSERT INTO tv_season_catalog (
+            series_id,
+            season_number,
+            season_id,
+            series_name,
+            season_name,
+            air_date,
+            poster_path,
+            is_current,
+            is_completed,
+            expires_at
+        )
+        VALUES %s
+        """,
+        rows,
+        page_size=len(rows),
+    )
+
+
+def get_catalog_seasons(conn, series_ids, *, fresh_for_seconds=0) -> dict:
+    """Live catalog seasons for the given series, keyed by series id in season order.
+
+    The catalog only answers "which seasons does this series have"; which series a list shows
+    and in what order still comes from TMDB. Series missing here need a status lookup."""
+    series_ids = list(dict.fromkeys(int(series_id) for series_id in series_ids))
+    if not series_ids or _use_memory(conn):
+        return {}
+    db = conn or get_db()
+    with managed_cursor(db) as cursor:
+        cursor.execute(
+            """
+            SELECT
+                series_id,
+                series_name,
+                season_number,
+                season_id,
+                season_name,
+                air_date,
+                poster_path,
+                is_current,
+                is_completed
+            FROM tv_season_catalog
+            WHERE series_id = ANY(%s)
+              AND expires_at > timezone('utc', now()) + (%s * INTERVAL '1 second')
+            ORDER BY series_id, season_number
+            """,
+            (series_ids, fresh_for_seconds),
+        )
+        rows = cursor.fetchall()
+    seasons = {}
+    for row in rows:
+        seasons.setdefault(row["series_id"], []).append(dict(row))
+    return seasons
@@ -10,6 +10,7 @@ sys.path.append(str(ROOT))
 import init_db
 from app import app as flask_app
 from database import create_standalone_connection, get_cursor
+from services import title_index, tmdb_http_cache, tv_status_index
 
 
 @pytest.fixture(scope="session", autouse=True)
@@ -33,12 +34,23 @@ def db_conn():
 def clean_db(db_conn):
     cursor = get_cursor(db_conn)
     cursor.execute("DELETE FROM notification_outbox;")
+    cursor.execute("DELETE FROM notification_outbox_archive;")
+    cursor.execute("DELETE FROM notification_outbox_dead_letter;")
     cursor.execute("DELETE FROM change_events;")
     cursor.execute("DELETE FROM follow_prefs;")
     cursor.execute("DELETE FROM follows;")
     cursor.execute("DELETE FROM tmdb_cache;")
+    cursor.execute("DELETE FROM tv_status_index;")
+    cursor.execute("DELETE FROM tv_season_catalog;")
+    cursor.execute("DELETE FROM tmdb_list_demand;")
+    cursor.execute("DELETE FROM tmdb_title_index;")
+    cursor.execute("DELETE FROM admin_tmdb_overrides;")
     cursor.execute("DELETE FROM users;")
     db_conn.commit()
+    # Process-wide memory fallbacks used when tests run without a request DB.
+    tmdb_http_cache._memory_cache.clear()
+    tv_status_index._memory_index.clear()
+    title_index._memory_index.clear()
 
 
 @pytest.fixture()
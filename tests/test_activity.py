@@ -3,6 +3,7 @@ import datetime
 from psycopg2.extras import Json
 
 from database import get_cursor
+from services.outbox_archive import archive_outbox
 
 
 def _register(client, email):
@@ -115,3 +116,54 @@ def test_activity_orders_recent_events_newest_first(client, db_conn):
     events = response.get_json()["recent_events"]
     assert len(events) == 2
     assert events[0]["event_type"] == "date_changed"
+
+
+def test_activity_includes_archived_outbox_rows(client, db_conn):
+    token = _register(client, "activity-archive@example.com")
+    user_id = _get_user_id(db_conn, "activity-archive@example.com")
+
+    cursor = get_cursor(db_conn)
+    cursor.execute(
+        """
+        INSERT INTO follows (user_id, target_type, tmdb_id, season_number)
+        VALUES (%s, %s, %s, %s)
+        RETURNING id;
+        """,
+        (user_id, "movie", 551, None),
+    )
+    follow_id = cursor.fetchone()["id"]
+    cursor.execute(
+        """
+        INSERT INTO notification_outbox (
+            user_id, follow_id, channel, payload, status, created_at, sent_at
+        )
+        VALUES (%s, %s, %s, %s, 'sent', NOW() - INTERVAL '40 days', NOW() - INTERVAL '40 days');
+        """,
+        (user_id, follow_id, "email", Json({"event_type": "date_set"})),
+    )
+    cursor.execute(
+        """
+        INSERT INTO notification_outbox (user_id, follow_id, channel, payload, status)
+        VALUES (%s, %s, %s, %s, 'pending');
+        """,
+        (user_id, follow_id, "email", Json({"event_type": "date_changed"})),
+    )
+    db_conn.commit()
+
+    summary = archive_outbox(db_conn, retention_days=30, batch_size=100)
+    assert summary["archived"] == 1
+
+    cursor.execute("SELECT status FROM notification_outbox WHERE user_id = %s;", (user_id,))
+    assert [row["status"] for row in cursor.fetchall()] == ["pending"]
+
+    response = client.get("/api/my/activity", headers={"Authorization": f"Bearer {token}"})
+    payload = response.get_json()
+    assert [item["status"] for item in payload["outbox"]] == ["pending", "sent"]
+    assert payload["meta"]["counts"]["outbox_pending"] == 1
+
+    cursor.execute("DELETE FROM users WHERE id = %s;", (user_id,))
+    db_conn.commit()
+    cursor.execute(
+        "SELECT COUNT(*) AS count FROM notification_outbox_archive WHERE user_id = %s;", (user_id,)
+    )
+    assert cursor.fetchone()["count"] == 0
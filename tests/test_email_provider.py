@@ -0,0 +1,193 @@
+import mailbox
+import smtplib
+
+import pytest
+
+from services.email_provider import (
+    EMAIL_PROVIDER_FACTORIES,
+    EmailAPIError,
+    HTTPAPIEmailProvider,
+    InMemoryEmailProvider,
+    MaildirEmailProvider,
+    SMTPEmailProvider,
+    build_email_provider_from_config,
+    register_email_provider,
+)
+from services.send_failures import PERMANENT, PROVIDER, TRANSIENT, classify_send_failure
+from workers.benchmark_email_dispatch import LocalSMTPSink
+
+
+class FakeSMTP:
+    instances = []
+
+    def __init__(self, host, port):
+        self.host = host
+        self.port = port
+        self.sent = []
+        self.logins = 0
+        self.closed = False
+        self.disconnect_next = False
+        FakeSMTP.instances.append(self)
+
+    def starttls(self):
+        pass
+
+    def login(self, user, password):
+        self.logins += 1
+
+    def send_message(self, message):
+        if self.disconnect_next:
+            self.disconnect_next = False
+            raise smtplib.SMTPServerDisconnected("Connection unexpectedly closed")
+        self.sent.append(message["To"])
+
+    def quit(self):
+        self.closed = True
+
+    def close(self):
+        self.closed = True
+
+
+def _provider():
+    return SMTPEmailProvider(
+        host="smtp.example.com",
+        port=587,
+        user="mailer",
+        password="secret",
+        use_tls=True,
+        use_ssl=False,
+        email_from="noreply@example.com",
+    )
+
+
+def _send(provider, to_email):
+    provider.send_email(to_email=to_email, subject="Hi", text="Body")
+
+
+def test_smtp_provider_reuses_connection_within_session(monkeypatch):
+    FakeSMTP.instances = []
+    monkeypatch.setattr("services.email_provider.smtplib.SMTP", FakeSMTP)
+
+    with _provider() as provider:
+        for index in range(3):
+            _send(provider, f"user{index}@example.com")
+
+    assert len(FakeSMTP.instances) == 1
+    server = FakeSMTP.instances[0]
+    assert server.logins == 1
+    assert server.sent == ["user0@example.com", "user1@example.com", "user2@example.com"]
+    assert server.closed
+
+
+def test_smtp_provider_reconnects_after_disconnect(monkeypatch):
+    FakeSMTP.instances = []
+    monkeypatch.setattr("services.email_provider.smtplib.SMTP", FakeSMTP)
+
+    with _provider() as provider:
+        _send(provider, "first@example.com")
+        FakeSMTP.instances[0].disconnect_next = True
+        _send(provider, "second@example.com")
+
+    assert len(FakeSMTP.instances) == 2
+    assert FakeSMTP.instances[0].closed
+    assert FakeSMTP.instances[0].sent == ["first@example.com"]
+    assert FakeSMTP.instances[1].sent == ["second@example.com"]
+
+
+def test_smtp_provider_outside_session_connects_per_message(monkeypatch):
+    FakeSMTP.instances = []
+    monkeypatch.setattr("services.email_provider.smtplib.SMTP", FakeSMTP)
+
+    provider = _provider()
+    _send(provider, "a@example.com")
+    _send(provider, "b@example.com")
+
+    assert len(FakeSMTP.instances) == 2
+    assert all(server.closed for server in FakeSMTP.instances)
+
+
+def test_maildir_provider_writes_messages(tmp_path):
+    provider = MaildirEmailProvider(directory=str(tmp_path / "mail"), email_from="noreply@example.com")
+    provider.send_email(to_email="a@example.com", subject="Hi", text="Body", html="<p>Body</p>")
+
+    messages = list(mailbox.Maildir(str(tmp_path / "mail")))
+    assert len(messages) == 1
+    assert messages[0]["To"] == "a@example.com"
+    assert messages[0]["Subject"] == "Hi"
+
+
+def test_build_provider_from_registry(monkeypatch):
+    monkeypatch.setattr("config.EMAIL_ENABLED", True)
+    monkeypatch.setattr("config.EMAIL_FROM", "noreply@example.com")
+    monkeypatch.setattr("config.EMAIL_PROVIDER", "memory")
+    provider = build_email_provider_from_config()
+    assert isinstance(provider, InMemoryEmailProvider)
+
+    monkeypatch.setattr("config.EMAIL_PROVIDER", "custom")
+    with pytest.raises(ValueError):
+        build_email_provider_from_config()
+
+    custom = InMemoryEmailProvider()
+    register_email_provider("custom", lambda: custom)
+    try:
+        assert build_email_provider_from_config() is custom
+    finally:
+        EMAIL_PROVIDER_FACTORIES.pop("custom")
+
+
+class FakeResponse:
+    def __init__(self, status_code, text=""):
+        self.status_code = status_code
+        self.text = text
+
+
+class FakeHTTPSession:
+    def __init__(self, status_code):
+        self.status_code = status_code
+        self.requests = []
+
+    def post(self, url, json=None, headers=None, timeout=None):
+        self.requests.append({"url": url, "json": json, "headers": headers})
+        return FakeResponse(self.status_code, "nope")
+
+
+def test_http_provider_posts_json_and_classifies_errors():
+    session = FakeHTTPSession(202)
+    provider = HTTPAPIEmailProvider(
+        url="https://mail.example.com/send",
+        api_key="key",
+        email_from="noreply@example.com",
+        http_session=session,
+    )
+    _send(provider, "a@example.com")
+    assert session.requests[0]["json"]["to"] == "a@example.com"
+    assert session.requests[0]["headers"]["Authorization"] == "Bearer key"
+
+    for status_code, expected in (
+        (429, TRANSIENT),
+        (503, TRANSIENT),
+        (422, PERMANENT),
+        (401, PROVIDER),
+    ):
+        session.status_code = status_code
+        with pytest.raises(EmailAPIError) as excinfo:
+            _send(provider, "a@example.com")
+        assert classify_send_failure(excinfo.value)[0] == expected
+
+
+def test_smtp_provider_delivers_to_local_sink():
+    with LocalSMTPSink() as sink:
+        provider = SMTPEmailProvider(
+            host=sink.host,
+            port=sink.port,
+            user=None,
+            password=None,
+            use_tls=False,
+            use_ssl=False,
+            email_from="noreply@example.com",
+        )
+        with provider.session() as session:
+            _send(session, "a@example.com")
+            _send(session, "b@example.com")
+
+    assert sink.received == 2
@@ -1,4 +1,4 @@
-from services.email_templates import build_email_message
+from services.email_templates import build_digest_email_message, build_email_message
 
 
 def test_date_set_movie_subject_and_body():
@@ -111,3 +111,32 @@ def test_app_base_url_includes_deep_link():
     message = build_email_message(payload, app_base_url="https://dropbinge.test")
 
     assert "https://dropbinge.test/title/tv/123/season/3" in message["text"]
+
+
+def test_digest_message_lists_every_update():
+    payloads = [
+        {
+            "event_type": "date_set",
+            "event_payload": {"from": None, "to": "2030-01-01"},
+            "target_type": "movie",
+            "tmdb_id": 1,
+            "season_number": None,
+            "title": "First <Film>",
+        },
+        {
+            "event_type": "season_binge_ready",
+            "event_payload": {"last_episode_air_date": "2028-12-12"},
+            "target_type": "tv_season",
+            "tmdb_id": 2,
+            "season_number": 3,
+            "title": "Second Show",
+        },
+    ]
+
+    message = build_digest_email_message(payloads, app_base_url="https://app.example.com")
+
+    assert message["subject"] == "[DropBinge] DIGEST — 2 updates on titles you follow"
+    assert "DROP — First <Film> — Date set" in message["text"]
+    assert "Last episode air date: 2028-12-12" in message["text"]
+    assert "First &lt;Film&gt;" in message["html"]
+    assert "https://app.example.com/title/tv/2/season/3" in message["html"]
@@ -0,0 +1,143 @@
+import datetime
+
+from app import app as flask_app
+from services import list_demand, title_index, tmdb_client, tmdb_http_cache, tv_status_index
+from views import tmdb as tmdb_views
+
+
+def test_warm_list_pages_rebuilds_only_entries_near_expiry(client, monkeypatch):
+    tmdb_http_cache._memory_cache.clear()
+    tv_status_index._memory_index.clear()
+    title_index._memory_index.clear()
+    calls = []
+
+    def fake_movie_popular(page=1, language=None):
+        calls.append((page, language))
+        return {"page": page, "total_pages": 5, "results": [{"id": page, "title": "M"}]}
+
+    monkeypatch.setattr(tmdb_client, "list_movie_popular", fake_movie_popular)
+    targets = [("movie_popular", 1, ""), ("movie_popular", 2, "ko-KR")]
+
+    with flask_app.app_context():
+        first = tmdb_views.warm_list_pages(targets, warm_ahead_seconds=60)
+        second = tmdb_views.warm_list_pages(targets, warm_ahead_seconds=60)
+        forced = tmdb_views.warm_list_pages(targets[:1], warm_ahead_seconds=10**9)
+
+    assert first["warmed"] == 2
+    assert second == {"warmed": 0, "fresh": 2, "uncached": 0, "failed": 0}
+    assert forced["warmed"] == 1
+    assert calls == [(1, None), (2, "ko-KR"), (1, None)]
+
+    response = client.get("/api/tmdb/list/movie/popular?page=2&language=ko-KR")
+    assert response.headers["X-Cache"] == "HIT"
+    tmdb_http_cache._memory_cache.clear()
+    tv_status_index._memory_index.clear()
+    title_index._memory_index.clear()
+
+
+def test_warm_list_pages_refreshes_tv_statuses_of_fresh_pages(client, monkeypatch):
+    tmdb_http_cache._memory_cache.clear()
+    tv_status_index._memory_index.clear()
+    fetched = []
+
+    def fake_tv_popular(page=1, language=None):
+        return {"page": page, "total_pages": 1, "results": [{"id": 40, "name": "Show"}]}
+
+    def fake_tv_details(tv_id):
+        fetched.append(tv_id)
+        return {"id": tv_id, "name": "Show", "status": "Ended", "seasons": []}
+
+    monkeypatch.setattr(tmdb_client, "list_tv_popular", fake_tv_popular)
+    monkeypatch.setattr(tmdb_client, "get_tv_details", fake_tv_details)
+    targets = [("tv_popular", 1, "")]
+
+    with flask_app.app_context():
+        first = tmdb_views.warm_list_pages(targets, warm_ahead_seconds=60)
+        # The page stays cached but its series status is about to expire.
+        tv_status_index._memory_index[40]["expires_at"] = (
+            datetime.datetime.utcnow() + datetime.timedelta(seconds=30)
+        )
+        second = tmdb_views.warm_list_pages(targets, warm_ahead_seconds=60)
+
+    assert first["warmed"] == 1
+    assert second["fresh"] == 1
+    assert fetched == [40, 40]
+    tmdb_http_cache._memory_cache.clear()
+    tv_status_index._memory_index.clear()
+
+
+def test_warm_list_pages_does_not_count_uncached_pages(client, monkeypatch):
+    tmdb_http_cache._memory_cache.clear()
+    tv_status_index._memory_index.clear()
+
+    def fake_tv_popular(page=1, language=None):
+        return {"page": page, "total_pages": 1, "results": [{"id": 41, "name": "Show"}]}
+
+    def timed_out_fan_out(fn, items):
+        return [None] * len(items), False
+
+    monkeypatch.setattr(tmdb_client, "list_tv_popular", fake_tv_popular)
+    monkeypatch.setattr(tmdb_views, "fan_out", timed_out_fan_out)
+
+    with flask_app.app_context():
+        summary = tmdb_views.warm_list_pages([("tv_popular", 1, "")], warm_ahead_seconds=60)
+
+    assert summary == {"warmed": 0, "fresh": 0, "uncached": 1, "failed": 0}
+    tmdb_http_cache._memory_cache.clear()
+    tv_status_index._memory_index.clear()
+
+
+def test_record_list_request_only_tracks_configured_languages(monkeypatch):
+    monkeypatch.setattr(list_demand.config, "TMDB_WARM_LANGUAGES", ["", "ko-KR"])
+    list_demand._pending.clear()
+
+    list_demand.record_list_request("tv_popular", 1, "KO-kr")
+    list_demand.record_list_request("tv_popular", 1, None)
+    list_demand.record_list_request("tv_popular", 1, "xx-" + "a" * 200)
+
+    assert dict(list_demand._pending) == {("tv_popular", 1, "ko-KR"): 1, ("tv_popular", 1, ""): 1}
+    list_demand._pending.clear()
+
+
+def test_warm_targets_add_hot_pages_from_observed_demand(db_conn):
+    list_demand._pending.clear()
+    for _ in range(3):
+        list_demand._pending[("tv_popular", 7, "")] += 1
+    list_demand._pending[("movie_upcoming", 1, "")] += 5
+    list_demand.flush_list_demand(db_conn)
+
+    targets = list_demand.warm_targets(
+        db_conn,
+        list_names=["movie_popular", "tv_popular"],
+        pages=1,
+        languages=[""],
+        hot_limit=10,
+    )
+
+    assert targets == [("movie_popular", 1, ""), ("tv_popular", 1, ""), ("tv_popular", 7, "")]
+
+    # Demand recorded under a language that is no longer warmed is ignored.
+    list_demand._pending[("tv_popular", 9, "fr-FR")] += 10
+    list_demand.flush_list_demand(db_conn)
+    targets = list_demand.warm_targets(
+        db_conn, list_names=["tv_popular"], pages=1, languages=[""], hot_limit=10
+    )
+    assert ("tv_popular", 9, "fr-FR") not in targets
+
+
+def test_failed_demand_flush_keeps_counts_and_does_not_fail_the_request(db_conn, monkeypatch):
+    def failing_insert(*args, **kwargs):
+        raise RuntimeError("database unavailable")
+
+    monkeypatch.setattr(list_demand.config, "TMDB_WARM_LANGUAGES", [""])
+    monkeypatch.setattr(list_demand.tmdb_http_cache, "_use_memory_cache", lambda: False)
+    monkeypatch.setattr(list_demand, "get_db", lambda: db_conn)
+    monkeypatch.setattr(list_demand, "execute_values", failing_insert)
+    list_demand._pending.clear()
+    list_demand._pending[("tv_popular", 1, "")] += 2
+    list_demand._last_flush["at"] -= list_demand.DEMAND_FLUSH_SECONDS
+
+    list_demand.record_list_request("tv_popular", 1, "")
+
+    assert dict(list_demand._pending) == {("tv_popular", 1, ""): 3}
+    list_demand._pending.clear()
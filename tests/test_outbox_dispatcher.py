@@ -1,11 +1,18 @@
+import smtplib
+
 from psycopg2.extras import Json
 
-from database import get_cursor
+from database import create_standalone_connection, get_cursor
 from services.outbox_dispatcher import (
     claim_pending_batch,
+    collapse_superseded_pending,
     dispatch_email_outbox_once,
     mark_failed_or_retry,
+    mark_failed_or_retry_bulk,
+    mark_sent_bulk,
 )
+from services.outbox_dead_letter import replay_dead_letters
+from services.send_throttle import DomainThrottle
 
 
 class FakeProvider:
@@ -264,3 +271,715 @@ def test_mark_failed_or_retry_marks_failed(db_conn):
     assert row["status"] == "failed"
     assert row["next_attempt_at"] is None
     assert row["last_error"] == "Boom"
+
+
+class SessionCountingProvider(FakeProvider):
+    def __init__(self):
+        super().__init__()
+        self.sessions = 0
+
+    def session(self):
+        self.sessions += 1
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+def test_dispatch_email_outbox_sends_with_concurrent_sessions(db_conn, monkeypatch):
+    monkeypatch.setattr(
+        "services.outbox_dispatcher.build_email_message",
+        lambda payload, app_base_url=None: {
+            "subject": f"[DropBinge] {payload['title']}",
+            "text": "text",
+            "html": None,
+        },
+    )
+    cursor = get_cursor(db_conn)
+    user_id, follow_id, _ = _insert_user_follow_event(cursor, email="concurrent@example.com")
+    for index in range(3):
+        cursor.execute(
+            """
+            INSERT INTO change_events (user_id, follow_id, event_type, event_payload)
+            VALUES (%s, %s, %s, %s)
+            RETURNING id;
+            """,
+            (user_id, follow_id, "date_set", Json({"from": None, "to": "2030-01-01"})),
+        )
+        change_event_id = cursor.fetchone()["id"]
+        cursor.execute(
+            """
+            INSERT INTO notification_outbox (
+                user_id, follow_id, change_event_id, channel, payload, status
+            )
+            VALUES (%s, %s, %s, %s, %s, %s);
+            """,
+            (
+                user_id,
+                follow_id,
+                change_event_id,
+                "email",
+                Json({"event_type": "season_binge_ready", "title": f"Movie {index}"}),
+                "pending",
+            ),
+        )
+    db_conn.commit()
+
+    provider = SessionCountingProvider()
+    result = dispatch_email_outbox_once(
+        db_conn,
+        provider=provider,
+        app_base_url=None,
+        batch_size=10,
+        max_attempts=3,
+        stale_minutes=15,
+        backoff_base=60,
+        backoff_max=3600,
+        concurrency=2,
+    )
+
+    assert result["sent"] == 3
+    assert provider.sessions == 2
+    assert sorted(item["subject"] for item in provider.sent) == [
+        "[DropBinge] Movie 0",
+        "[DropBinge] Movie 1",
+        "[DropBinge] Movie 2",
+    ]
+    cursor.execute(
+        "SELECT COUNT(*) AS count FROM notification_outbox WHERE user_id = %s AND status = 'sent';",
+        (user_id,),
+    )
+    assert cursor.fetchone()["count"] == 3
+
+
+def test_bulk_outbox_updates_apply_status_and_backoff(db_conn):
+    cursor = get_cursor(db_conn)
+    cursor.execute(
+        "INSERT INTO users (email, password_hash) VALUES (%s, %s) RETURNING id;",
+        ("bulk@example.com", "hash"),
+    )
+    user_id = cursor.fetchone()["id"]
+    outbox_ids = []
+    for _ in range(3):
+        cursor.execute(
+            """
+            INSERT INTO notification_outbox (user_id, follow_id, channel, payload, status)
+            VALUES (%s, %s, %s, %s, %s)
+            RETURNING id;
+            """,
+            (user_id, 1, "email", Json({"event_type": "date_set"}), "sending"),
+        )
+        outbox_ids.append(cursor.fetchone()["id"])
+    db_conn.commit()
+    sent_id, retry_id, failed_id = outbox_ids
+
+    assert mark_sent_bulk(db_conn, [sent_id]) == 1
+    assert (
+        mark_failed_or_retry_bulk(
+            db_conn,
+            [(retry_id, 2, "Try again"), (failed_id, 3, "Boom")],
+            max_attempts=3,
+            backoff_base=60,
+            backoff_max=3600,
+        )
+        == 2
+    )
+
+    cursor.execute(
+        """
+        SELECT id, status, sent_at, last_error,
+               EXTRACT(EPOCH FROM (next_attempt_at - NOW())) AS backoff_seconds
+        FROM notification_outbox
+        WHERE user_id = %s;
+        """,
+        (user_id,),
+    )
+    rows = {row["id"]: row for row in cursor.fetchall()}
+    assert rows[sent_id]["status"] == "sent"
+    assert rows[sent_id]["sent_at"] is not None
+    assert rows[retry_id]["status"] == "pending"
+    assert rows[retry_id]["last_error"] == "Try again"
+    assert 110 <= rows[retry_id]["backoff_seconds"] <= 120
+    assert rows[failed_id]["status"] == "failed"
+    assert rows[failed_id]["backoff_seconds"] is None
+
+
+def test_dispatch_email_outbox_sends_due_digest_as_one_email(db_conn):
+    cursor = get_cursor(db_conn)
+    user_id, follow_id, _ = _insert_user_follow_event(cursor, email="digest@example.com")
+    cursor.execute(
+        "INSERT INTO follow_prefs (follow_id, frequency) VALUES (%s, %s);",
+        (follow_id, "digest"),
+    )
+    for index, age_minutes in enumerate((90, 30)):
+        cursor.execute(
+            """
+            INSERT INTO change_events (user_id, follow_id, event_type, event_payload)
+            VALUES (%s, %s, %s, %s)
+            RETURNING id;
+            """,
+            (user_id, follow_id, "date_set", Json({"from": None, "to": "2030-01-01"})),
+        )
+        change_event_id = cursor.fetchone()["id"]
+        cursor.execute(
+            """
+            INSERT INTO notification_outbox (
+                user_id, follow_id, change_event_id, channel, payload, status, created_at
+            )
+            VALUES (%s, %s, %s, %s, %s, %s, NOW() - (%s * INTERVAL '1 minute'));
+            """,
+            (
+                user_id,
+                follow_id,
+                change_event_id,
+                "email",
+                Json(
+                    {
+                        "event_type": "season_binge_ready",
+                        "event_payload": {"last_episode_air_date": "2030-01-01"},
+                        "target_type": "tv_season",
+                        "tmdb_id": 101,
+                        "season_number": index + 1,
+                        "title": f"Digest Show {index}",
+                    }
+                ),
+                "pending",
+                age_minutes,
+            ),
+        )
+    db_conn.commit()
+
+    def dispatch(window_minutes):
+        return dispatch_email_outbox_once(
+            db_conn,
+            provider=provider,
+            app_base_url=None,
+            batch_size=10,
+            max_attempts=3,
+            stale_minutes=15,
+            backoff_base=60,
+            backoff_max=3600,
+            digest_window_minutes=window_minutes,
+        )
+
+    provider = FakeProvider()
+    not_due = dispatch(120)
+    assert not_due["claimed"] == 0
+    assert provider.sent == []
+
+    due = dispatch(60)
+    assert due["digest_emails"] == 1
+    assert due["sent"] == 2
+    assert len(provider.sent) == 1
+    assert "DIGEST — 2 updates" in provider.sent[0]["subject"]
+    assert "Digest Show 0" in provider.sent[0]["text"]
+    assert "Digest Show 1" in provider.sent[0]["text"]
+
+    cursor.execute(
+        "SELECT COUNT(*) AS count FROM notification_outbox WHERE user_id = %s AND status = 'sent';",
+        (user_id,),
+    )
+    assert cursor.fetchone()["count"] == 2
+
+
+def test_digest_retry_keeps_the_users_rows_in_one_email(db_conn):
+    cursor = get_cursor(db_conn)
+    user_id, follow_id, _ = _insert_user_follow_event(cursor, email="digest-retry@example.com")
+    cursor.execute(
+        "INSERT INTO follow_prefs (follow_id, frequency) VALUES (%s, %s);",
+        (follow_id, "digest"),
+    )
+
+    def insert_row(title, attempt_count):
+        cursor.execute(
+            """
+            INSERT INTO notification_outbox (
+                user_id, follow_id, channel, payload, status, attempt_count, created_at
+            )
+            VALUES (%s, %s, 'email', %s, 'pending', %s, NOW() - INTERVAL '90 minutes')
+            RETURNING id;
+            """,
+            (
+                user_id,
+                follow_id,
+                Json({"event_type": "season_binge_ready", "title": title}),
+                attempt_count,
+            ),
+        )
+        return cursor.fetchone()["id"]
+
+    first_ids = [insert_row("Fresh", 0), insert_row("Retried", 2)]
+    db_conn.commit()
+
+    def dispatch(provider):
+        return dispatch_email_outbox_once(
+            db_conn,
+            provider=provider,
+            app_base_url=None,
+            batch_size=10,
+            max_attempts=5,
+            stale_minutes=15,
+            backoff_base=60,
+            backoff_max=3600,
+            digest_window_minutes=60,
+        )
+
+    assert dispatch(FakeProvider(should_fail=True))["retried"] == 2
+    cursor.execute(
+        "SELECT DISTINCT next_attempt_at FROM notification_outbox WHERE id = ANY(%s);",
+        (first_ids,),
+    )
+    assert len(cursor.fetchall()) == 1
+
+    insert_row("Arrived later", 0)
+    db_conn.commit()
+    provider = FakeProvider()
+    assert dispatch(provider)["claimed"] == 0
+
+    cursor.execute(
+        "UPDATE notification_outbox SET next_attempt_at = NOW() - INTERVAL '1 second' "
+        "WHERE id = ANY(%s);",
+        (first_ids,),
+    )
+    db_conn.commit()
+    result = dispatch(provider)
+
+    assert result["digest_emails"] == 1
+    assert result["sent"] == 3
+    assert "DIGEST — 3 updates" in provider.sent[0]["subject"]
+
+
+def _insert_pending_date_rows(cursor, *, user_id, follow_id, changes):
+    for from_date, to_date in changes:
+        event_type = "date_set" if from_date is None else "date_changed"
+        event_payload = {"from": from_date, "to": to_date}
+        cursor.execute(
+            """
+            INSERT INTO change_events (user_id, follow_id, event_type, event_payload)
+            VALUES (%s, %s, %s, %s)
+            RETURNING id;
+            """,
+            (user_id, follow_id, event_type, Json(event_payload)),
+        )
+        change_event_id = cursor.fetchone()["id"]
+        cursor.execute(
+            """
+            INSERT INTO notification_outbox (
+                user_id, follow_id, change_event_id, channel, payload, status
+            )
+            VALUES (%s, %s, %s, %s, %s, %s);
+            """,
+            (
+                user_id,
+                follow_id,
+                change_event_id,
+                "email",
+                Json({"event_type": event_type, "event_payload": event_payload, "title": "Flip"}),
+                "pending",
+            ),
+        )
+
+
+def test_collapse_superseded_pending_keeps_net_date_change(db_conn):
+    cursor = get_cursor(db_conn)
+    user_id, follow_id, _ = _insert_user_follow_event(cursor, email="collapse@example.com")
+    _insert_pending_date_rows(
+        cursor,
+        user_id=user_id,
+        follow_id=follow_id,
+        changes=[(None, "2030-01-01"), ("2030-01-01", "2030-02-02"), ("2030-02-02", "2030-03-03")],
+    )
+    flip_user_id, flip_follow_id, _ = _insert_user_follow_event(cursor, email="flip@example.com")
+    _insert_pending_date_rows(
+        cursor,
+        user_id=flip_user_id,
+        follow_id=flip_follow_id,
+        changes=[("2031-01-01", "2031-06-06"), ("2031-06-06", "2031-01-01")],
+    )
+    db_conn.commit()
+
+    assert (
+        collapse_superseded_pending(
+            db_conn, channel="email", batch_size=10, digest_window_minutes=60
+        )
+        == 4
+    )
+
+    cursor.execute(
+        "SELECT status, payload FROM notification_outbox WHERE user_id = %s AND status = 'pending';",
+        (user_id,),
+    )
+    rows = cursor.fetchall()
+    assert len(rows) == 1
+    assert rows[0]["payload"]["event_type"] == "date_set"
+    assert rows[0]["payload"]["event_payload"] == {"from": None, "to": "2030-03-03"}
+
+    cursor.execute(
+        "SELECT status FROM notification_outbox WHERE user_id = %s;",
+        (flip_user_id,),
+    )
+    assert [row["status"] for row in cursor.fetchall()] == ["superseded", "superseded"]
+
+
+def test_collapse_superseded_pending_only_touches_follows_near_the_front(db_conn):
+    cursor = get_cursor(db_conn)
+    front_user_id, front_follow_id, _ = _insert_user_follow_event(cursor, email="front@example.com")
+    _insert_pending_date_rows(
+        cursor,
+        user_id=front_user_id,
+        follow_id=front_follow_id,
+        changes=[(None, "2030-01-01"), ("2030-01-01", "2030-02-02")],
+    )
+    back_user_id, back_follow_id, _ = _insert_user_follow_event(cursor, email="back@example.com")
+    _insert_pending_date_rows(
+        cursor,
+        user_id=back_user_id,
+        follow_id=back_follow_id,
+        changes=[(None, "2031-01-01"), ("2031-01-01", "2031-02-02")],
+    )
+    db_conn.commit()
+
+    assert (
+        collapse_superseded_pending(
+            db_conn, channel="email", batch_size=1, digest_window_minutes=60
+        )
+        == 1
+    )
+    cursor.execute(
+        "SELECT COUNT(*) AS count FROM notification_outbox WHERE follow_id = %s "
+        "AND status = 'pending';",
+        (back_follow_id,),
+    )
+    assert cursor.fetchone()["count"] == 2
+
+
+def test_collapse_superseded_pending_leaves_groups_in_flight_alone(db_conn):
+    cursor = get_cursor(db_conn)
+    locked_user_id, locked_follow_id, _ = _insert_user_follow_event(
+        cursor, email="locked@example.com"
+    )
+    _insert_pending_date_rows(
+        cursor,
+        user_id=locked_user_id,
+        follow_id=locked_follow_id,
+        changes=[(None, "2030-01-01"), ("2030-01-01", "2030-02-02")],
+    )
+    sending_user_id, sending_follow_id, _ = _insert_user_follow_event(
+        cursor, email="sending@example.com"
+    )
+    _insert_pending_date_rows(
+        cursor,
+        user_id=sending_user_id,
+        follow_id=sending_follow_id,
+        changes=[(None, "2031-01-01"), ("2031-01-01", "2031-02-02")],
+    )
+    cursor.execute(
+        """
+        UPDATE notification_outbox SET status = 'sending'
+        WHERE id = (SELECT MIN(id) FROM notification_outbox WHERE follow_id = %s);
+        """,
+        (sending_follow_id,),
+    )
+    db_conn.commit()
+
+    # Another dispatcher holds the oldest row of the first group.
+    other_conn = create_standalone_connection()
+    other_cursor = get_cursor(other_conn)
+    other_cursor.execute(
+        """
+        SELECT id FROM notification_outbox
+        WHERE id = (SELECT MIN(id) FROM notification_outbox WHERE follow_id = %s)
+        FOR UPDATE;
+        """,
+        (locked_follow_id,),
+    )
+    try:
+        assert (
+            collapse_superseded_pending(
+                db_conn, channel="email", batch_size=10, digest_window_minutes=60
+            )
+            == 0
+        )
+    finally:
+        other_conn.rollback()
+        other_cursor.close()
+        other_conn.close()
+
+    cursor.execute(
+        "SELECT status, payload FROM notification_outbox WHERE follow_id = %s ORDER BY id;",
+        (locked_follow_id,),
+    )
+    rows = cursor.fetchall()
+    assert [row["status"] for row in rows] == ["pending", "pending"]
+    assert rows[1]["payload"]["event_payload"]["from"] == "2030-01-01"
+
+    assert (
+        collapse_superseded_pending(
+            db_conn, channel="email", batch_size=10, digest_window_minutes=60
+        )
+        == 1
+    )
+
+
+class DeferringProvider(FakeProvider):
+    def send_email(self, *, to_email, subject, text, html=None, reply_to=None):
+        raise smtplib.SMTPResponseException(421, b"Too many messages, try later")
+
+
+def test_dispatch_email_outbox_defers_4xx_without_spending_attempts(db_conn, monkeypatch):
+    monkeypatch.setattr(
+        "services.outbox_dispatcher.build_email_message",
+        lambda payload, app_base_url=None: {"subject": "Subject", "text": "text", "html": None},
+    )
+    cursor = get_cursor(db_conn)
+    user_id, follow_id, change_event_id = _insert_user_follow_event(cursor, email="defer@example.com")
+    cursor.execute(
+        """
+        INSERT INTO notification_outbox (
+            user_id, follow_id, change_event_id, channel, payload, status, attempt_count
+        )
+        VALUES (%s, %s, %s, %s, %s, %s, %s);
+        """,
+        (
+            user_id,
+            follow_id,
+            change_event_id,
+            "email",
+            Json({"event_type": "season_binge_ready"}),
+            "pending",
+            2,
+        ),
+    )
+    db_conn.commit()
+
+    throttle = DomainThrottle(rate_per_minute=60, burst=5, min_rate_per_minute=6, defer_seconds=600)
+    result = dispatch_email_outbox_once(
+        db_conn,
+        provider=DeferringProvider(),
+        app_base_url=None,
+        batch_size=10,
+        max_attempts=3,
+        stale_minutes=15,
+        backoff_base=60,
+        backoff_max=3600,
+        throttle=throttle,
+    )
+
+    assert result["deferred"] == 1
+    assert result["failed"] == 0
+    assert result["retried"] == 0
+    assert throttle.acquire("example.com") > 0
+    cursor.execute(
+        """
+        SELECT status, attempt_count,
+               EXTRACT(EPOCH FROM (next_attempt_at - NOW())) AS delay_seconds
+        FROM notification_outbox
+        WHERE user_id = %s;
+        """,
+        (user_id,),
+    )
+    row = cursor.fetchone()
+    assert row["status"] == "pending"
+    assert row["attempt_count"] == 2
+    assert 590 <= row["delay_seconds"] <= 600
+
+
+def test_dispatch_dead_letters_rows_deferred_too_often(db_conn, monkeypatch):
+    monkeypatch.setattr(
+        "services.outbox_dispatcher.build_email_message",
+        lambda payload, app_base_url=None: {"subject": "Subject", "text": "text", "html": None},
+    )
+    cursor = get_cursor(db_conn)
+    user_id, follow_id, change_event_id = _insert_user_follow_event(cursor, email="loop@example.com")
+    cursor.execute(
+        """
+        INSERT INTO notification_outbox (
+            user_id, follow_id, change_event_id, channel, payload, status, defer_count
+        )
+        VALUES (%s, %s, %s, 'email', %s, 'pending', 2);
+        """,
+        (user_id, follow_id, change_event_id, Json({"event_type": "season_binge_ready"})),
+    )
+    db_conn.commit()
+
+    result = dispatch_email_outbox_once(
+        db_conn,
+        provider=DeferringProvider(),
+        app_base_url=None,
+        batch_size=10,
+        max_attempts=3,
+        stale_minutes=15,
+        backoff_base=60,
+        backoff_max=3600,
+        throttle=DomainThrottle(rate_per_minute=60, burst=5, defer_seconds=600),
+        max_deferrals=3,
+    )
+
+    assert result["deferred"] == 0
+    assert result["failed"] == 1
+    cursor.execute(
+        "SELECT failure_reason FROM notification_outbox_dead_letter WHERE user_id = %s;",
+        (user_id,),
+    )
+    assert cursor.fetchone()["failure_reason"] == "max_deferrals"
+
+
+class BouncingProvider(FakeProvider):
+    def send_email(self, *, to_email, subject, text, html=None, reply_to=None):
+        raise smtplib.SMTPRecipientsRefused({to_email: (550, b"No such user")})
+
+
+def test_permanent_failure_is_dead_lettered_and_replayable(db_conn, monkeypatch):
+    monkeypatch.setattr(
+        "services.outbox_dispatcher.build_email_message",
+        lambda payload, app_base_url=None: {"subject": "Subject", "text": "text", "html": None},
+    )
+    cursor = get_cursor(db_conn)
+    user_id, follow_id, change_event_id = _insert_user_follow_event(cursor, email="bounce@example.com")
+    cursor.execute(
+        """
+        INSERT INTO notification_outbox (
+            user_id, follow_id, change_event_id, channel, payload, status
+        )
+        VALUES (%s, %s, %s, %s, %s, %s)
+        RETURNING id;
+        """,
+        (
+            user_id,
+            follow_id,
+            change_event_id,
+            "email",
+            Json({"event_type": "season_binge_ready"}),
+            "pending",
+        ),
+    )
+    outbox_id = cursor.fetchone()["id"]
+    db_conn.commit()
+
+    result = dispatch_email_outbox_once(
+        db_conn,
+        provider=BouncingProvider(),
+        app_base_url=None,
+        batch_size=10,
+        max_attempts=5,
+        stale_minutes=15,
+        backoff_base=60,
+        backoff_max=3600,
+        throttle=DomainThrottle(rate_per_minute=60, burst=5, min_rate_per_minute=6, defer_seconds=60),
+    )
+
+    assert result["failed"] == 1
+    assert result["retried"] == 0
+    cursor.execute("SELECT COUNT(*) AS count FROM notification_outbox WHERE id = %s;", (outbox_id,))
+    assert cursor.fetchone()["count"] == 0
+    cursor.execute(
+        """
+        SELECT status, failure_class, failure_reason, attempt_count
+        FROM notification_outbox_dead_letter
+        WHERE id = %s;
+        """,
+        (outbox_id,),
+    )
+    dead = cursor.fetchone()
+    assert dead["failure_class"] == "permanent"
+    assert dead["failure_reason"] == "bad_address"
+    assert dead["attempt_count"] == 1
+    db_conn.commit()
+
+    assert replay_dead_letters(db_conn, failure_reason="bad_address") == ([outbox_id], [])
+    cursor.execute(
+        "SELECT status, attempt_count FROM notification_outbox WHERE id = %s;",
+        (outbox_id,),
+    )
+    replayed = cursor.fetchone()
+    assert replayed["status"] == "pending"
+    assert replayed["attempt_count"] == 0
+    cursor.execute("SELECT COUNT(*) AS count FROM notification_outbox_dead_letter;")
+    assert cursor.fetchone()["count"] == 0
+
+
+def test_dead_letters_are_removed_with_their_follow(db_conn):
+    cursor = get_cursor(db_conn)
+    user_id, follow_id, change_event_id = _insert_user_follow_event(
+        cursor, email="gone@example.com"
+    )
+    cursor.execute(
+        """
+        INSERT INTO notification_outbox_dead_letter (
+            id, user_id, follow_id, change_event_id, channel, payload, created_at,
+            failure_class, failure_reason
+        )
+        VALUES (987654, %s, %s, %s, 'email', %s, NOW(), 'permanent', 'bad_address');
+        """,
+        (user_id, follow_id, change_event_id, Json({"event_type": "date_set"})),
+    )
+    db_conn.commit()
+
+    cursor.execute("DELETE FROM follows WHERE id = %s;", (follow_id,))
+    db_conn.commit()
+
+    cursor.execute("SELECT COUNT(*) AS count FROM notification_outbox_dead_letter;")
+    assert cursor.fetchone()["count"] == 0
+    assert replay_dead_letters(db_conn, ids=[987654]) == ([], [])
+
+
+class AuthFailingProvider(FakeProvider):
+    def send_email(self, *, to_email, subject, text, html=None, reply_to=None):
+        self.sent.append(to_email)
+        raise smtplib.SMTPAuthenticationError(535, b"Authentication failed")
+
+
+def test_dispatch_stops_batch_on_provider_auth_failure(db_conn, monkeypatch):
+    monkeypatch.setattr(
+        "services.outbox_dispatcher.build_email_message",
+        lambda payload, app_base_url=None: {"subject": "Subject", "text": "text", "html": None},
+    )
+    cursor = get_cursor(db_conn)
+    outbox_ids = []
+    for index in range(3):
+        user_id, follow_id, change_event_id = _insert_user_follow_event(
+            cursor, email=f"auth{index}@example.com"
+        )
+        cursor.execute(
+            """
+            INSERT INTO notification_outbox (
+                user_id, follow_id, change_event_id, channel, payload, status
+            )
+            VALUES (%s, %s, %s, 'email', %s, 'pending')
+            RETURNING id;
+            """,
+            (user_id, follow_id, change_event_id, Json({"event_type": "season_binge_ready"})),
+        )
+        outbox_ids.append(cursor.fetchone()["id"])
+    db_conn.commit()
+
+    provider = AuthFailingProvider()
+    result = dispatch_email_outbox_once(
+        db_conn,
+        provider=provider,
+        app_base_url=None,
+        batch_size=10,
+        max_attempts=1,
+        stale_minutes=15,
+        backoff_base=60,
+        backoff_max=3600,
+        concurrency=1,
+        throttle=DomainThrottle(rate_per_minute=6000, burst=100),
+    )
+
+    assert result["provider_error"] is True
+    assert result["deferred"] == 3
+    assert result["failed"] == 0
+    assert len(provider.sent) == 1
+    cursor.execute(
+        "SELECT status, attempt_count FROM notification_outbox WHERE id = ANY(%s);",
+        (outbox_ids,),
+    )
+    assert [(row["status"], row["attempt_count"]) for row in cursor.fetchall()] == [
+        ("pending", 0)
+    ] * 3
+    cursor.execute("SELECT COUNT(*) AS count FROM notification_outbox_dead_letter;")
+    assert cursor.fetchone()["count"] == 0
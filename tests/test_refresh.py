@@ -1,7 +1,16 @@
+import asyncio
+
 from psycopg2.extras import Json
 
 from database import create_standalone_connection, get_cursor
+from services.refresh_all_service import (
+    preview_refresh_all_follows,
+    refresh_all_follows,
+    refresh_all_follows_async,
+)
+from services.outbox_signal import create_outbox_listener, wait_for_outbox_notify
 from services.refresh_service import refresh_follow
+from services.tmdb_overrides import expire_tracking_entry
 
 
 def _register(client):
@@ -210,3 +219,308 @@ def test_refresh_follow_expired_cache_calls_upstream(monkeypatch):
 
     cursor.close()
     conn.close()
+
+
+def test_refresh_all_follows_counts_enqueued_outbox_rows(client, monkeypatch):
+    token, user_id = _register(client)
+
+    client.post(
+        "/api/my/follows",
+        headers={"Authorization": f"Bearer {token}"},
+        json={"target_type": "movie", "tmdb_id": 1201},
+    )
+
+    conn = create_standalone_connection()
+    cursor = get_cursor(conn)
+    cursor.execute(
+        """
+        INSERT INTO tmdb_cache (
+            media_type, tmdb_id, season_number, payload, status_raw, release_date
+        ) VALUES (%s, %s, %s, %s, %s, %s);
+        """,
+        ("movie", 1201, -1, Json({"id": 1201, "title": "Counted Movie"}), None, None),
+    )
+    conn.commit()
+
+    def fake_movie_details(movie_id):
+        return {"id": movie_id, "title": "Counted Movie", "release_date": "2032-03-03"}
+
+    monkeypatch.setattr("services.refresh_service.tmdb_client.get_movie_details", fake_movie_details)
+
+    summary = refresh_all_follows(conn, force_fetch=True)
+
+    assert summary["processed_follows"] == 1
+    assert summary["events_emitted"] == 1
+    assert summary["event_counts"] == {"date_set": 1}
+    assert summary["outbox_enqueued"] == 1
+    assert summary["outbox_counts"] == {"date_set": {"email": 1}}
+    assert summary["outbox_by_channel"] == {"email": 1}
+
+    cursor.execute("SELECT COUNT(*) AS count FROM notification_outbox WHERE user_id = %s;", (user_id,))
+    assert cursor.fetchone()["count"] == 1
+
+    cursor.close()
+    conn.close()
+
+
+def test_enqueued_outbox_rows_wake_dispatcher_listener(client, monkeypatch):
+    token, _ = _register(client)
+
+    client.post(
+        "/api/my/follows",
+        headers={"Authorization": f"Bearer {token}"},
+        json={"target_type": "movie", "tmdb_id": 1251},
+    )
+
+    conn = create_standalone_connection()
+    cursor = get_cursor(conn)
+    cursor.execute(
+        """
+        INSERT INTO tmdb_cache (
+            media_type, tmdb_id, season_number, payload, status_raw, release_date
+        ) VALUES (%s, %s, %s, %s, %s, %s);
+        """,
+        ("movie", 1251, -1, Json({"id": 1251, "title": "Notify Movie"}), None, None),
+    )
+    conn.commit()
+
+    def fake_movie_details(movie_id):
+        return {"id": movie_id, "title": "Notify Movie", "release_date": "2032-05-05"}
+
+    monkeypatch.setattr("services.refresh_service.tmdb_client.get_movie_details", fake_movie_details)
+
+    listen_conn = create_outbox_listener()
+    try:
+        assert wait_for_outbox_notify(listen_conn, channel="email", timeout=0) is False
+        refresh_all_follows(conn, force_fetch=True)
+        assert wait_for_outbox_notify(listen_conn, channel="email", timeout=5) is True
+    finally:
+        listen_conn.close()
+        cursor.close()
+        conn.close()
+
+
+def test_preview_refresh_all_follows_reports_diff_without_writes(client, monkeypatch):
+    token, user_id = _register(client)
+
+    client.post(
+        "/api/my/follows",
+        headers={"Authorization": f"Bearer {token}"},
+        json={"target_type": "movie", "tmdb_id": 1301},
+    )
+
+    conn = create_standalone_connection()
+    cursor = get_cursor(conn)
+    cursor.execute(
+        """
+        INSERT INTO tmdb_cache (
+            media_type, tmdb_id, season_number, payload, status_raw, release_date
+        ) VALUES (%s, %s, %s, %s, %s, %s);
+        """,
+        ("movie", 1301, -1, Json({"id": 1301, "title": "Preview Movie"}), None, None),
+    )
+    conn.commit()
+
+    def fake_movie_details(movie_id):
+        return {"id": movie_id, "title": "Preview Movie", "release_date": "2033-04-04"}
+
+    monkeypatch.setattr("services.refresh_service.tmdb_client.get_movie_details", fake_movie_details)
+
+    summary = preview_refresh_all_follows(conn, force_fetch=True)
+
+    assert summary["dry_run"] is True
+    assert summary["processed_follows"] == 1
+    assert summary["event_counts"] == {"date_set": 1}
+    assert summary["outbox_by_channel"] == {"email": 1}
+    assert summary["items_truncated"] is False
+    assert summary["items"][0]["event_payload"] == {"from": None, "to": "2033-04-04"}
+    assert summary["items"][0]["channels"] == ["email"]
+
+    cursor.execute("SELECT COUNT(*) AS count FROM change_events WHERE user_id = %s;", (user_id,))
+    assert cursor.fetchone()["count"] == 0
+    cursor.execute("SELECT COUNT(*) AS count FROM notification_outbox WHERE user_id = %s;", (user_id,))
+    assert cursor.fetchone()["count"] == 0
+    cursor.execute("SELECT release_date FROM tmdb_cache WHERE media_type = 'movie' AND tmdb_id = 1301;")
+    assert cursor.fetchone()["release_date"] is None
+
+    cursor.close()
+    conn.close()
+
+
+def test_refresh_all_follows_async_prefetches_stale_targets_once(client, monkeypatch):
+    token, user_id = _register(client)
+    for tmdb_id in (1301, 1302):
+        client.post(
+            "/api/my/follows",
+            headers={"Authorization": f"Bearer {token}"},
+            json={"target_type": "movie", "tmdb_id": tmdb_id},
+        )
+
+    conn = create_standalone_connection()
+    cursor = get_cursor(conn)
+    cursor.execute(
+        """
+        INSERT INTO tmdb_cache (
+            media_type, tmdb_id, season_number, payload, status_raw, release_date
+        ) VALUES (%s, %s, %s, %s, %s, %s);
+        """,
+        ("movie", 1301, -1, Json({"id": 1301, "title": "Async Movie"}), None, None),
+    )
+    cursor.execute(
+        """
+        INSERT INTO tmdb_cache (
+            media_type, tmdb_id, season_number, payload, status_raw, release_date, expires_at
+        ) VALUES (%s, %s, %s, %s, %s, %s, NOW() + INTERVAL '1 hour');
+        """,
+        ("movie", 1302, -1, Json({"id": 1302, "title": "Fresh Movie"}), "Released", None),
+    )
+    conn.commit()
+
+    def fail_movie_details(movie_id):
+        raise AssertionError("Blocking client must not be used by the async engine.")
+
+    monkeypatch.setattr("services.refresh_service.tmdb_client.get_movie_details", fail_movie_details)
+
+    class FakeAsyncClient:
+        def __init__(self):
+            self.calls = []
+
+        async def get_movie_details(self, movie_id):
+            self.calls.append(movie_id)
+            return {"id": movie_id, "title": "Async Movie", "release_date": "2034-04-04"}
+
+    fake_client = FakeAsyncClient()
+    summary = asyncio.run(refresh_all_follows_async(conn, client=fake_client))
+
+    assert fake_client.calls == [1301]
+    assert summary["processed_follows"] == 2
+    assert summary["event_counts"] == {"date_set": 1}
+    assert summary["outbox_counts"] == {"date_set": {"email": 1}}
+
+    cursor.execute("SELECT release_date FROM tmdb_cache WHERE media_type = 'movie' AND tmdb_id = 1301;")
+    assert cursor.fetchone()["release_date"].isoformat() == "2034-04-04"
+
+    cursor.close()
+    conn.close()
+
+
+def test_refresh_all_follows_applies_admin_override_dates(client, monkeypatch):
+    token, user_id = _register(client)
+    follow_id = client.post(
+        "/api/my/follows",
+        headers={"Authorization": f"Bearer {token}"},
+        json={"target_type": "movie", "tmdb_id": 1401},
+    ).get_json()["id"]
+
+    conn = create_standalone_connection()
+    cursor = get_cursor(conn)
+    cursor.execute(
+        """
+        INSERT INTO tmdb_cache (
+            media_type, tmdb_id, season_number, payload, status_raw, release_date
+        ) VALUES (%s, %s, %s, %s, %s, %s);
+        """,
+        ("movie", 1401, -1, Json({"id": 1401, "title": "Override Movie"}), None, None),
+    )
+    cursor.execute(
+        """
+        INSERT INTO admin_tmdb_overrides (media_type, tmdb_id, season_number, override_release_date)
+        VALUES (%s, %s, %s, %s);
+        """,
+        ("movie", 1401, -1, "2035-05-05"),
+    )
+    conn.commit()
+
+    def fake_movie_details(movie_id):
+        return {"id": movie_id, "title": "Override Movie", "release_date": "2035-01-01"}
+
+    monkeypatch.setattr("services.refresh_service.tmdb_client.get_movie_details", fake_movie_details)
+
+    refresh_all_follows(conn, force_fetch=True)
+
+    cursor.execute(
+        "SELECT event_payload FROM change_events WHERE user_id = %s AND follow_id = %s;",
+        (user_id, follow_id),
+    )
+    assert cursor.fetchone()["event_payload"] == {"from": None, "to": "2035-05-05"}
+
+    # The cache keeps the raw TMDB date; the override only shapes the diff.
+    cursor.execute(
+        "SELECT release_date, applied_override FROM tmdb_cache WHERE media_type = 'movie' AND tmdb_id = 1401;"
+    )
+    cache_row = cursor.fetchone()
+    assert cache_row["release_date"].isoformat() == "2035-01-01"
+    assert cache_row["applied_override"] == {"override_release_date": "2035-05-05"}
+
+    cursor.execute("DELETE FROM admin_tmdb_overrides WHERE tmdb_id = 1401;")
+    conn.commit()
+
+    refresh_all_follows(conn, force_fetch=True)
+
+    cursor.execute(
+        "SELECT event_payload FROM change_events WHERE user_id = %s AND follow_id = %s ORDER BY id;",
+        (user_id, follow_id),
+    )
+    assert [row["event_payload"] for row in cursor.fetchall()] == [
+        {"from": None, "to": "2035-05-05"},
+        {"from": "2035-05-05", "to": "2035-01-01"},
+    ]
+
+    cursor.close()
+    conn.close()
+
+
+def test_refresh_follow_applies_an_override_changed_since_the_last_refresh(client, monkeypatch):
+    token, user_id = _register(client)
+    follow_id = client.post(
+        "/api/my/follows",
+        headers={"Authorization": f"Bearer {token}"},
+        json={"target_type": "movie", "tmdb_id": 1403},
+    ).get_json()["id"]
+
+    def fake_movie_details(movie_id):
+        return {"id": movie_id, "title": "Override Movie", "release_date": "2035-01-01"}
+
+    monkeypatch.setattr("services.refresh_service.tmdb_client.get_movie_details", fake_movie_details)
+
+    conn = create_standalone_connection()
+    cursor = get_cursor(conn)
+    cursor.execute(
+        """
+        INSERT INTO admin_tmdb_overrides (media_type, tmdb_id, season_number, override_release_date)
+        VALUES ('movie', 1403, -1, '2035-05-05');
+        """
+    )
+    conn.commit()
+    follow = {
+        "id": follow_id,
+        "user_id": user_id,
+        "target_type": "movie",
+        "tmdb_id": 1403,
+        "season_number": None,
+    }
+    prefs = {"notify_date_changes": True}
+    refresh_follow(conn, follow, None, prefs, force_fetch=True, emit_events=False)
+
+    # An admin edits the override; the next refresh of the follow must see it right away.
+    cursor.execute(
+        "UPDATE admin_tmdb_overrides SET override_release_date = '2035-06-06' WHERE tmdb_id = 1403;"
+    )
+    expire_tracking_entry(conn, "movie", 1403, -1)
+    conn.commit()
+    events = refresh_follow(conn, follow, None, prefs, force_fetch=False, emit_events=True)
+
+    assert events
+    cursor.execute(
+        "SELECT event_payload FROM change_events WHERE follow_id = %s ORDER BY id;", (follow_id,)
+    )
+    assert [row["event_payload"] for row in cursor.fetchall()] == [
+        {"from": "2035-05-05", "to": "2035-06-06"}
+    ]
+    cursor.execute(
+        "SELECT applied_override FROM tmdb_cache WHERE media_type = 'movie' AND tmdb_id = 1403;"
+    )
+    assert cursor.fetchone()["applied_override"] == {"override_release_date": "2035-06-06"}
+
+    cursor.close()
+    conn.close()
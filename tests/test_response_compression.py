@@ -0,0 +1,132 @@
+import gzip
+
+import pytest
+
+import app as app_module
+from services import (
+    response_compression,
+    title_index,
+    tmdb_client,
+    tmdb_http_cache,
+    tv_status_index,
+)
+from views import tmdb as tmdb_views
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    tmdb_http_cache._memory_cache.clear()
+    tv_status_index._memory_index.clear()
+    title_index._memory_index.clear()
+    response_compression.compressed_bodies.clear()
+    yield
+    tmdb_http_cache._memory_cache.clear()
+    tv_status_index._memory_index.clear()
+    title_index._memory_index.clear()
+    response_compression.compressed_bodies.clear()
+
+
+def _fake_movie(movie_id):
+    return {"id": movie_id, "title": "Long Movie", "overview": "plot " * 500}
+
+
+def test_api_responses_are_gzipped_when_accepted(client, monkeypatch):
+    monkeypatch.setattr(tmdb_client, "get_movie_details", _fake_movie)
+
+    plain = client.get("/api/tmdb/movie/5")
+    response = client.get("/api/tmdb/movie/5", headers={"Accept-Encoding": "gzip"})
+
+    assert "Content-Encoding" not in plain.headers
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["Vary"]
+    assert gzip.decompress(response.get_data()) == plain.get_data()
+    assert int(response.headers["Content-Length"]) < len(plain.get_data())
+
+
+def test_cache_hits_reuse_the_compressed_body(client, monkeypatch):
+    monkeypatch.setattr(tmdb_client, "get_movie_details", _fake_movie)
+    calls = {"count": 0}
+    original = response_compression.compress
+
+    def counting_compress(body, encoding):
+        calls["count"] += 1
+        return original(body, encoding)
+
+    serialized = []
+    original_jsonify = tmdb_views.jsonify
+
+    def counting_jsonify(payload):
+        serialized.append(payload)
+        return original_jsonify(payload)
+
+    monkeypatch.setattr(response_compression, "compress", counting_compress)
+    monkeypatch.setattr(tmdb_views, "jsonify", counting_jsonify)
+
+    first = client.get("/api/tmdb/movie/5", headers={"Accept-Encoding": "gzip"})
+    second = client.get("/api/tmdb/movie/5", headers={"Accept-Encoding": "gzip"})
+
+    assert second.headers["X-Cache"] == "HIT"
+    assert second.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in second.headers["Vary"]
+    assert second.get_data() == first.get_data()
+    assert calls["count"] == 1
+    assert len(serialized) == 1
+
+
+def test_a_refreshed_cache_entry_replaces_its_compressed_body(client, monkeypatch):
+    title = {"value": "Old Title"}
+
+    def fake_movie(movie_id):
+        return {**_fake_movie(movie_id), "title": title["value"]}
+
+    monkeypatch.setattr(tmdb_client, "get_movie_details", fake_movie)
+    client.get("/api/tmdb/movie/5", headers={"Accept-Encoding": "gzip"})
+
+    tmdb_http_cache._memory_cache.clear()
+    title["value"] = "New Title"
+    refreshed = client.get("/api/tmdb/movie/5", headers={"Accept-Encoding": "gzip"})
+    hit = client.get("/api/tmdb/movie/5", headers={"Accept-Encoding": "gzip"})
+
+    assert refreshed.headers["X-Cache"] == "MISS"
+    assert hit.headers["X-Cache"] == "HIT"
+    assert b"New Title" in gzip.decompress(hit.get_data())
+
+
+def test_compressed_bodies_expire():
+    bodies = response_compression.CompressedBodyCache(1024, ttl_seconds=0)
+    bodies.put((("http:movie_detail", 5, -1), "gzip"), b"compressed")
+
+    assert bodies.get((("http:movie_detail", 5, -1), "gzip")) is None
+    assert len(bodies) == 0
+
+
+def test_small_responses_stay_plain_and_gzip_is_the_default(client, monkeypatch):
+    monkeypatch.setattr(tmdb_client, "get_movie_details", _fake_movie)
+
+    small = client.get("/api/tmdb/search/suggest?q=zz", headers={"Accept-Encoding": "gzip"})
+    large = client.get("/api/tmdb/movie/5", headers={"Accept-Encoding": "br, gzip;q=0.5"})
+
+    assert small.status_code == 200
+    assert "Content-Encoding" not in small.headers
+    assert large.headers["Content-Encoding"] == "gzip"
+
+
+def test_frontend_assets_serve_precompressed_siblings(client, tmp_path, monkeypatch):
+    assets = tmp_path / "assets"
+    assets.mkdir()
+    (assets / "app.js").write_text("console.log('plain');")
+    (assets / "app.js.gz").write_bytes(gzip.compress(b"console.log('plain');"))
+    monkeypatch.setattr(app_module, "FRONTEND_DIST", str(tmp_path))
+
+    compressed = client.get("/assets/app.js", headers={"Accept-Encoding": "br, gzip"})
+    plain = client.get("/assets/app.js")
+
+    assert compressed.headers["Content-Encoding"] == "gzip"
+    assert compressed.mimetype == "text/javascript"
+    assert gzip.decompress(compressed.get_data()) == b"console.log('plain');"
+    assert "immutable" in compressed.headers["Cache-Control"]
+    assert "max-age=31536000" in compressed.headers["Cache-Control"]
+    assert "Content-Encoding" not in plain.headers
+    assert plain.get_data() == b"console.log('plain');"
+    compressed.close()
+    plain.close()
@@ -0,0 +1,78 @@
+import smtplib
+
+from services.send_throttle import DomainThrottle, recipient_domain, transient_smtp_code
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def _throttle(clock):
+    return DomainThrottle(
+        rate_per_minute=60,
+        burst=2,
+        min_rate_per_minute=6,
+        defer_seconds=120,
+        clock=clock,
+    )
+
+
+def test_domain_throttle_limits_each_domain_independently():
+    clock = FakeClock()
+    throttle = _throttle(clock)
+
+    assert throttle.acquire("example.com") == 0
+    assert throttle.acquire("example.com") == 0
+    assert throttle.acquire("example.com") == 1.0
+    assert throttle.acquire("other.org") == 0
+
+    clock.now += 1
+    assert throttle.acquire("example.com") == 0
+
+
+def test_domain_throttle_staggers_refused_messages():
+    clock = FakeClock()
+    throttle = _throttle(clock)
+
+    assert throttle.acquire("example.com") == 0
+    assert throttle.acquire("example.com") == 0
+    # Each refused message gets its own slot, one token interval (1s) apart.
+    assert [throttle.acquire("example.com") for _ in range(3)] == [1.0, 2.0, 3.0]
+
+    throttle.record_deferral("example.com")
+    assert [throttle.acquire("example.com") for _ in range(2)] == [120, 122.0]
+
+
+def test_domain_throttle_backs_off_after_deferral_and_recovers():
+    clock = FakeClock()
+    throttle = _throttle(clock)
+
+    assert throttle.record_deferral("example.com") == 120
+    assert throttle.acquire("example.com") == 120
+
+    clock.now += 120
+    # Rate was halved to 0.5/s, so the bucket needs two seconds to earn a token.
+    assert throttle.acquire("example.com") == 2.0
+
+    for _ in range(10):
+        throttle.record_success("example.com")
+    # Back at the base rate (1/s): two seconds refill the full burst of two.
+    clock.now += 2
+    assert throttle.acquire("example.com") == 0
+    assert throttle.acquire("example.com") == 0
+    assert throttle.acquire("example.com") == 1.0
+
+
+def test_transient_smtp_code_only_matches_4xx():
+    assert transient_smtp_code(smtplib.SMTPResponseException(421, b"Try later")) == 421
+    assert transient_smtp_code(smtplib.SMTPResponseException(550, b"No such user")) is None
+    assert (
+        transient_smtp_code(smtplib.SMTPRecipientsRefused({"a@example.com": (451, b"Greylisted")}))
+        == 451
+    )
+    assert transient_smtp_code(RuntimeError("boom")) is None
+    assert recipient_domain("User@Example.COM") == "example.com"
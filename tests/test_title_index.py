@@ -0,0 +1,65 @@
+import pytest
+
+from services import tmdb_client, tmdb_http_cache, title_index
+
+
+@pytest.fixture(autouse=True)
+def clear_title_index():
+    tmdb_http_cache._memory_cache.clear()
+    title_index._memory_index.clear()
+    yield
+    tmdb_http_cache._memory_cache.clear()
+    title_index._memory_index.clear()
+
+
+def test_suggest_serves_titles_seen_by_search_without_tmdb(client, monkeypatch):
+    def fake_search(query, page=1, language=None):
+        return {
+            "results": [
+                {"id": 1, "media_type": "movie", "title": "The Dark Knight", "popularity": 50},
+                {"id": 2, "media_type": "tv", "name": "Dark", "popularity": 80},
+                {"id": 3, "media_type": "person", "name": "Darko Peric"},
+            ]
+        }
+
+    monkeypatch.setattr(tmdb_client, "search_multi", fake_search)
+    client.get("/api/tmdb/search?q=dark&page=1")
+
+    def fail_search(*args, **kwargs):
+        raise AssertionError("suggest must not call TMDB")
+
+    monkeypatch.setattr(tmdb_client, "search_multi", fail_search)
+    response = client.get("/api/tmdb/search/suggest?q=Dar")
+
+    assert response.status_code == 200
+    assert response.headers.get("X-Cache") == "LOCAL"
+    results = response.get_json()["results"]
+    # Title-prefix matches come first, so "Dark" outranks "The Dark Knight".
+    assert [(item["media_type"], item["id"]) for item in results] == [("tv", 2), ("movie", 1)]
+    assert results[0]["name"] == "Dark"
+    assert results[1]["title"] == "The Dark Knight"
+
+
+def test_suggest_requires_a_query(client):
+    response = client.get("/api/tmdb/search/suggest?q=")
+
+    assert response.status_code == 400
+
+
+def test_index_and_suggest_from_database(db_conn):
+    title_index.index_titles(
+        db_conn,
+        [
+            {"id": 10, "title": "Spirited Away", "original_title": "Sen to Chihiro no Kamikakushi", "popularity": 9},
+            {"id": 11, "title": "Inside 50% Off", "popularity": 1},
+        ],
+        default_media_type="movie",
+    )
+    title_index.index_titles(db_conn, [{"id": 10, "title": "Spirited Away"}], default_media_type="movie")
+    db_conn.commit()
+
+    assert [item["id"] for item in title_index.suggest(db_conn, "spir")] == [10]
+    assert [item["id"] for item in title_index.suggest(db_conn, "away")] == [10]
+    assert [item["id"] for item in title_index.suggest(db_conn, "chihiro")] == [10]
+    assert [item["id"] for item in title_index.suggest(db_conn, "50%")] == [11]
+    assert title_index.suggest(db_conn, "%") == []
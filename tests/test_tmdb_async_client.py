@@ -0,0 +1,51 @@
+import asyncio
+
+import httpx
+import pytest
+
+from services import tmdb_client
+from services.tmdb_async_client import AsyncTMDBClient
+
+
+def _run_with_transport(monkeypatch, handler, coro_factory):
+    monkeypatch.setenv("TMDB_API_KEY", "test-key")
+    monkeypatch.delenv("TMDB_READ_ACCESS_TOKEN", raising=False)
+    monkeypatch.delenv("TMDB_BEARER_TOKEN", raising=False)
+
+    async def run():
+        http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        try:
+            client = AsyncTMDBClient(rate_per_second=1000, max_in_flight=10, http_client=http_client)
+            return await coro_factory(client)
+        finally:
+            await http_client.aclose()
+
+    return asyncio.run(run())
+
+
+def test_async_client_fetches_details_concurrently(monkeypatch):
+    seen = []
+
+    def handler(request):
+        seen.append(request.url.path)
+        assert request.url.params["api_key"] == "test-key"
+        return httpx.Response(200, json={"id": int(request.url.path.rsplit("/", 1)[-1])})
+
+    async def fetch_all(client):
+        return await asyncio.gather(*(client.get_movie_details(movie_id) for movie_id in (1, 2, 3)))
+
+    payloads = _run_with_transport(monkeypatch, handler, fetch_all)
+
+    assert [payload["id"] for payload in payloads] == [1, 2, 3]
+    assert sorted(seen) == ["/3/movie/1", "/3/movie/2", "/3/movie/3"]
+
+
+def test_async_client_raises_tmdb_error_classes(monkeypatch):
+    def handler(request):
+        return httpx.Response(401, json={"status_code": 7, "status_message": "Invalid API key"})
+
+    async def fetch(client):
+        return await client.get_tv_details(10)
+
+    with pytest.raises(tmdb_client.TMDBAuthError):
+        _run_with_transport(monkeypatch, handler, fetch)
@@ -3,14 +3,18 @@ from urllib.parse import urlencode
 
 import pytest
 
-from services import tmdb_client, tmdb_http_cache
+from services import title_index, tmdb_client, tmdb_fanout, tmdb_http_cache, tv_status_index
 
 
 @pytest.fixture(autouse=True)
 def clear_tmdb_cache():
     tmdb_http_cache._memory_cache.clear()
+    tv_status_index._memory_index.clear()
+    title_index._memory_index.clear()
     yield
     tmdb_http_cache._memory_cache.clear()
+    tv_status_index._memory_index.clear()
+    title_index._memory_index.clear()
 
 
 def test_movie_details_cache(client, monkeypatch):
@@ -106,3 +110,179 @@ def test_search_cache_expiry(client, monkeypatch):
     assert response.status_code == 200
     assert response.headers.get("X-Cache") == "MISS"
     assert calls["count"] == 2
+
+
+def test_search_narrows_a_complete_cached_prefix(client, monkeypatch):
+    calls = []
+
+    def fake_search(query, page=1, language=None):
+        calls.append(query)
+        return {
+            "page": 1,
+            "results": [
+                {"id": 1, "media_type": "tv", "name": "Breaking Bad"},
+                {"id": 2, "media_type": "movie", "title": "Prison Break"},
+                {"id": 3, "media_type": "movie", "title": "Breakfast Club", "original_title": "x"},
+                # Matched through an alternative title the payload does not carry.
+                {"id": 4, "media_type": "tv", "name": "La Casa de Papel"},
+            ],
+            "total_pages": 1,
+            "total_results": 4,
+        }
+
+    monkeypatch.setattr(tmdb_client, "search_multi", fake_search)
+
+    assert client.get("/api/tmdb/search?q=break").headers.get("X-Cache") == "MISS"
+    response = client.get("/api/tmdb/search?q=Breaking")
+
+    assert response.headers.get("X-Cache") == "PREFIX"
+    assert calls == ["break"]
+    data = response.get_json()
+    assert [item["id"] for item in data["results"]] == [1, 4]
+    assert data["total_results"] == 2
+
+    # Other languages and later pages still go to TMDB.
+    assert client.get("/api/tmdb/search?q=breaking&language=ko-KR").headers.get("X-Cache") == "MISS"
+    assert client.get("/api/tmdb/search?q=breaking&page=2").headers.get("X-Cache") == "MISS"
+
+
+def test_search_with_language_never_narrows_a_cached_prefix(client, monkeypatch):
+    calls = []
+
+    def fake_search(query, page=1, language=None):
+        calls.append((query, language))
+        return {
+            "page": 1,
+            "results": [{"id": 1, "media_type": "tv", "name": "Breaking Bad"}],
+            "total_pages": 1,
+            "total_results": 1,
+        }
+
+    monkeypatch.setattr(tmdb_client, "search_multi", fake_search)
+
+    client.get("/api/tmdb/search?q=break&language=ko-KR")
+    response = client.get("/api/tmdb/search?q=breaking&language=ko-KR")
+
+    assert response.headers.get("X-Cache") == "MISS"
+    assert calls == [("break", "ko-KR"), ("breaking", "ko-KR")]
+
+
+def test_search_ignores_incomplete_or_too_short_prefixes(client, monkeypatch):
+    calls = []
+
+    def fake_search(query, page=1, language=None):
+        calls.append(query)
+        return {
+            "page": 1,
+            "results": [{"id": 1, "media_type": "tv", "name": "Breaking Bad"}],
+            "total_pages": 1 if query == "br" else 4,
+            "total_results": 1 if query == "br" else 80,
+        }
+
+    monkeypatch.setattr(tmdb_client, "search_multi", fake_search)
+
+    client.get("/api/tmdb/search?q=br")
+    assert client.get("/api/tmdb/search?q=bre").headers.get("X-Cache") == "MISS"
+    assert client.get("/api/tmdb/search?q=brea").headers.get("X-Cache") == "MISS"
+    assert calls == ["br", "bre", "brea"]
+
+
+def test_get_many_reads_all_keys_in_one_query(db_conn, monkeypatch):
+    monkeypatch.setattr(tmdb_http_cache, "_use_memory_cache", lambda: False)
+    entries = {("http:tv_detail", tv_id, -1): {"id": tv_id} for tv_id in (1, 2, 3)}
+    tmdb_http_cache.set_many(db_conn, entries, 60)
+
+    found = tmdb_http_cache.get_many(
+        db_conn, [("http:tv_detail", 1, -1), ("http:tv_detail", 3, -1), ("http:tv_detail", 9, -1)]
+    )
+
+    assert found == {("http:tv_detail", 1, -1): {"id": 1}, ("http:tv_detail", 3, -1): {"id": 3}}
+
+
+def test_tv_popular_enrichment_fetches_only_cache_misses(client, monkeypatch):
+    fetched = []
+
+    def fake_popular(page=1, language=None):
+        return {"page": page, "total_pages": 1, "results": [{"id": 1, "name": "A"}, {"id": 2, "name": "B"}]}
+
+    def fake_tv_details(tv_id):
+        fetched.append(tv_id)
+        return {"id": tv_id, "status": "Ended"}
+
+    monkeypatch.setattr(tmdb_client, "list_tv_popular", fake_popular)
+    monkeypatch.setattr(tmdb_client, "get_tv_details", fake_tv_details)
+    tmdb_http_cache.set_cached(
+        None, "http:tv_detail", 1, -1, {"id": 1, "status": "Returning Series"}, 60
+    )
+
+    response = client.get("/api/tmdb/list/tv/popular?page=1")
+
+    assert response.status_code == 200
+    assert fetched == [2]
+    completed = {item["id"]: item["is_completed"] for item in response.get_json()["results"]}
+    assert completed == {1: None, 2: True}
+
+
+def test_details_batch_reads_cache_once_and_fetches_misses(client, monkeypatch):
+    fetched = []
+
+    def fake_movie(movie_id):
+        fetched.append(("movie", movie_id))
+        return {"id": movie_id, "title": "Fresh"}
+
+    def fake_season(tv_id, season_number):
+        fetched.append(("season", tv_id, season_number))
+        raise tmdb_client.TMDBRequestError("missing")
+
+    monkeypatch.setattr(tmdb_client, "get_movie_details", fake_movie)
+    monkeypatch.setattr(tmdb_client, "get_tv_season_details", fake_season)
+    tmdb_http_cache.set_cached(None, "http:tv_detail", 5, -1, {"id": 5, "name": "Cached"}, 60)
+
+    response = client.post(
+        "/api/tmdb/batch",
+        json={
+            "items": [
+                {"type": "tv", "id": 5},
+                {"type": "movie", "id": 8},
+                {"type": "season", "id": 5, "season_number": 2},
+                {"type": "movie", "id": 8},
+                {"type": "person", "id": 1},
+            ]
+        },
+    )
+
+    assert response.status_code == 200
+    results = response.get_json()["results"]
+    assert [(item["status"], item.get("cache")) for item in results] == [
+        ("ok", "HIT"),
+        ("ok", "MISS"),
+        ("error", "MISS"),
+        ("ok", "MISS"),
+        ("error", None),
+    ]
+    assert results[0]["data"]["name"] == "Cached"
+    assert results[2]["error"] == "tmdb_request_error"
+    assert results[4]["error"] == "invalid_target"
+    assert sorted(fetched) == [("movie", 8), ("season", 5, 2)]
+
+    response = client.get("/api/tmdb/movie/8")
+    assert response.headers["X-Cache"] == "HIT"
+
+
+def test_details_batch_reports_refused_fetches_as_overloaded(client, monkeypatch):
+    class SaturatedExecutor:
+        def try_submit(self, fn, *args):
+            return None
+
+    monkeypatch.setattr(tmdb_fanout, "get_fanout_executor", SaturatedExecutor)
+
+    response = client.post("/api/tmdb/batch", json={"items": [{"type": "movie", "id": 8}]})
+
+    assert response.status_code == 200
+    result = response.get_json()["results"][0]
+    assert (result["status"], result["error"]) == ("error", "overloaded")
+
+
+def test_details_batch_rejects_oversized_requests(client):
+    response = client.post("/api/tmdb/batch", json={"items": [{"type": "movie", "id": 1}] * 51})
+    assert response.status_code == 400
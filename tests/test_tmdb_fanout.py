@@ -0,0 +1,56 @@
+import threading
+
+from services.tmdb_fanout import BoundedExecutor, fan_out
+
+
+def test_fan_out_returns_results_in_item_order():
+    executor = BoundedExecutor(max_workers=4, queue_limit=4)
+    try:
+        results, complete = fan_out(lambda n: n * 2, [3, 1, 2], deadline_seconds=5, executor=executor)
+    finally:
+        executor.shutdown()
+
+    assert complete
+    assert results == [6, 2, 4]
+
+
+def test_fan_out_returns_partial_results_at_deadline():
+    executor = BoundedExecutor(max_workers=1, queue_limit=4)
+    release = threading.Event()
+
+    def work(n):
+        if n == 0:
+            return "fast"
+        release.wait(5)
+        return "slow"
+
+    try:
+        results, complete = fan_out(
+            work, [0, 1, 2], deadline_seconds=0.2, executor=executor, unstarted="unstarted"
+        )
+    finally:
+        release.set()
+        executor.shutdown()
+
+    # Item 1 was running at the deadline; item 2 was still queued behind it.
+    assert not complete
+    assert results == ["fast", None, "unstarted"]
+
+
+def test_fan_out_refuses_work_beyond_queue_limit():
+    executor = BoundedExecutor(max_workers=1, queue_limit=1)
+    release = threading.Event()
+    blockers = [executor.try_submit(release.wait, 5) for _ in range(2)]
+    try:
+        assert executor.try_submit(release.wait, 5) is None
+        results, complete = fan_out(
+            lambda n: n, [1], deadline_seconds=0.1, executor=executor, unstarted="refused"
+        )
+    finally:
+        release.set()
+        for blocker in blockers:
+            blocker.result()
+        executor.shutdown()
+
+    assert not complete
+    assert results == ["refused"]
@@ -1,6 +1,6 @@
-from datetime import date, timedelta
+from datetime import date, datetime, timedelta
 
-from services import tmdb_client
+from services import tmdb_client, tv_status_index
 from views import tmdb as tmdb_views
 
 
@@ -41,6 +41,60 @@ def test_list_tv_seasons_popular_sets_completed(client, monkeypatch):
     assert season_map[3]["is_completed"] is False
 
 
+def test_list_tv_seasons_keeps_tmdb_order_with_catalog_seasons(client, monkeypatch):
+    def fake_list_tv_popular(page=1, language=None):
+        return {
+            "page": page,
+            "total_pages": 7,
+            "results": [{"id": 300, "name": "Fetched"}, {"id": 301, "name": "Cataloged"}],
+        }
+
+    fetched = []
+
+    def fake_get_tv_details(tv_id, append=None):
+        fetched.append(tv_id)
+        return {
+            "id": tv_id,
+            "name": "Fetched",
+            "status": "Ended",
+            "seasons": [{"season_number": 1, "name": "S1", "air_date": "2020-01-01"}],
+        }
+
+    def fake_catalog(conn, series_ids, **kwargs):
+        assert list(series_ids) == [300, 301]
+        return {
+            301: [
+                {
+                    "series_id": 301,
+                    "series_name": "Cataloged",
+                    "season_number": 2,
+                    "season_id": 3012,
+                    "season_name": "S2",
+                    "air_date": "2022-01-01",
+                    "poster_path": None,
+                    "is_current": False,
+                    "is_completed": True,
+                }
+            ]
+        }
+
+    monkeypatch.setattr(tmdb_client, "list_tv_popular", fake_list_tv_popular)
+    monkeypatch.setattr(tmdb_client, "get_tv_details", fake_get_tv_details)
+    monkeypatch.setattr(tv_status_index, "get_catalog_seasons", fake_catalog)
+
+    resp = client.get("/api/tmdb/list/tv/seasons?page=1&list=popular")
+
+    body = resp.get_json()
+    assert fetched == [300]
+    assert [(item["series_id"], item["season_number"]) for item in body["results"]] == [
+        (300, 1),
+        (301, 2),
+    ]
+    assert body["total_pages"] == 7
+    assert resp.headers["X-Cache"] == "MISS"
+    assert client.get("/api/tmdb/list/tv/seasons?page=1&list=popular").headers["X-Cache"] == "HIT"
+
+
 def test_list_movie_upcoming_filters_released(client, monkeypatch):
     today = date.today()
     yesterday = (today - timedelta(days=1)).isoformat()
@@ -228,8 +282,11 @@ def test_list_tv_seasons_upcoming_falls_back_to_on_the_air(client, monkeypatch):
     assert body["results"][0]["is_completed"] is False
 
 
-def test_list_movie_completed_bypasses_cache(client, monkeypatch):
+def test_list_movie_completed_caches_per_day(client, monkeypatch):
+    calls = {"count": 0}
+
     def fake_discover_movies(params):
+        calls["count"] += 1
         return {
             "page": params["page"],
             "total_pages": 1,
@@ -240,9 +297,18 @@ def test_list_movie_completed_bypasses_cache(client, monkeypatch):
 
     monkeypatch.setattr(tmdb_client, "discover_movies", fake_discover_movies)
 
-    resp = client.get("/api/tmdb/list/movie/completed?page=1")
+    resp = client.get("/api/tmdb/list/movie/completed?page=31")
 
     assert resp.status_code == 200
     body = resp.get_json()
     assert body["results"][0]["is_completed"] is True
-    assert resp.headers["X-Cache"] == "BYPASS"
+    assert resp.headers["X-Cache"] == "MISS"
+
+    resp = client.get("/api/tmdb/list/movie/completed?page=31")
+    assert resp.headers["X-Cache"] == "HIT"
+    assert calls["count"] == 1
+
+
+def test_seconds_until_day_rollover():
+    now = datetime(2030, 1, 1, 23, 59, 30)
+    assert tmdb_views._seconds_until_day_rollover(now) == 30
@@ -9,13 +9,54 @@ def test_tv_ttl_final_status_is_seven_days():
     assert ttl == 7 * 24 * 60 * 60
 
 
-def test_tv_ttl_next_episode_is_six_hours():
+def test_tv_ttl_distant_next_episode_is_capped_at_seven_days():
     payload = {"status": "Returning Series", "next_episode_to_air": {"air_date": "2030-01-01"}}
     ttl = compute_tracking_ttl_seconds("tv", payload, "tv_full")
-    assert ttl == 6 * 60 * 60
+    assert ttl == 7 * 24 * 60 * 60
+
+
+def test_tv_ttl_next_episode_schedules_refresh_after_air_date():
+    air_date = datetime.date.today() + datetime.timedelta(days=2)
+    payload = {"status": "Returning Series", "next_episode_to_air": {"air_date": air_date.isoformat()}}
+    ttl = compute_tracking_ttl_seconds("tv", payload, "tv_full")
+    refresh_at = datetime.datetime.utcnow() + datetime.timedelta(seconds=ttl)
+    assert refresh_at.date() >= air_date
+    assert ttl < 4 * 24 * 60 * 60
 
 
 def test_tv_ttl_no_signal_is_twenty_four_hours():
     payload = {"status": "Returning Series", "last_air_date": (datetime.date.today() - datetime.timedelta(days=120)).isoformat()}
     ttl = compute_tracking_ttl_seconds("tv", payload, "tv_full")
     assert ttl == 24 * 60 * 60
+
+
+def test_tv_ttl_backs_off_when_unchanged():
+    payload = {"status": "Returning Series", "last_air_date": (datetime.date.today() - datetime.timedelta(days=120)).isoformat()}
+    assert compute_tracking_ttl_seconds("tv", payload, "tv_full", unchanged_refreshes=2) == 24 * 60 * 60
+    assert compute_tracking_ttl_seconds("tv", payload, "tv_full", unchanged_refreshes=3) == 2 * 24 * 60 * 60
+    assert compute_tracking_ttl_seconds("tv", payload, "tv_full", unchanged_refreshes=4) == 4 * 24 * 60 * 60
+    assert compute_tracking_ttl_seconds("tv", payload, "tv_full", unchanged_refreshes=50) == 7 * 24 * 60 * 60
+
+
+def test_movie_ttl_release_tomorrow_is_shorter_than_next_year():
+    tomorrow = (datetime.date.today() + datetime.timedelta(days=1)).isoformat()
+    next_year = (datetime.date.today() + datetime.timedelta(days=365)).isoformat()
+    soon = compute_tracking_ttl_seconds("movie", {"status": "Post Production", "release_date": tomorrow}, "movie")
+    later = compute_tracking_ttl_seconds("movie", {"status": "Post Production", "release_date": next_year}, "movie")
+    assert soon < 2 * 24 * 60 * 60
+    assert later == 7 * 24 * 60 * 60
+
+
+def test_movie_ttl_status_flip_fast_path_is_bounded():
+    today = datetime.datetime.utcnow().date()
+    last_week = (today - datetime.timedelta(days=7)).isoformat()
+    payload = {"status": "Post Production", "release_date": last_week}
+    assert compute_tracking_ttl_seconds("movie", payload, "movie", unchanged_refreshes=50) == 6 * 60 * 60
+
+    canceled = {"status": "Canceled", "release_date": "2020-01-01"}
+    assert compute_tracking_ttl_seconds("movie", canceled, "movie") == 24 * 60 * 60
+    assert compute_tracking_ttl_seconds("movie", canceled, "movie", unchanged_refreshes=50) == 7 * 24 * 60 * 60
+
+    stale = {"status": "Post Production", "release_date": "2020-01-01"}
+    assert compute_tracking_ttl_seconds("movie", stale, "movie", unchanged_refreshes=50) == 7 * 24 * 60 * 60
+
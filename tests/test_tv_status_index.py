@@ -0,0 +1,98 @@
+from services import tmdb_client, tmdb_http_cache, tv_status_index
+
+
+def _details(tv_id, *, status="Returning Series"):
+    return {
+        "id": tv_id,
+        "name": f"Show {tv_id}",
+        "status": status,
+        "overview": "x" * 1000,
+        "next_episode_to_air": {"season_number": 3, "air_date": "2099-01-01"},
+        "last_episode_to_air": {"season_number": 2, "air_date": "2020-01-01"},
+        "seasons": [
+            {"id": 11, "season_number": 1, "name": "S1", "air_date": "2019-01-01", "episode_count": 8},
+            {"id": 12, "season_number": 3, "name": "S3", "air_date": "2099-01-01", "episode_count": 8},
+        ],
+    }
+
+
+def test_summary_keeps_only_status_facts():
+    summary = tv_status_index.summarize_tv_details(_details(7))
+
+    assert summary == {
+        "tmdb_id": 7,
+        "name": "Show 7",
+        "status": "Returning Series",
+        "next_season_number": 3,
+        "last_season_number": 2,
+        "seasons": [
+            {"id": 11, "season_number": 1, "name": "S1", "air_date": "2019-01-01", "poster_path": None},
+            {"id": 12, "season_number": 3, "name": "S3", "air_date": "2099-01-01", "poster_path": None},
+        ],
+    }
+    assert tv_status_index.is_season_completed(summary, 2)
+    assert not tv_status_index.is_season_completed(summary, 3)
+    assert not tv_status_index.is_series_completed(summary)
+
+
+def test_record_and_get_many_round_trip(db_conn):
+    tv_status_index.record_many(db_conn, [_details(1), _details(2, status="Ended")])
+    db_conn.commit()
+
+    found = tv_status_index.get_many(db_conn, [1, 2, 3])
+
+    assert set(found) == {1, 2}
+    assert found[2]["status"] == "Ended"
+    assert found[1]["seasons"][1]["season_number"] == 3
+
+
+def test_list_enrichment_reads_the_index_before_detail_payloads(client, monkeypatch):
+    tmdb_http_cache._memory_cache.clear()
+    tv_status_index._memory_index.clear()
+    fetched = []
+
+    def fake_popular(page=1, language=None):
+        return {"page": page, "total_pages": 1, "results": [{"id": 5, "name": "E"}]}
+
+    def fake_tv_details(tv_id):
+        fetched.append(tv_id)
+        return _details(tv_id, status="Ended")
+
+    monkeypatch.setattr(tmdb_client, "list_tv_popular", fake_popular)
+    monkeypatch.setattr(tmdb_client, "get_tv_details", fake_tv_details)
+
+    client.get("/api/tmdb/list/tv/popular?page=1")
+    tmdb_http_cache._memory_cache.clear()
+    response = client.get("/api/tmdb/list/tv/popular?page=2")
+
+    assert fetched == [5]
+    assert response.get_json()["results"][0]["is_completed"] is True
+    tv_status_index._memory_index.clear()
+
+
+def test_season_catalog_answers_per_series_lookups(db_conn):
+    ended = _details(2, status="Ended")
+    ended["next_episode_to_air"] = None
+    airing = _details(1)
+    tv_status_index.record_many(db_conn, [airing, ended])
+    db_conn.commit()
+
+    catalog = tv_status_index.get_catalog_seasons(db_conn, [2, 1, 9])
+    assert set(catalog) == {1, 2}
+    assert [
+        (season["season_number"], season["is_current"], season["is_completed"])
+        for season in catalog[1]
+    ] == [(1, False, True), (3, True, False)]
+    assert [season["is_completed"] for season in catalog[2]] == [True, True]
+    # Rows carry the same facts the status-index fallback computes from a summary.
+    summary = tv_status_index.get_many(db_conn, [1])[1]
+    assert catalog[1] == [
+        {**entry, "series_name": "Show 1"} for entry in tv_status_index.season_entries(summary)
+    ]
+
+    # A refresh replaces the series' seasons rather than accumulating them.
+    airing["seasons"] = airing["seasons"][:1]
+    tv_status_index.record_many(db_conn, [airing])
+    db_conn.commit()
+    catalog = tv_status_index.get_catalog_seasons(db_conn, [1])
+    assert [season["season_number"] for season in catalog[1]] == [1]
\ No newline at end of file
@@ -107,7 +107,7 @@ def activity(payload):
             f.tmdb_id,
             f.season_number,
             c.payload AS cache_payload
-        FROM notification_outbox o
+        FROM notification_outbox_all o
         LEFT JOIN follows f ON f.id = o.follow_id
         LEFT JOIN tmdb_cache c ON (
             (f.target_type = 'movie' AND c.media_type = 'movie' AND c.tmdb_id = f.tmdb_id AND c.season_number = -1)
@@ -15,8 +15,10 @@ from services.admin_report_service import (
     parse_report_data,
 )
 from services.outbox_dispatcher import dispatch_email_outbox_once
-from services.refresh_all_service import refresh_all_follows
+from services.outbox_dead_letter import list_dead_letters, replay_dead_letters
+from services.refresh_all_service import preview_refresh_all_follows, refresh_all_follows
 from services.refresh_service import refresh_follow
+from services.tmdb_overrides import expire_tracking_entry, load_override_map
 from utils.auth import is_admin_email, require_admin
 
 admin_bp = Blueprint("admin", __name__, url_prefix="/api/admin")
@@ -681,7 +683,7 @@ def admin_overview(payload):
     cursor.execute(
         """
         SELECT status, COUNT(*) AS count
-        FROM notification_outbox
+        FROM notification_outbox_all
         GROUP BY status
         ORDER BY status ASC;
         """
@@ -700,7 +702,7 @@ def admin_overview(payload):
     cursor.execute(
         """
         SELECT COUNT(*) AS count
-        FROM notification_outbox
+        FROM notification_outbox_all
         WHERE created_at >= NOW() - INTERVAL '24 hours';
         """
     )
@@ -1275,6 +1277,7 @@ def admin_upsert_content_override(payload):
         admin_email=payload.get("email"),
         payload_data={"override": override_data},
     )
+    expire_tracking_entry(db, media_type, tmdb_id, season_number)
 
     db.commit()
 
@@ -1341,6 +1344,7 @@ def admin_delete_content_override(payload):
         admin_email=payload.get("email"),
         payload_data={"deleted_override": _serialize_tmdb_override(deleted_override)},
     )
+    expire_tracking_entry(db, media_type, tmdb_id, season_number)
     db.commit()
 
     content_row = _fetch_admin_content_row(db, media_type, tmdb_id, season_number)
@@ -1737,8 +1741,19 @@ def admin_refresh_user(payload, user_id):
     follows = cursor.fetchall()
 
     event_counts = {}
+    outbox_counts = {}
+    overrides = load_override_map(db)
     for follow in follows:
-        emitted = refresh_follow(db, follow, None, follow, force_fetch=force, emit_events=True)
+        emitted = refresh_follow(
+            db,
+            follow,
+            None,
+            follow,
+            force_fetch=force,
+            emit_events=True,
+            outbox_counts=outbox_counts,
+            overrides=overrides,
+        )
         for event_name in emitted:
             event_counts[event_name] = event_counts.get(event_name, 0) + 1
 
@@ -1752,6 +1767,7 @@ def admin_refresh_user(payload, user_id):
             "refreshed": len(follows),
             "events_emitted": sum(event_counts.values()),
             "event_counts": event_counts,
+            "outbox_counts": outbox_counts,
             "force_fetch": force,
             "duration_seconds": time.perf_counter() - started_at,
             "admin_email": payload.get("email"),
@@ -1765,6 +1781,7 @@ def admin_refresh_user(payload, user_id):
             "refreshed": len(follows),
             "events_emitted": sum(event_counts.values()),
             "event_counts": event_counts,
+            "outbox_counts": outbox_counts,
             "force": force,
         }
     )
@@ -1832,7 +1849,7 @@ def admin_events(payload):
             f.tmdb_id,
             f.season_number,
             c.payload AS cache_payload
-        FROM notification_outbox o
+        FROM notification_outbox_all o
         JOIN users u ON u.id = o.user_id
         LEFT JOIN follows f ON f.id = o.follow_id
         {_CACHE_JOIN_SQL}
@@ -1959,7 +1976,7 @@ def admin_outbox_summary(payload):
     cursor.execute(
         """
         SELECT status, COUNT(*) AS count
-        FROM notification_outbox
+        FROM notification_outbox_all
         GROUP BY status
         ORDER BY status ASC;
         """
@@ -1969,7 +1986,7 @@ def admin_outbox_summary(payload):
     cursor.execute(
         """
         SELECT channel, status, COUNT(*) AS count
-        FROM notification_outbox
+        FROM notification_outbox_all
         GROUP BY channel, status
         ORDER BY channel ASC, status ASC;
         """
@@ -1996,7 +2013,7 @@ def admin_outbox_summary(payload):
             o.attempt_count,
             o.last_error,
             o.created_at
-        FROM notification_outbox o
+        FROM notification_outbox_all o
         JOIN users u ON u.id = o.user_id
         WHERE o.status = 'failed'
         ORDER BY o.created_at DESC
@@ -2015,6 +2032,81 @@ def admin_outbox_summary(payload):
     )
 
 
+@admin_bp.get("/outbox/dead-letter")
+@require_admin
+def admin_outbox_dead_letter(payload):
+    _ = payload
+    failure_reason = (request.args.get("failure_reason") or "").strip() or None
+    limit = _bounded_int(request.args.get("limit"), default=50, minimum=1, maximum=200)
+
+    db = get_db()
+    items, counts = list_dead_letters(db, failure_reason=failure_reason, limit=limit)
+    return jsonify({"items": items, "counts_by_reason": counts, "limit": limit})
+
+
+@admin_bp.post("/outbox/dead-letter/replay")
+@require_admin
+def admin_outbox_dead_letter_replay(payload):
+    body = request.get_json(silent=True) or {}
+    raw_ids = body.get("ids")
+    ids = None
+    if raw_ids is not None:
+        if not isinstance(raw_ids, list) or not all(
+            isinstance(item, int) and not isinstance(item, bool) for item in raw_ids
+        ):
+            return jsonify({"error": "ids must be a list of integers."}), 400
+        ids = raw_ids
+    failure_reason = body.get("failure_reason")
+    if failure_reason is not None and not isinstance(failure_reason, str):
+        return jsonify({"error": "failure_reason must be a string."}), 400
+    failure_reason = (failure_reason or "").strip() or None
+    if not ids and not failure_reason:
+        return jsonify({"error": "Provide ids or failure_reason."}), 400
+    limit = _bounded_int(body.get("limit"), default=100, minimum=1, maximum=1000)
+
+    db = get_db()
+    try:
+        replayed_ids, skipped_ids = replay_dead_letters(
+            db, ids=ids, failure_reason=failure_reason, limit=limit
+        )
+        _record_admin_job_report(
+            db,
+            "outbox_dead_letter_replay",
+            "warning" if skipped_ids else "success",
+            {
+                "replayed_count": len(replayed_ids),
+                "skipped_ids": skipped_ids,
+                "ids": ids,
+                "failure_reason": failure_reason,
+                "admin_email": payload.get("email"),
+            },
+        )
+        db.commit()
+    except Exception as exc:
+        db.rollback()
+        _record_admin_job_report(
+            db,
+            "outbox_dead_letter_replay",
+            "failure",
+            {
+                "error": str(exc),
+                "ids": ids,
+                "failure_reason": failure_reason,
+                "admin_email": payload.get("email"),
+            },
+        )
+        db.commit()
+        return jsonify({"error": "Dead-letter replay failed.", "detail": str(exc)}), 500
+    return jsonify(
+        {
+            "ok": True,
+            "replayed_ids": replayed_ids,
+            "replayed_count": len(replayed_ids),
+            "skipped_ids": skipped_ids,
+        }
+    )
+
+
 @admin_bp.get("/reports/daily-crawler")
 @require_admin
 def admin_daily_crawler_reports(payload):
@@ -2165,7 +2257,7 @@ def admin_daily_notification_report(payload):
             f.season_number,
             c.payload AS cache_payload,
             o.payload
-        FROM notification_outbox o
+        FROM notification_outbox_all o
         JOIN users u ON u.id = o.user_id
         LEFT JOIN follows f ON f.id = o.follow_id
         {_CACHE_JOIN_SQL}
@@ -2400,6 +2492,33 @@ def admin_refresh_all(payload):
     if not isinstance(force, bool):
         force = False
 
+    dry_run = body.get("dry_run", False)
+    if not isinstance(dry_run, bool):
+        dry_run = False
+
+    if dry_run:
+        db = get_db()
+        try:
+            summary = preview_refresh_all_follows(
+                db,
+                limit_users=limit_users,
+                limit_follows=limit_follows,
+                force_fetch=force,
+            )
+        except Exception as exc:
+            db.rollback()
+            return jsonify({"error": "Refresh-all dry run failed.", "detail": str(exc)}), 500
+        return jsonify(
+            {
+                "ok": True,
+                "dry_run": True,
+                "summary": summary,
+                "limit_users": limit_users,
+                "limit_follows": limit_follows,
+                "force": force,
+            }
+        )
+
     started_at = time.perf_counter()
     db = get_db()
     try:
@@ -30,7 +30,7 @@ BOOL_PREF_FIELDS = {
 }
 
 ALLOWED_TARGET_TYPES = {"movie", "tv_full", "tv_season"}
-ALLOWED_FREQUENCIES = {"important_only", "all_updates"}
+ALLOWED_FREQUENCIES = {"important_only", "all_updates", "digest"}
 
 DEFAULT_PREFS = {
     "notify_date_changes": True,
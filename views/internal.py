@@ -7,8 +7,10 @@ from psycopg2.extras import Json
 import config
 from database import get_cursor, get_db
 from services.email_provider import build_email_provider_from_config
+from services.outbox_archive import archive_outbox
 from services.outbox_dispatcher import dispatch_email_outbox_once
-from services.refresh_all_service import refresh_all_follows
+from services.refresh_all_service import run_refresh_all_follows
+from views.tmdb import warm_hot_lists
 
 internal_bp = Blueprint("internal", __name__, url_prefix="/api/internal")
 
@@ -138,8 +140,9 @@ def refresh_all():
     started_at = time.perf_counter()
     conn = get_db()
     try:
-        summary = refresh_all_follows(
+        summary = run_refresh_all_follows(
             conn,
+            use_async=config.REFRESH_ALL_ASYNC,
             limit_users=limit_users,
             limit_follows=limit_follows,
             force_fetch=False,
@@ -156,6 +159,7 @@ def refresh_all():
                 "limit_users": limit_users,
                 "limit_follows": limit_follows,
                 "force_fetch": False,
+                "async": config.REFRESH_ALL_ASYNC,
                 "duration_seconds": time.perf_counter() - started_at,
                 "trigger": "cron",
             },
@@ -173,6 +177,7 @@ def refresh_all():
                 "limit_users": limit_users,
                 "limit_follows": limit_follows,
                 "force_fetch": False,
+                "async": config.REFRESH_ALL_ASYNC,
                 "duration_seconds": time.perf_counter() - started_at,
                 "trigger": "cron",
             },
@@ -181,6 +186,92 @@ def refresh_all():
         return jsonify({"error": "Refresh-all failed.", "detail": str(exc)}), 500
 
 
+@internal_bp.post("/archive-outbox")
+def archive_outbox_rows():
+    auth_error = _validate_cron_secret(request)
+    if auth_error:
+        return jsonify(auth_error[0]), auth_error[1]
+
+    retention_days = _parse_optional_limit(request.args.get("retention_days"))
+    if retention_days is None:
+        retention_days = config.OUTBOX_ARCHIVE_RETENTION_DAYS
+
+    started_at = time.perf_counter()
+    conn = get_db()
+    try:
+        summary = archive_outbox(
+            conn,
+            retention_days=retention_days,
+            batch_size=config.OUTBOX_ARCHIVE_BATCH_SIZE,
+        )
+        _record_admin_job_report(
+            conn,
+            "archive_outbox",
+            "success",
+            {
+                "summary": summary,
+                "retention_days": retention_days,
+                "duration_seconds": time.perf_counter() - started_at,
+                "trigger": "cron",
+            },
+        )
+        conn.commit()
+        return jsonify({"ok": True, "summary": summary, "retention_days": retention_days})
+    except Exception as exc:
+        conn.rollback()
+        _record_admin_job_report(
+            conn,
+            "archive_outbox",
+            "failure",
+            {
+                "error": str(exc),
+                "retention_days": retention_days,
+                "duration_seconds": time.perf_counter() - started_at,
+                "trigger": "cron",
+            },
+        )
+        conn.commit()
+        return jsonify({"error": "Archive failed.", "detail": str(exc)}), 500
+
+
+@internal_bp.post("/warm-lists")
+def warm_lists():
+    auth_error = _validate_cron_secret(request)
+    if auth_error:
+        return jsonify(auth_error[0]), auth_error[1]
+
+    started_at = time.perf_counter()
+    conn = get_db()
+    try:
+        summary = warm_hot_lists(conn)
+        _record_admin_job_report(
+            conn,
+            "warm_lists",
+            "success",
+            {
+                "summary": summary,
+                "duration_seconds": time.perf_counter() - started_at,
+                "trigger": "cron",
+            },
+        )
+        conn.commit()
+        return jsonify({"ok": True, "summary": summary})
+    except Exception as exc:
+        conn.rollback()
+        _record_admin_job_report(
+            conn,
+            "warm_lists",
+            "failure",
+            {
+                "error": str(exc),
+                "duration_seconds": time.perf_counter() - started_at,
+                "trigger": "cron",
+            },
+        )
+        conn.commit()
+        return jsonify({"error": "Warm failed.", "detail": str(exc)}), 500
+
+
 @internal_bp.post("/cleanup-reports")
 def cleanup_reports():
     auth_error = _validate_cron_secret(request)
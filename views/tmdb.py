@@ -1,23 +1,49 @@
+import contextvars
+import functools
 import logging
 import time
-from concurrent.futures import ThreadPoolExecutor
-from datetime import date, timedelta
+from datetime import date, datetime, timedelta
 from urllib.parse import urlencode
 
 from flask import Blueprint, jsonify, request
 
+import config
+from services import list_demand
+from services import response_compression
 from services import tmdb_client
+from services import title_index
 from services import tmdb_http_cache
+from services import tv_status_index
+from services.tmdb_fanout import fan_out
 
 tmdb_bp = Blueprint("tmdb", __name__, url_prefix="/api/tmdb")
 logger = logging.getLogger(__name__)
 
+# Set on an upstream payload when fan-out enrichment ran out of time; such payloads are
+# served but not cached.
+PARTIAL_ENRICHMENT_KEY = "_enrichment_partial"
 
-def _json_response(payload, status=200, cache_status=None):
+# Set while the cache warmer rebuilds list pages: entries expiring within this many seconds
+# are treated as misses and rebuilt.
+_warm_ahead_seconds = contextvars.ContextVar("tmdb_warm_ahead_seconds", default=None)
+
+
+def _json_response(payload, status=200, cache_status=None, cache_key=None):
+    """``cache_key`` names the tmdb_http_cache entry ``payload`` was served from or written to,
+    so the compressed body can be reused on later HITs without serializing the payload."""
+    if cache_key is not None and cache_status == "HIT":
+        response = response_compression.reuse_compressed(cache_key)
+        if response is not None:
+            response.headers["X-Cache"] = cache_status
+            return response
     response = jsonify(payload)
     response.status_code = status
     if cache_status:
         response.headers["X-Cache"] = cache_status
+    if cache_key is not None and cache_status in {"HIT", "MISS"}:
+        response_compression.remember_compressed(
+            response, cache_key, refreshed=cache_status == "MISS"
+        )
     return response
 
 
@@ -77,36 +103,80 @@ def _list_cache_key(path, params):
     return tmdb_http_cache.make_cache_key("http:tmdb_list", query_key=query_key)
 
 
-def _list_endpoint(path, fetcher, media_type, params, *, cache_ttl_seconds=None, cache_enabled=True):
-    cache_key = _list_cache_key(path, params) if cache_enabled else None
+def _read_list_cache(cache_key):
+    warm_ahead = _warm_ahead_seconds.get()
+    if warm_ahead is not None:
+        remaining = tmdb_http_cache.get_remaining_ttl(None, *cache_key)
+        if remaining is None or remaining <= warm_ahead:
+            return None
+    return tmdb_http_cache.get_cached(None, *cache_key)
+
+
+def _record_list_demand(list_name, page, language):
+    list_demand.record_list_request(list_name, page, language)
+
+
+def _seconds_until_day_rollover(now=None):
+    now = now or datetime.now()
+    tomorrow = datetime.combine(now.date() + timedelta(days=1), datetime.min.time())
+    return max(1, int((tomorrow - now).total_seconds()))
+
+
+def _load_list_page(
+    path,
+    fetcher,
+    media_type,
+    params,
+    *,
+    cache_ttl_seconds=None,
+    cache_enabled=True,
+    date_keyed=False,
+):
+    """Fetch, enrich and cache one list page; returns ``(payload, cache_status, cache_key)``.
+
+    TMDB errors propagate so the caller decides how to report them (HTTP response or warmer
+    summary)."""
     ttl_seconds = (
         tmdb_http_cache.LIST_TTL_SECONDS
         if cache_ttl_seconds is None
         else cache_ttl_seconds
     )
+    key_params = params
+    if date_keyed:
+        # Lists filtered by "today" change at midnight: key them by date and expire at rollover.
+        key_params = {**params, "as_of": date.today().isoformat()}
+        ttl_seconds = min(ttl_seconds, _seconds_until_day_rollover())
+    cache_key = _list_cache_key(path, key_params) if cache_enabled else None
+    if cache_enabled:
+        cached = _read_list_cache(cache_key)
+        if cached is not None:
+            _log_cache(path, "HIT", 0)
+            return cached, "HIT", cache_key
+    start = time.perf_counter()
+    payload = fetcher(**params)
+    latency_ms = int((time.perf_counter() - start) * 1000)
+    partial = payload.pop(PARTIAL_ENRICHMENT_KEY, False)
+    title_index.index_titles(None, payload.get("results"), default_media_type=media_type)
+    normalized = _normalize_list_payload(payload, media_type)
+    cache_status = "PARTIAL" if partial else "BYPASS"
+    if cache_enabled and not partial:
+        tmdb_http_cache.set_cached(
+            None,
+            cache_key[0],
+            cache_key[1],
+            cache_key[2],
+            normalized,
+            ttl_seconds,
+        )
+        cache_status = "MISS"
+    _log_cache(path, cache_status, latency_ms)
+    return normalized, cache_status, cache_key
+
+
+def _list_response(load, path, params):
     try:
-        if cache_enabled:
-            cached = tmdb_http_cache.get_cached(None, *cache_key)
-            if cached is not None:
-                _log_cache(path, "HIT", 0)
-                return _json_response(cached, cache_status="HIT")
-        start = time.perf_counter()
-        payload = fetcher(**params)
-        latency_ms = int((time.perf_counter() - start) * 1000)
-        normalized = _normalize_list_payload(payload, media_type)
-        cache_status = "BYPASS"
-        if cache_enabled:
-            tmdb_http_cache.set_cached(
-                None,
-                cache_key[0],
-                cache_key[1],
-                cache_key[2],
-                normalized,
-                ttl_seconds,
-            )
-            cache_status = "MISS"
-        _log_cache(path, cache_status, latency_ms)
-        return _json_response(normalized, cache_status=cache_status)
+        payload, cache_status, cache_key = load()
+        return _json_response(payload, cache_status=cache_status, cache_key=cache_key)
     except tmdb_client.TMDBConfigError:
         return _tmdb_error_response(
             "tmdb_not_configured", "TMDB credentials are not configured"
@@ -126,25 +196,68 @@ def _list_endpoint(path, fetcher, media_type, params, *, cache_ttl_seconds=None,
         )
 
 
-def _get_tv_details_cached(tv_id):
-    cache_key = tmdb_http_cache.make_cache_key("http:tv_detail", tmdb_id=tv_id)
-    cached = tmdb_http_cache.get_cached(None, *cache_key)
-    if cached is not None:
-        _log_cache("tv_detail", "HIT", 0)
-        return cached
+def _list_endpoint(path, fetcher, media_type, params, **options):
+    return _list_response(
+        lambda: _load_list_page(path, fetcher, media_type, params, **options), path, params
+    )
+
+
+def _get_tv_status_many(tv_ids, *, kind):
+    """Return ({tv_id: status summary}, complete). Summaries come from tv_status_index, then
+    from cached TV detail payloads, and only the remaining ids are fetched from TMDB."""
+    tv_ids = list(dict.fromkeys(tv_ids))
+    if not tv_ids:
+        return {}, True
+    warm_ahead = _warm_ahead_seconds.get() or 0
+    summaries = tv_status_index.get_many(None, tv_ids, fresh_for_seconds=warm_ahead)
+    misses = [tv_id for tv_id in tv_ids if tv_id not in summaries]
+    if not misses:
+        _log_cache("tv_status", "HIT", 0)
+        return summaries, True
+
+    keys = {
+        tv_id: tmdb_http_cache.make_cache_key("http:tv_detail", tmdb_id=tv_id) for tv_id in misses
+    }
+    # The warmer goes to TMDB: a cached detail payload can be as old as the entry it replaces.
+    if not warm_ahead:
+        cached = tmdb_http_cache.get_many(None, keys.values())
+        summaries.update(
+            tv_status_index.record_many(
+                None, [cached[key] for key in keys.values() if key in cached]
+            )
+        )
+        misses = [tv_id for tv_id in misses if tv_id not in summaries]
+        if not misses:
+            _log_cache("tv_status", "HIT", 0)
+            return summaries, True
+
+    def load_details(tv_id):
+        try:
+            return tmdb_client.get_tv_details(tv_id)
+        except tmdb_client.TMDBError as exc:
+            logger.warning("%s details fetch failed tv_id=%s error=%s", kind, tv_id, exc)
+            return None
+        except Exception:
+            logger.exception("%s details worker failed tv_id=%s", kind, tv_id)
+            return None
+
     start = time.perf_counter()
-    payload = tmdb_client.get_tv_details(tv_id)
-    latency_ms = int((time.perf_counter() - start) * 1000)
-    tmdb_http_cache.set_cached(
+    fetched, complete = fan_out(load_details, misses)
+    fetched_by_id = {tv_id: details for tv_id, details in zip(misses, fetched) if details}
+    # Written from the request thread so worker threads never touch the request's connection.
+    tmdb_http_cache.set_many(
         None,
-        cache_key[0],
-        cache_key[1],
-        cache_key[2],
-        payload,
+        {keys[tv_id]: details for tv_id, details in fetched_by_id.items()},
         tmdb_http_cache.TV_TTL_SECONDS,
     )
-    _log_cache("tv_detail", "MISS", latency_ms)
-    return payload
+    summaries.update(tv_status_index.record_many(None, fetched_by_id.values()))
+    logger.info(
+        "tmdb_cache kind=tv_status status=MISS hits=%s misses=%s upstream_ms=%s",
+        len(tv_ids) - len(misses),
+        len(misses),
+        int((time.perf_counter() - start) * 1000),
+    )
+    return summaries, complete
 
 
 def _get_tv_popular_page_cached(page, language=None):
@@ -203,24 +316,15 @@ def _enrich_tv_results_with_completion(payload):
     if not candidates:
         return payload
 
-    def load_details(item):
-        tv_id = item.get("id")
-        if not tv_id:
-            return None
-        try:
-            return _get_tv_details_cached(tv_id)
-        except Exception:
-            logger.exception("tv_popular details worker failed tv_id=%s", tv_id)
-            return None
-
-    with ThreadPoolExecutor(max_workers=5) as executor:
-        detail_results = list(executor.map(load_details, candidates))
+    summaries, complete = _get_tv_status_many(
+        [item["id"] for item in candidates], kind="tv_popular"
+    )
+    if not complete:
+        payload[PARTIAL_ENRICHMENT_KEY] = True
 
-    for item, details in zip(candidates, detail_results):
-        if not details:
-            continue
-        status = details.get("status")
-        if status in {"Ended", "Canceled"}:
+    for item in candidates:
+        summary = summaries.get(item["id"])
+        if summary and tv_status_index.is_series_completed(summary):
             item["is_completed"] = True
     return payload
 
@@ -240,28 +344,96 @@ def _enrich_mixed_results_with_tv_completion(payload):
     if not candidates:
         return payload
 
-    def load_details(item):
-        tv_id = item.get("id")
-        if not tv_id:
-            return None
-        try:
-            return _get_tv_details_cached(tv_id)
-        except Exception:
-            logger.exception("trending details worker failed tv_id=%s", tv_id)
-            return None
-
-    with ThreadPoolExecutor(max_workers=5) as executor:
-        detail_results = list(executor.map(load_details, candidates))
+    summaries, complete = _get_tv_status_many(
+        [item["id"] for item in candidates], kind="trending"
+    )
+    if not complete:
+        payload[PARTIAL_ENRICHMENT_KEY] = True
 
-    for item, details in zip(candidates, detail_results):
-        if not details:
-            continue
-        status = details.get("status")
-        if status in {"Ended", "Canceled"}:
+    for item in candidates:
+        summary = summaries.get(item["id"])
+        if summary and tv_status_index.is_series_completed(summary):
             item["is_completed"] = True
     return payload
 
 
+def _search_cache_key(normalized_query, page, language):
+    return tmdb_http_cache.make_cache_key(
+        "http:search_multi",
+        query_key=urlencode(
+            sorted(
+                {
+                    "q": normalized_query,
+                    "page": page,
+                    "language": language or "",
+                }.items()
+            )
+        ),
+    )
+
+
+def _is_complete_search_payload(payload):
+    results = payload.get("results")
+    total_results = payload.get("total_results")
+    if not isinstance(results, list) or not isinstance(total_results, int):
+        return False
+    return (payload.get("total_pages") or 1) <= 1 and total_results <= len(results)
+
+
+def _search_result_matches(item, query_words):
+    if not isinstance(item, dict):
+        return False
+    words = tmdb_http_cache.normalize_query(
+        " ".join(
+            str(item.get(field) or "")
+            for field in ("title", "name", "original_title", "original_name")
+        )
+    ).split()
+    return all(any(word.startswith(query_word) for word in words) for query_word in query_words)
+
+
+def _search_from_cached_prefix(normalized_query):
+    """Answer page 1 of a query from a cached shorter prefix whose result set is complete.
+
+    TMDB returns everything for a short query when it fits on one page, so the longer query's
+    results are a subset of it. TMDB also matches alternative and translated titles the payload
+    does not carry, so only hits whose own titles matched the prefix can be checked against the
+    longer query; the rest are kept rather than guessed away, trading a few extra hits for
+    never dropping a real one. Localized searches (``language``) lean on translated titles
+    almost entirely, so callers only use this path for queries without a language."""
+    min_length = config.TMDB_SEARCH_PREFIX_MIN_LENGTH
+    if min_length <= 0 or len(normalized_query) <= min_length:
+        return None
+    prefixes = list(
+        dict.fromkeys(
+            normalized_query[:length].rstrip()
+            for length in range(len(normalized_query) - 1, min_length - 1, -1)
+        )
+    )
+    keys = {prefix: _search_cache_key(prefix, 1, None) for prefix in prefixes if prefix}
+    cached = tmdb_http_cache.get_many(None, keys.values())
+    query_words = normalized_query.split()
+    # Longest prefix first: it is the smallest superset of the answer.
+    for prefix, key in keys.items():
+        payload = cached.get(key)
+        if payload is None or not _is_complete_search_payload(payload):
+            continue
+        prefix_words = prefix.split()
+        results = [
+            item
+            for item in payload["results"]
+            if _search_result_matches(item, query_words)
+            or not _search_result_matches(item, prefix_words)
+        ]
+        return {
+            "page": 1,
+            "results": results,
+            "total_pages": 1 if results else 0,
+            "total_results": len(results),
+        }
+    return None
+
+
 @tmdb_bp.get("/search")
 def search():
     query = (request.args.get("q") or "").strip()
@@ -276,23 +448,17 @@ def search():
         return _json_response({"error": "Invalid page"}, status=400, cache_status="MISS")
     language = request.args.get("language")
     normalized_query = tmdb_http_cache.normalize_query(query)
-    cache_key = tmdb_http_cache.make_cache_key(
-        "http:search_multi",
-        query_key=urlencode(
-            sorted(
-                {
-                    "q": normalized_query,
-                    "page": page,
-                    "language": language or "",
-                }.items()
-            )
-        ),
-    )
+    cache_key = _search_cache_key(normalized_query, page, language)
     try:
         cached = tmdb_http_cache.get_cached(None, *cache_key)
         if cached is not None:
             _log_cache("search_multi", "HIT", 0)
-            return _json_response(cached, cache_status="HIT")
+            return _json_response(cached, cache_status="HIT", cache_key=cache_key)
+        if page == 1 and not language:
+            narrowed = _search_from_cached_prefix(normalized_query)
+            if narrowed is not None:
+                _log_cache("search_multi", "PREFIX", 0)
+                return _json_response(narrowed, cache_status="PREFIX")
         start = time.perf_counter()
         payload = tmdb_client.search_multi(query, page=page, language=language)
         latency_ms = int((time.perf_counter() - start) * 1000)
@@ -304,8 +470,9 @@ def search():
             payload,
             tmdb_http_cache.SEARCH_TTL_SECONDS,
         )
+        title_index.index_titles(None, payload.get("results"))
         _log_cache("search_multi", "MISS", latency_ms)
-        return _json_response(payload, cache_status="MISS")
+        return _json_response(payload, cache_status="MISS", cache_key=cache_key)
     except tmdb_client.TMDBConfigError:
         return _tmdb_error_response(
             "tmdb_not_configured", "TMDB credentials are not configured"
@@ -318,6 +485,158 @@ def search():
         return _tmdb_error_response("tmdb_upstream_error", "TMDB request failed")
 
 
+SUGGEST_MAX_LIMIT = 20
+
+
+@tmdb_bp.get("/search/suggest")
+def search_suggest():
+    """Typeahead from the local title index; never calls TMDB."""
+    query = (request.args.get("q") or "").strip()
+    if not query:
+        return _json_response({"error": "Missing query"}, status=400, cache_status="LOCAL")
+    limit = request.args.get("limit", type=int, default=10)
+    limit = max(1, min(limit, SUGGEST_MAX_LIMIT))
+    results = title_index.suggest(None, query, limit=limit)
+    return _json_response({"query": query, "results": results}, cache_status="LOCAL")
+
+
+BATCH_MAX_ITEMS = 50
+
+# type -> (cache kind, TTL, fetcher(tmdb_id, season_number))
+_BATCH_TARGETS = {
+    "movie": (
+        "http:movie_detail",
+        tmdb_http_cache.MOVIE_TTL_SECONDS,
+        lambda tmdb_id, _: tmdb_client.get_movie_details(tmdb_id),
+    ),
+    "tv": (
+        "http:tv_detail",
+        tmdb_http_cache.TV_TTL_SECONDS,
+        lambda tmdb_id, _: tmdb_client.get_tv_details(tmdb_id),
+    ),
+    "season": (
+        "http:tv_season_detail",
+        tmdb_http_cache.SEASON_TTL_SECONDS,
+        lambda tmdb_id, season_number: tmdb_client.get_tv_season_details(tmdb_id, season_number),
+    ),
+}
+
+_BATCH_ERROR_KEYS = (
+    (tmdb_client.TMDBConfigError, "tmdb_not_configured"),
+    (tmdb_client.TMDBAuthError, "tmdb_auth_error"),
+    (tmdb_client.TMDBRateLimitError, "tmdb_rate_limited"),
+    (tmdb_client.TMDBRequestError, "tmdb_request_error"),
+)
+
+
+def _parse_batch_target(raw):
+    if not isinstance(raw, dict) or raw.get("type") not in _BATCH_TARGETS:
+        return None
+    tmdb_id = raw.get("id")
+    season_number = raw.get("season_number")
+    if not isinstance(tmdb_id, int) or isinstance(tmdb_id, bool) or tmdb_id <= 0:
+        return None
+    if raw["type"] == "season":
+        if not isinstance(season_number, int) or isinstance(season_number, bool) or season_number < 0:
+            return None
+    else:
+        season_number = None
+    return raw["type"], tmdb_id, season_number
+
+
+def _batch_cache_key(target):
+    target_type, tmdb_id, season_number = target
+    kind = _BATCH_TARGETS[target_type][0]
+    if season_number is None:
+        return tmdb_http_cache.make_cache_key(kind, tmdb_id=tmdb_id)
+    return tmdb_http_cache.make_cache_key(kind, tmdb_id=tmdb_id, season_number=season_number)
+
+
+def _fetch_batch_target(target):
+    target_type, tmdb_id, season_number = target
+    try:
+        return "ok", _BATCH_TARGETS[target_type][2](tmdb_id, season_number)
+    except tmdb_client.TMDBError as exc:
+        for error_cls, error_key in _BATCH_ERROR_KEYS:
+            if isinstance(exc, error_cls):
+                return "error", error_key
+        return "error", "tmdb_upstream_error"
+    except Exception:
+        logger.exception("tmdb_batch fetch failed target=%s", target)
+        return "error", "internal_error"
+
+
+@tmdb_bp.post("/batch")
+def details_batch():
+    body = request.get_json(silent=True) or {}
+    raw_items = body.get("items")
+    if not isinstance(raw_items, list) or not raw_items:
+        return _json_response({"error": "items must be a non-empty list"}, status=400)
+    if len(raw_items) > BATCH_MAX_ITEMS:
+        return _json_response(
+            {"error": f"At most {BATCH_MAX_ITEMS} items per batch"}, status=400
+        )
+
+    targets = [_parse_batch_target(raw) for raw in raw_items]
+    unique_targets = list(dict.fromkeys(target for target in targets if target))
+    keys = {target: _batch_cache_key(target) for target in unique_targets}
+    cached = tmdb_http_cache.get_many(None, keys.values())
+    resolved = {
+        target: ("ok", cached[key], "HIT") for target, key in keys.items() if key in cached
+    }
+
+    misses = [target for target in unique_targets if target not in resolved]
+    if misses:
+        start = time.perf_counter()
+        # Refused or never-started tasks mean the pool is saturated, not that TMDB was slow.
+        fetched, _ = fan_out(_fetch_batch_target, misses, unstarted=("error", "overloaded"))
+        fresh_by_type = {}
+        for target, outcome in zip(misses, fetched):
+            if outcome is None:
+                resolved[target] = ("error", "tmdb_timeout", "MISS")
+                continue
+            status, data = outcome
+            resolved[target] = (status, data, "MISS")
+            if status == "ok":
+                fresh_by_type.setdefault(target[0], {})[keys[target]] = data
+        for target_type, entries in fresh_by_type.items():
+            tmdb_http_cache.set_many(None, entries, _BATCH_TARGETS[target_type][1])
+            for key in entries:
+                response_compression.compressed_bodies.discard(key)
+        if fresh_by_type.get("tv"):
+            tv_status_index.record_many(None, fresh_by_type["tv"].values())
+        for target_type in ("movie", "tv"):
+            title_index.index_titles(
+                None, fresh_by_type.get(target_type, {}).values(), default_media_type=target_type
+            )
+        logger.info(
+            "tmdb_cache kind=batch hits=%s misses=%s upstream_ms=%s",
+            len(unique_targets) - len(misses),
+            len(misses),
+            int((time.perf_counter() - start) * 1000),
+        )
+
+    results = []
+    for raw, target in zip(raw_items, targets):
+        if target is None:
+            results.append({"status": "error", "error": "invalid_target", "request": raw})
+            continue
+        status, data, cache_status = resolved[target]
+        entry = {
+            "type": target[0],
+            "id": target[1],
+            "season_number": target[2],
+            "status": status,
+            "cache": cache_status,
+        }
+        if status == "ok":
+            entry["data"] = data
+        else:
+            entry["error"] = data
+        results.append(entry)
+    return _json_response({"results": results})
+
+
 @tmdb_bp.get("/movie/<int:movie_id>")
 def movie_details(movie_id):
     cache_key = tmdb_http_cache.make_cache_key("http:movie_detail", tmdb_id=movie_id)
@@ -325,7 +644,7 @@ def movie_details(movie_id):
         cached = tmdb_http_cache.get_cached(None, *cache_key)
         if cached is not None:
             _log_cache("movie_detail", "HIT", 0)
-            return _json_response(cached, cache_status="HIT")
+            return _json_response(cached, cache_status="HIT", cache_key=cache_key)
         start = time.perf_counter()
         payload = tmdb_client.get_movie_details(movie_id)
         latency_ms = int((time.perf_counter() - start) * 1000)
@@ -337,8 +656,9 @@ def movie_details(movie_id):
             payload,
             tmdb_http_cache.MOVIE_TTL_SECONDS,
         )
+        title_index.index_titles(None, [payload], default_media_type="movie")
         _log_cache("movie_detail", "MISS", latency_ms)
-        return _json_response(payload, cache_status="MISS")
+        return _json_response(payload, cache_status="MISS", cache_key=cache_key)
     except tmdb_client.TMDBConfigError:
         return _tmdb_error_response(
             "tmdb_not_configured", "TMDB credentials are not configured"
@@ -358,7 +678,7 @@ def tv_details(tv_id):
         cached = tmdb_http_cache.get_cached(None, *cache_key)
         if cached is not None:
             _log_cache("tv_detail", "HIT", 0)
-            return _json_response(cached, cache_status="HIT")
+            return _json_response(cached, cache_status="HIT", cache_key=cache_key)
         start = time.perf_counter()
         payload = tmdb_client.get_tv_details(tv_id)
         latency_ms = int((time.perf_counter() - start) * 1000)
@@ -370,8 +690,10 @@ def tv_details(tv_id):
             payload,
             tmdb_http_cache.TV_TTL_SECONDS,
         )
+        tv_status_index.record_many(None, [payload])
+        title_index.index_titles(None, [payload], default_media_type="tv")
         _log_cache("tv_detail", "MISS", latency_ms)
-        return _json_response(payload, cache_status="MISS")
+        return _json_response(payload, cache_status="MISS", cache_key=cache_key)
     except tmdb_client.TMDBConfigError:
         return _tmdb_error_response(
             "tmdb_not_configured", "TMDB credentials are not configured"
@@ -393,7 +715,7 @@ def tv_season_details(tv_id, season_number):
         cached = tmdb_http_cache.get_cached(None, *cache_key)
         if cached is not None:
             _log_cache("tv_season_detail", "HIT", 0)
-            return _json_response(cached, cache_status="HIT")
+            return _json_response(cached, cache_status="HIT", cache_key=cache_key)
         start = time.perf_counter()
         payload = tmdb_client.get_tv_season_details(tv_id, season_number)
         latency_ms = int((time.perf_counter() - start) * 1000)
@@ -406,7 +728,7 @@ def tv_season_details(tv_id, season_number):
             tmdb_http_cache.SEASON_TTL_SECONDS,
         )
         _log_cache("tv_season_detail", "MISS", latency_ms)
-        return _json_response(payload, cache_status="MISS")
+        return _json_response(payload, cache_status="MISS", cache_key=cache_key)
     except tmdb_client.TMDBConfigError:
         return _tmdb_error_response(
             "tmdb_not_configured", "TMDB credentials are not configured"
@@ -440,7 +762,7 @@ def watch_providers(media_type, item_id):
         cached = tmdb_http_cache.get_cached(None, *cache_key)
         if cached is not None:
             _log_cache("watch_providers", "HIT", 0)
-            return _json_response(cached, cache_status="HIT")
+            return _json_response(cached, cache_status="HIT", cache_key=cache_key)
         start = time.perf_counter()
         payload = tmdb_client.get_watch_providers(media_type, item_id)
         latency_ms = int((time.perf_counter() - start) * 1000)
@@ -462,7 +784,7 @@ def watch_providers(media_type, item_id):
             tmdb_http_cache.WATCH_PROVIDERS_TTL_SECONDS,
         )
         _log_cache("watch_providers", "MISS", latency_ms)
-        return _json_response(response, cache_status="MISS")
+        return _json_response(response, cache_status="MISS", cache_key=cache_key)
     except tmdb_client.TMDBConfigError:
         return _tmdb_error_response(
             "tmdb_not_configured", "TMDB credentials are not configured"
@@ -482,14 +804,23 @@ def _get_page_param():
     return page
 
 
+def _load_movie_popular_page(page, language):
+    params = {"page": page, "language": language}
+    return _load_list_page("/movie/popular", tmdb_client.list_movie_popular, "movie", params)
+
+
 @tmdb_bp.get("/list/movie/popular")
 def list_movie_popular():
     page = _get_page_param()
     if page is None:
         return _json_response({"error": "Invalid page"}, status=400, cache_status="MISS")
     language = request.args.get("language")
-    params = {"page": page, "language": language}
-    return _list_endpoint("/movie/popular", tmdb_client.list_movie_popular, "movie", params)
+    _record_list_demand("movie_popular", page, language)
+    return _list_response(
+        lambda: _load_movie_popular_page(page, language),
+        "/movie/popular",
+        {"page": page, "language": language},
+    )
 
 
 @tmdb_bp.get("/list/movie/upcoming")
@@ -540,19 +871,28 @@ def list_movie_out_now():
     return _list_endpoint("/movie/out_now", fetcher, "movie", params)
 
 
+def _fetch_tv_popular(**kwargs):
+    payload = tmdb_client.list_tv_popular(**kwargs)
+    return _enrich_tv_results_with_completion(payload)
+
+
+def _load_tv_popular_page(page, language):
+    params = {"page": page, "language": language}
+    return _load_list_page("/tv/popular", _fetch_tv_popular, "tv", params)
+
+
 @tmdb_bp.get("/list/tv/popular")
 def list_tv_popular():
     page = _get_page_param()
     if page is None:
         return _json_response({"error": "Invalid page"}, status=400, cache_status="MISS")
     language = request.args.get("language")
-    params = {"page": page, "language": language}
-
-    def fetcher(**kwargs):
-        payload = tmdb_client.list_tv_popular(**kwargs)
-        return _enrich_tv_results_with_completion(payload)
-
-    return _list_endpoint("/tv/popular", fetcher, "tv", params)
+    _record_list_demand("tv_popular", page, language)
+    return _list_response(
+        lambda: _load_tv_popular_page(page, language),
+        "/tv/popular",
+        {"page": page, "language": language},
+    )
 
 
 @tmdb_bp.get("/list/tv/on_the_air")
@@ -565,18 +905,116 @@ def list_tv_on_the_air():
     return _list_endpoint("/tv/on_the_air", tmdb_client.list_tv_on_the_air, "tv", params)
 
 
+def _fetch_trending_all_day(**kwargs):
+    payload = tmdb_client.list_trending_all_day(**kwargs)
+    return _enrich_mixed_results_with_tv_completion(payload)
+
+
+def _load_trending_all_day_page(page, language):
+    params = {"page": page, "language": language}
+    return _load_list_page("/trending/all/day", _fetch_trending_all_day, None, params)
+
+
 @tmdb_bp.get("/list/trending/all/day")
 def list_trending_all_day():
     page = _get_page_param()
     if page is None:
         return _json_response({"error": "Invalid page"}, status=400, cache_status="MISS")
     language = request.args.get("language")
-    params = {"page": page, "language": language}
-    def fetcher(**kwargs):
-        payload = tmdb_client.list_trending_all_day(**kwargs)
-        return _enrich_mixed_results_with_tv_completion(payload)
+    _record_list_demand("trending_all_day", page, language)
+    return _list_response(
+        lambda: _load_trending_all_day_page(page, language),
+        "/trending/all/day",
+        {"page": page, "language": language},
+    )
 
-    return _list_endpoint("/trending/all/day", fetcher, None, params)
+
+def _load_tv_seasons_page(list_key, page, language):
+    """Build one /list/tv/seasons page; returns ``(payload, cache_status, cache_key)``."""
+    query_key = f"list={list_key}&page={page}&language={language or ''}"
+    ttl_seconds = tmdb_http_cache.LIST_TTL_SECONDS
+    if list_key == "completed":
+        query_key += f"&as_of={date.today().isoformat()}"
+        ttl_seconds = min(ttl_seconds, _seconds_until_day_rollover())
+    cache_key = tmdb_http_cache.make_cache_key("http:tv_seasons_list", query_key=query_key)
+    cached = _read_list_cache(cache_key)
+    if cached is not None:
+        _log_cache("tv_seasons_list", "HIT", 0)
+        return cached, "HIT", cache_key
+    if list_key == "popular":
+        base_payload = tmdb_client.list_tv_popular(page=page, language=language)
+    elif list_key == "completed":
+        base_payload = tmdb_client.discover_tv(
+            {"page": page, "sort_by": "popularity.desc", "with_status": 3}
+        )
+    else:
+        base_payload = tmdb_client.list_tv_on_the_air(page=page, language=language)
+    base_results = base_payload.get("results") or []
+    season_items = []
+    base_results = [
+        item for item in base_results if isinstance(item, dict) and item.get("id")
+    ]
+    title_index.index_titles(None, base_results, default_media_type="tv")
+    # TMDB decides which series appear and in what order; the season catalog only
+    # supplies their seasons, and series it does not hold go through the status lookup.
+    base_ids = [item["id"] for item in base_results]
+    catalog = tv_status_index.get_catalog_seasons(
+        None, base_ids, fresh_for_seconds=_warm_ahead_seconds.get() or 0
+    )
+    summaries, complete = _get_tv_status_many(
+        [tv_id for tv_id in base_ids if tv_id not in catalog], kind="tv_seasons"
+    )
+
+    for item in base_results:
+        seasons = catalog.get(item["id"])
+        if seasons is None:
+            summary = summaries.get(item["id"])
+            if not summary:
+                continue
+            seasons = tv_status_index.season_entries(summary)
+        if list_key == "on-the-air":
+            seasons = [season for season in seasons if season["is_current"]]
+
+        for season in seasons:
+            series_id = season["series_id"]
+            series_name = season["series_name"] or item.get("name") or f"TMDB {series_id}"
+            season_items.append(
+                {
+                    "id": season["season_id"],
+                    "media_type": "tv",
+                    "title": series_name,
+                    "poster_path": season["poster_path"] or item.get("poster_path"),
+                    "backdrop_path": item.get("backdrop_path"),
+                    "date": season["air_date"],
+                    "vote_average": item.get("vote_average"),
+                    "vote_count": item.get("vote_count"),
+                    "is_completed": False
+                    if list_key == "on-the-air"
+                    else season["is_completed"],
+                    "season_number": season["season_number"],
+                    "season_name": season["season_name"],
+                    "series_id": series_id,
+                    "series_name": series_name,
+                }
+            )
+    response = {
+        "page": base_payload.get("page", page),
+        "total_pages": base_payload.get("total_pages", 1),
+        "results": season_items,
+    }
+    cache_status = "PARTIAL"
+    if complete:
+        tmdb_http_cache.set_cached(
+            None,
+            cache_key[0],
+            cache_key[1],
+            cache_key[2],
+            response,
+            ttl_seconds,
+        )
+        cache_status = "MISS"
+    _log_cache("tv_seasons_list", cache_status, 0)
+    return response, cache_status, cache_key
 
 
 @tmdb_bp.get("/list/tv/seasons")
@@ -590,184 +1028,12 @@ def list_tv_seasons():
     if list_key not in {"on-the-air", "popular", "completed"}:
         list_key = "on-the-air"
     language = request.args.get("language")
-    cache_enabled = list_key != "completed"
-    cache_key = (
-        tmdb_http_cache.make_cache_key(
-            "http:tv_seasons_list",
-            query_key=f"list={list_key}&page={page}&language={language or ''}",
-        )
-        if cache_enabled
-        else None
+    _record_list_demand(f"tv_seasons_{list_key.replace('-', '_')}", page, language)
+    return _list_response(
+        lambda: _load_tv_seasons_page(list_key, page, language),
+        "/tv/seasons",
+        {"list": list_key, "page": page, "language": language},
     )
-    try:
-        if cache_enabled:
-            cached = tmdb_http_cache.get_cached(None, *cache_key)
-            if cached is not None:
-                _log_cache("tv_seasons_list", "HIT", 0)
-                return _json_response(cached, cache_status="HIT")
-        if list_key == "popular":
-            base_payload = tmdb_client.list_tv_popular(page=page, language=language)
-        elif list_key == "completed":
-            base_payload = tmdb_client.discover_tv(
-                {"page": page, "sort_by": "popularity.desc", "with_status": 3}
-            )
-        else:
-            base_payload = tmdb_client.list_tv_on_the_air(page=page, language=language)
-        base_results = base_payload.get("results") or []
-        season_items = []
-        def is_season_completed(details, season_number):
-            if season_number == 0:
-                return False
-            status = details.get("status")
-            if status in {"Ended", "Canceled"}:
-                return True
-            next_episode = details.get("next_episode_to_air") or {}
-            next_season_number = next_episode.get("season_number")
-            if isinstance(next_season_number, int):
-                return season_number < next_season_number
-            last_episode = details.get("last_episode_to_air") or {}
-            last_season_number = last_episode.get("season_number")
-            if isinstance(last_season_number, int):
-                return season_number < last_season_number
-            return False
-
-        def load_details(item):
-            tv_id = item.get("id")
-            if not tv_id:
-                return None
-            try:
-                return _get_tv_details_cached(tv_id)
-            except tmdb_client.TMDBError:
-                return None
-            except Exception:
-                logger.exception(
-                    "tv_seasons details worker failed tv_id=%s list=%s page=%s",
-                    tv_id,
-                    list_key,
-                    page,
-                )
-                return None
-
-        with ThreadPoolExecutor(max_workers=5) as executor:
-            detail_results = list(executor.map(load_details, base_results))
-
-        for item, details in zip(base_results, detail_results):
-            if not details:
-                continue
-            series_id = details.get("id") or item.get("id")
-            series_name = details.get("name") or item.get("name") or f"TMDB {series_id}"
-            seasons = details.get("seasons") or []
-
-            if list_key == "on-the-air":
-                next_episode = details.get("next_episode_to_air") or {}
-                next_season_number = next_episode.get("season_number")
-                if not isinstance(next_season_number, int):
-                    continue
-                last_episode = details.get("last_episode_to_air") or {}
-                fallback_season_number = last_episode.get("season_number")
-                season_number = next_season_number
-                if season_number == 0 and isinstance(fallback_season_number, int):
-                    season_number = fallback_season_number
-                season = next(
-                    (
-                        entry
-                        for entry in seasons
-                        if entry.get("season_number") == season_number and season_number != 0
-                    ),
-                    None,
-                )
-                if season is None and season_number == 0:
-                    season = next(
-                        (
-                            entry
-                            for entry in seasons
-                            if isinstance(entry.get("season_number"), int)
-                            and entry.get("season_number") != 0
-                        ),
-                        None,
-                    )
-                if season is None:
-                    season = next(
-                        (entry for entry in seasons if entry.get("season_number") == season_number), None
-                    )
-                if not season:
-                    continue
-                season_number = season.get("season_number")
-                season_id = season.get("id") or abs(
-                    tmdb_http_cache.stable_bigint_hash(f"tv:{series_id}:season:{season_number}")
-                )
-                season_items.append(
-                    {
-                        "id": season_id,
-                        "media_type": "tv",
-                        "title": series_name,
-                        "poster_path": season.get("poster_path") or item.get("poster_path"),
-                        "backdrop_path": item.get("backdrop_path"),
-                        "date": season.get("air_date"),
-                        "vote_average": item.get("vote_average"),
-                        "vote_count": item.get("vote_count"),
-                        "is_completed": False,
-                        "season_number": season_number,
-                        "season_name": season.get("name"),
-                        "series_id": series_id,
-                        "series_name": series_name,
-                    }
-                )
-                continue
-
-            for season in seasons:
-                season_number = season.get("season_number")
-                if season_number is None:
-                    continue
-                season_completed = is_season_completed(details, season_number)
-                season_id = season.get("id") or abs(
-                    tmdb_http_cache.stable_bigint_hash(f"tv:{series_id}:season:{season_number}")
-                )
-                season_items.append(
-                    {
-                        "id": season_id,
-                        "media_type": "tv",
-                        "title": series_name,
-                        "poster_path": season.get("poster_path") or item.get("poster_path"),
-                        "backdrop_path": item.get("backdrop_path"),
-                        "date": season.get("air_date"),
-                        "vote_average": item.get("vote_average"),
-                        "vote_count": item.get("vote_count"),
-                        "is_completed": season_completed,
-                        "season_number": season_number,
-                        "season_name": season.get("name"),
-                        "series_id": series_id,
-                        "series_name": series_name,
-                    }
-                )
-        response = {
-            "page": base_payload.get("page", page),
-            "total_pages": base_payload.get("total_pages", 1),
-            "results": season_items,
-        }
-        cache_status = "BYPASS"
-        if cache_enabled:
-            tmdb_http_cache.set_cached(
-                None,
-                cache_key[0],
-                cache_key[1],
-                cache_key[2],
-                response,
-                tmdb_http_cache.LIST_TTL_SECONDS,
-            )
-            cache_status = "MISS"
-        _log_cache("tv_seasons_list", cache_status, 0)
-        return _json_response(response, cache_status=cache_status)
-    except tmdb_client.TMDBConfigError:
-        return _tmdb_error_response(
-            "tmdb_not_configured", "TMDB credentials are not configured"
-        )
-    except tmdb_client.TMDBAuthError:
-        return _tmdb_error_response("tmdb_auth_error", "TMDB authentication failed")
-    except tmdb_client.TMDBRateLimitError:
-        return _tmdb_error_response("tmdb_rate_limited", "TMDB rate limit exceeded")
-    except (tmdb_client.TMDBUpstreamError, tmdb_client.TMDBRequestError):
-        return _tmdb_error_response("tmdb_upstream_error", "TMDB request failed")
 
 
 @tmdb_bp.get("/list/movie/completed")
@@ -786,9 +1052,7 @@ def list_movie_completed():
         payload = tmdb_client.discover_movies(kwargs)
         return _mark_completed_results(payload)
 
-    return _list_endpoint(
-        "/movie/completed", fetcher, "movie", params, cache_enabled=False
-    )
+    return _list_endpoint("/movie/completed", fetcher, "movie", params, date_keyed=True)
 
 
 @tmdb_bp.get("/list/tv/completed")
@@ -806,7 +1070,7 @@ def list_tv_completed():
         payload = tmdb_client.discover_tv(kwargs)
         return _mark_completed_results(payload)
 
-    return _list_endpoint("/tv/completed", fetcher, "tv", params, cache_enabled=False)
+    return _list_endpoint("/tv/completed", fetcher, "tv", params, date_keyed=True)
 
 
 @tmdb_bp.get("/list/series/completed")
@@ -824,6 +1088,93 @@ def list_series_completed():
         payload = tmdb_client.discover_tv(kwargs)
         return _mark_completed_results(payload)
 
-    return _list_endpoint(
-        "/series/completed", fetcher, "tv", params, cache_enabled=False
+    return _list_endpoint("/series/completed", fetcher, "tv", params, date_keyed=True)
+
+
+def _tv_item_ids(results):
+    return [item.get("id") for item in results]
+
+
+def _trending_tv_ids(results):
+    return [item.get("id") for item in results if item.get("media_type") == "tv"]
+
+
+def _season_series_ids(results):
+    return [item.get("series_id") for item in results]
+
+
+# list_name -> (page loader taking (page, language), ids of the series whose TV status the
+# list needs); names match tmdb_list_demand.list_name.
+WARMABLE_LISTS = {
+    "movie_popular": (_load_movie_popular_page, None),
+    "tv_popular": (_load_tv_popular_page, _tv_item_ids),
+    "trending_all_day": (_load_trending_all_day_page, _trending_tv_ids),
+    "tv_seasons_on_the_air": (
+        functools.partial(_load_tv_seasons_page, "on-the-air"),
+        _season_series_ids,
+    ),
+    "tv_seasons_popular": (functools.partial(_load_tv_seasons_page, "popular"), _season_series_ids),
+    "tv_seasons_completed": (
+        functools.partial(_load_tv_seasons_page, "completed"),
+        _season_series_ids,
+    ),
+}
+
+
+def _warm_tv_statuses(payload, series_ids_of):
+    """Refresh TV status summaries the page is built from, even when the page itself is still
+    fresh, so the next rebuild does not wait on per-series TMDB lookups."""
+    results = payload.get("results") or []
+    series_ids = [
+        series_id
+        for series_id in series_ids_of([item for item in results if isinstance(item, dict)])
+        if isinstance(series_id, int)
+    ]
+    _, complete = _get_tv_status_many(series_ids, kind="tv_warm")
+    return complete
+
+
+def warm_list_pages(targets, *, warm_ahead_seconds):
+    """Rebuild each (list_name, page, language) cache entry that is missing or expires within
+    ``warm_ahead_seconds``. Must run inside an app context.
+
+    ``warmed`` counts pages written to the cache, ``fresh`` pages that were still cached, and
+    ``uncached`` pages (or their TV statuses) that could only be built partially."""
+    summary = {"warmed": 0, "fresh": 0, "uncached": 0, "failed": 0}
+    for list_name, page, language in targets:
+        load, series_ids_of = WARMABLE_LISTS[list_name]
+        token = _warm_ahead_seconds.set(warm_ahead_seconds)
+        try:
+            payload, cache_status, cache_key = load(page, language or None)
+            statuses_complete = True
+            if series_ids_of is not None:
+                statuses_complete = _warm_tv_statuses(payload, series_ids_of)
+        except Exception:
+            logger.exception("tmdb_warm failed list=%s page=%s language=%s", list_name, page, language)
+            summary["failed"] += 1
+            continue
+        finally:
+            _warm_ahead_seconds.reset(token)
+        if not statuses_complete or cache_status not in {"HIT", "MISS"}:
+            summary["uncached"] += 1
+        elif cache_status == "HIT":
+            summary["fresh"] += 1
+        else:
+            response_compression.compressed_bodies.discard(cache_key)
+            summary["warmed"] += 1
+    return summary
+
+
+def warm_hot_lists(conn):
+    """Cache warmer entry point: configured first pages plus the most requested pages."""
+    list_demand.flush_list_demand(conn)
+    targets = list_demand.warm_targets(
+        conn,
+        list_names=[name for name in config.TMDB_WARM_LISTS if name in WARMABLE_LISTS],
+        pages=config.TMDB_WARM_PAGES,
+        languages=config.TMDB_WARM_LANGUAGES,
+        hot_limit=config.TMDB_WARM_HOT_LIMIT,
     )
+    summary = warm_list_pages(targets, warm_ahead_seconds=config.TMDB_WARM_AHEAD_SECONDS)
+    summary["targets"] = len(targets)
+    return summary
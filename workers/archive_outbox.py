@@ -0,0 +1,38 @@
+import argparse
+
+import config
+from database import create_standalone_connection
+from services.outbox_archive import archive_outbox
+
+
+def _parse_args():
+    parser = argparse.ArgumentParser(description="Move old sent/failed outbox rows to the archive table.")
+    parser.add_argument(
+        "--retention-days",
+        type=int,
+        default=None,
+        help="Archive terminal rows older than N days.",
+    )
+    parser.add_argument("--max-batches", type=int, default=None, help="Stop after N batches.")
+    return parser.parse_args()
+
+
+def main():
+    args = _parse_args()
+    retention_days = args.retention_days or config.OUTBOX_ARCHIVE_RETENTION_DAYS
+
+    conn = create_standalone_connection()
+    try:
+        summary = archive_outbox(
+            conn,
+            retention_days=retention_days,
+            batch_size=config.OUTBOX_ARCHIVE_BATCH_SIZE,
+            max_batches=args.max_batches,
+        )
+        print(summary)
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,256 @@
+"""Measure dispatch_email_outbox_once throughput against a local SMTP sink.
+
+Seeds throwaway outbox rows, so point DATABASE_URL at a development database.
+"""
+
+import argparse
+import asyncio
+import threading
+import time
+
+from psycopg2.extras import Json, execute_values
+
+from database import create_standalone_connection, get_cursor
+from services.email_provider import SMTPEmailProvider
+from services.outbox_dispatcher import dispatch_email_outbox_once
+from services.send_throttle import DomainThrottle
+
+BENCH_EMAIL_DOMAIN = "bench.invalid"
+
+
+class LocalSMTPSink:
+    """Minimal asyncio SMTP server that accepts and counts every message; no TLS or auth."""
+
+    def __init__(self, host="127.0.0.1", port=0):
+        self.host = host
+        self.port = port
+        self.received = 0
+        self._loop = None
+        self._server = None
+        self._thread = None
+        self._ready = threading.Event()
+
+    async def _handle(self, reader, writer):
+        async def reply(line):
+            writer.write(f"{line}\r\n".encode())
+            await writer.drain()
+
+        await reply("220 localhost benchmark sink")
+        while True:
+            raw = await reader.readline()
+            if not raw:
+                break
+            verb = raw.decode("utf-8", "replace").strip().split(" ", 1)[0].upper()
+            if verb == "EHLO":
+                await reply("250-localhost")
+                await reply("250 8BITMIME")
+            elif verb in ("HELO", "MAIL", "RCPT", "RSET", "NOOP"):
+                await reply("250 OK")
+            elif verb == "DATA":
+                await reply("354 End data with <CR><LF>.<CR><LF>")
+                while True:
+                    line = await reader.readline()
+                    if not line or line in (b".\r\n", b".\n"):
+                        break
+                self.received += 1
+                await reply("250 OK queued")
+            elif verb == "QUIT":
+                await reply("221 Bye")
+                break
+            else:
+                await reply("502 Command not implemented")
+        writer.close()
+
+    def _run(self):
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        self._server = self._loop.run_until_complete(
+            asyncio.start_server(self._handle, self.host, self.port)
+        )
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._ready.set()
+        self._loop.run_forever()
+        self._server.close()
+        self._loop.run_until_complete(self._server.wait_closed())
+        self._loop.close()
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        self._ready.wait()
+        return self
+
+    def stop(self):
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+        return False
+
+
+def _parse_csv_ints(value):
+    return [int(item) for item in value.split(",") if item.strip()]
+
+
+def _parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark email outbox dispatch throughput.")
+    parser.add_argument("--messages", type=int, default=500, help="Outbox rows per run.")
+    parser.add_argument("--recipients", type=int, default=20, help="Distinct bench recipients.")
+    parser.add_argument("--batch-sizes", type=_parse_csv_ints, default=[25, 100, 250])
+    parser.add_argument("--concurrency", type=_parse_csv_ints, default=[1, 4, 8])
+    return parser.parse_args()
+
+
+def _seed_bench_users(conn, count):
+    """Create bench users with one follow each; returns [(user_id, follow_id)]."""
+    cursor = get_cursor(conn)
+    recipients = []
+    for index in range(count):
+        cursor.execute(
+            """
+            INSERT INTO users (email, password_hash)
+            VALUES (%s, 'bench')
+            ON CONFLICT (email) DO UPDATE SET email = EXCLUDED.email
+            RETURNING id;
+            """,
+            (f"bench{index}@{BENCH_EMAIL_DOMAIN}",),
+        )
+        user_id = cursor.fetchone()["id"]
+        cursor.execute(
+            """
+            INSERT INTO follows (user_id, target_type, tmdb_id)
+            VALUES (%s, 'movie', 1)
+            ON CONFLICT (user_id, target_type, tmdb_id, season_number) DO NOTHING;
+            SELECT id FROM follows WHERE user_id = %s ORDER BY id ASC LIMIT 1;
+            """,
+            (user_id, user_id),
+        )
+        recipients.append((user_id, cursor.fetchone()["id"]))
+    conn.commit()
+    cursor.close()
+    return recipients
+
+
+def _seed_outbox(conn, recipients, messages):
+    rows = [
+        (
+            *recipients[index % len(recipients)],
+            "email",
+            Json({"event_type": "season_binge_ready", "title": f"Bench title {index}"}),
+            "pending",
+        )
+        for index in range(messages)
+    ]
+    cursor = get_cursor(conn)
+    execute_values(
+        cursor,
+        "INSERT INTO notification_outbox (user_id, follow_id, channel, payload, status) VALUES %s;",
+        rows,
+    )
+    conn.commit()
+    cursor.close()
+
+
+def _cleanup(conn, recipients):
+    user_ids = [user_id for user_id, _ in recipients]
+    conn.rollback()
+    cursor = get_cursor(conn)
+    # Live outbox rows and follows go with the users via ON DELETE CASCADE.
+    for table in (
+        "notification_outbox_archive",
+        "notification_outbox_dead_letter",
+    ):
+        cursor.execute(f"DELETE FROM {table} WHERE user_id = ANY(%s);", (user_ids,))
+    cursor.execute("DELETE FROM users WHERE id = ANY(%s);", (user_ids,))
+    conn.commit()
+    cursor.close()
+
+
+def run_benchmark(conn, *, sink, recipients, messages, batch_size, concurrency):
+    provider = SMTPEmailProvider(
+        host=sink.host,
+        port=sink.port,
+        user=None,
+        password=None,
+        use_tls=False,
+        use_ssl=False,
+        email_from=f"dispatch@{BENCH_EMAIL_DOMAIN}",
+    )
+    # Domain shaping is not what is being measured here.
+    throttle = DomainThrottle(rate_per_minute=10_000_000, burst=10_000_000)
+    _seed_outbox(conn, recipients, messages)
+
+    sent = 0
+    started = time.perf_counter()
+    while True:
+        summary = dispatch_email_outbox_once(
+            conn,
+            provider=provider,
+            app_base_url="http://localhost",
+            batch_size=batch_size,
+            max_attempts=1,
+            stale_minutes=15,
+            backoff_base=1,
+            backoff_max=1,
+            concurrency=concurrency,
+            throttle=throttle,
+        )
+        sent += summary["sent"]
+        if not summary["claimed"]:
+            break
+    elapsed = time.perf_counter() - started
+    _cleanup_outbox(conn, recipients)
+    return {
+        "batch_size": batch_size,
+        "concurrency": concurrency,
+        "sent": sent,
+        "seconds": round(elapsed, 3),
+        "msgs_per_sec": round(sent / elapsed, 1) if elapsed else 0.0,
+    }
+
+
+def _cleanup_outbox(conn, recipients):
+    cursor = get_cursor(conn)
+    cursor.execute(
+        "DELETE FROM notification_outbox WHERE user_id = ANY(%s);",
+        ([user_id for user_id, _ in recipients],),
+    )
+    conn.commit()
+    cursor.close()
+
+
+def main():
+    args = _parse_args()
+    conn = create_standalone_connection()
+    recipients = _seed_bench_users(conn, max(1, args.recipients))
+    try:
+        with LocalSMTPSink() as sink:
+            print(f"SMTP sink listening on {sink.host}:{sink.port}")
+            for batch_size in args.batch_sizes:
+                for concurrency in args.concurrency:
+                    result = run_benchmark(
+                        conn,
+                        sink=sink,
+                        recipients=recipients,
+                        messages=args.messages,
+                        batch_size=batch_size,
+                        concurrency=concurrency,
+                    )
+                    print(
+                        "batch_size={batch_size:<5} concurrency={concurrency:<3} "
+                        "sent={sent:<6} seconds={seconds:<8} msgs/sec={msgs_per_sec}".format(**result)
+                    )
+            print(f"sink received {sink.received} messages")
+    finally:
+        _cleanup(conn, recipients)
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
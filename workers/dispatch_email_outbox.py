@@ -5,6 +5,7 @@ import config
 from database import create_standalone_connection
 from services.email_provider import build_email_provider_from_config
 from services.outbox_dispatcher import dispatch_email_outbox_once
+from services.outbox_signal import create_outbox_listener, wait_for_outbox_notify
 
 
 def _parse_args():
@@ -26,6 +27,7 @@ def main():
         raise SystemExit("EMAIL_ENABLED is false or SMTP config missing. Use --dry-run to skip sending.")
 
     conn = create_standalone_connection()
+    listen_conn = create_outbox_listener() if run_loop and config.EMAIL_DISPATCH_LISTEN else None
     try:
         while True:
             summary = dispatch_email_outbox_once(
@@ -42,8 +44,18 @@ def main():
             print(summary)
             if not run_loop:
                 break
-            time.sleep(config.EMAIL_DISPATCH_LOOP_SECONDS)
+            if summary["claimed"] >= config.EMAIL_DISPATCH_BATCH_SIZE:
+                # Full batch: more rows are likely waiting, drain before blocking.
+                continue
+            if listen_conn is None:
+                time.sleep(config.EMAIL_DISPATCH_LOOP_SECONDS)
+            else:
+                wait_for_outbox_notify(
+                    listen_conn, channel="email", timeout=config.EMAIL_DISPATCH_LOOP_SECONDS
+                )
     finally:
+        if listen_conn is not None:
+            listen_conn.close()
         conn.close()
 
 
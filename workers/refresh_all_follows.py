@@ -0,0 +1,42 @@
+import argparse
+
+import config
+from database import create_standalone_connection
+from services.refresh_all_service import run_refresh_all_follows
+
+
+def _parse_args():
+    parser = argparse.ArgumentParser(description="Refresh every follow and emit change events.")
+    parser.add_argument("--limit-users", type=int, default=None, help="Only refresh the first N users.")
+    parser.add_argument("--limit-follows", type=int, default=None, help="Only refresh the first N follows.")
+    parser.add_argument("--force", action="store_true", help="Ignore fresh tracking cache entries.")
+    parser.add_argument(
+        "--async",
+        dest="use_async",
+        action="store_true",
+        help="Fetch TMDB payloads concurrently with the asyncio engine.",
+    )
+    return parser.parse_args()
+
+
+def main():
+    args = _parse_args()
+    limit_users = args.limit_users or config.CRON_REFRESH_LIMIT_USERS
+    limit_follows = args.limit_follows or config.CRON_REFRESH_LIMIT_FOLLOWS
+
+    conn = create_standalone_connection()
+    try:
+        summary = run_refresh_all_follows(
+            conn,
+            use_async=args.use_async or config.REFRESH_ALL_ASYNC,
+            limit_users=limit_users,
+            limit_follows=limit_follows,
+            force_fetch=args.force,
+        )
+        print(summary)
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,13 @@
+from app import app
+from database import get_db
+from views.tmdb import warm_hot_lists
+
+
+def main():
+    with app.app_context():
+        summary = warm_hot_lists(get_db())
+        print(summary)
+
+
+if __name__ == "__main__":
+    main()